@@ -0,0 +1,88 @@
+"""location indexes and coordinate precision
+
+Revision ID: b4b02c9d408b
+Revises: dc460c349f60
+Create Date: 2026-10-19 12:00:00.000000
+
+Changing the coordinate column types rewrites the locations table under an
+ACCESS EXCLUSIVE lock and resets its statistics, the index is built
+CONCURRENTLY outside of the migration transaction.
+
+round(..., 7) can map several existing rows onto the same coordinates and
+break unique_lat_long, so such rows are merged first: subscriptions move to
+the row with the smallest id and the others are deleted. Run
+`python -m weather_tracker.cli rebuild-popularity` afterwards. Rows with a
+coordinate of 1000 or more in absolute value do not fit NUMERIC(10,7) and
+have to be removed by hand before upgrading.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "b4b02c9d408b"
+down_revision: Union[str, None] = "dc460c349f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DUPLICATE_LOCATIONS = """
+SELECT id, keeper FROM (
+    SELECT id, first_value(id) OVER (PARTITION BY round(latitude, 7), round(longitude, 7) ORDER BY id) AS keeper
+    FROM locations
+) ranked
+WHERE id <> keeper
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        f"""
+        INSERT INTO user_locations (user_id, location_id)
+        SELECT user_locations.user_id, duplicates.keeper
+        FROM user_locations JOIN ({DUPLICATE_LOCATIONS}) duplicates ON user_locations.location_id = duplicates.id
+        ON CONFLICT DO NOTHING
+        """
+    )
+    op.execute(f"DELETE FROM user_locations WHERE location_id IN (SELECT id FROM ({DUPLICATE_LOCATIONS}) duplicates)")
+    op.execute(f"DELETE FROM locations WHERE id IN (SELECT id FROM ({DUPLICATE_LOCATIONS}) duplicates)")
+    op.alter_column(
+        "locations",
+        "latitude",
+        type_=sa.Numeric(precision=10, scale=7),
+        existing_nullable=False,
+        postgresql_using="round(latitude, 7)",
+    )
+    op.alter_column(
+        "locations",
+        "longitude",
+        type_=sa.Numeric(precision=10, scale=7),
+        existing_nullable=False,
+        postgresql_using="round(longitude, 7)",
+    )
+    op.execute("ANALYZE locations")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_user_locations_location_id",
+            "user_locations",
+            ["location_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_user_locations_location_id",
+            table_name="user_locations",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.alter_column("locations", "longitude", type_=sa.Numeric(), existing_nullable=False)
+    op.alter_column("locations", "latitude", type_=sa.Numeric(), existing_nullable=False)
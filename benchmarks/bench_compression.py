@@ -0,0 +1,61 @@
+import random
+import timeit
+from decimal import Decimal
+
+from weather_tracker.presentation.compression import CompressionMiddleware, brotli
+from weather_tracker.presentation.schemas import WeatherResponse
+
+NUMBER = 200
+STATES = ["Clear", "Clouds", "Rain", "Snow", "Mist"]
+
+
+def locations_payload(count: int) -> bytes:
+    random.seed(count)
+    items = [
+        WeatherResponse(
+            name=f"Location {i}",
+            latitude=Decimal(random.randint(-900_000_000, 900_000_000)).scaleb(-7),
+            longitude=Decimal(random.randint(-1_800_000_000, 1_800_000_000)).scaleb(-7),
+            country=random.choice(["RU", "KZ", "BY", None]),
+            temperature=random.randint(-30, 35),
+            main_state=random.choice(STATES),
+            wind_speed=random.randint(0, 15),
+            temperature_feels=random.randint(-35, 35),
+            humidity=random.randint(20, 100),
+        ).model_dump_json(by_alias=True)
+        for i in range(count)
+    ]
+    return ("[" + ",".join(items) + "]").encode()
+
+
+def main():
+    cases = [("gzip", {"gzip_level": level}, f"gzip-{level}") for level in (1, 6, 9)]
+    if brotli is not None:
+        cases += [("br", {"brotli_quality": quality}, f"br-{quality}") for quality in (1, 4, 11)]
+
+    print(
+        f"{'page':>6} {'raw, B':>8} {'coding':>8} {'size, B':>8} {'ratio':>6} {'compress, us':>13} {'cached, us':>11}"
+    )
+    for count in (10, 50):
+        body = locations_payload(count)
+        for encoding, options, title in cases:
+            middleware = CompressionMiddleware(app=None, **options)
+            compressed = middleware.compress(body, encoding)
+            compress_us = timeit.timeit(lambda: middleware.compress(body, encoding), number=NUMBER) / NUMBER * 1e6
+            middleware._cached_compress(("/locations", b"", '"etag"', encoding), body, encoding)
+            cached_us = (
+                timeit.timeit(
+                    lambda: middleware._cached_compress(("/locations", b"", '"etag"', encoding), body, encoding),
+                    number=NUMBER,
+                )
+                / NUMBER
+                * 1e6
+            )
+            print(
+                f"{count:>6} {len(body):>8} {title:>8} {len(compressed):>8} {len(body) / len(compressed):>6.1f} "
+                f"{compress_us:>13.1f} {cached_us:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
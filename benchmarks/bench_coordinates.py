@@ -0,0 +1,62 @@
+import json
+import timeit
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal
+
+from weather_tracker.domain.value_objects import Coordinates
+
+NUMBER = 200_000
+SCALE = Decimal("1e-7")
+
+
+@dataclass(frozen=True, slots=True)
+class DecimalCoordinates:
+    latitude: Decimal
+    longitude: Decimal
+
+
+def main():
+    latitude, longitude = Decimal("55.7504461"), Decimal("37.6174943")
+    decimal_coordinates = DecimalCoordinates(latitude=latitude, longitude=longitude)
+    fixed_coordinates = Coordinates(latitude=latitude, longitude=longitude)
+
+    cases = {
+        "construct from Decimal": (
+            lambda: DecimalCoordinates(latitude=latitude, longitude=longitude),
+            lambda: Coordinates(latitude=latitude, longitude=longitude),
+        ),
+        "construct from cache/ints": (
+            lambda: DecimalCoordinates(latitude=Decimal("55.7504461"), longitude=Decimal("37.6174943")),
+            lambda: Coordinates.from_fixed(557504461, 376174943),
+        ),
+        "hash": (lambda: hash(decimal_coordinates), lambda: hash(fixed_coordinates)),
+        "equality": (
+            lambda: decimal_coordinates == DecimalCoordinates(latitude=latitude, longitude=longitude),
+            lambda: fixed_coordinates == Coordinates.from_fixed(557504461, 376174943),
+        ),
+        "batch key": (
+            lambda: (
+                latitude.quantize(SCALE, rounding=ROUND_HALF_UP),
+                longitude.quantize(SCALE, rounding=ROUND_HALF_UP),
+            ),
+            lambda: {fixed_coordinates: 1},
+        ),
+        "json encode": (
+            lambda: json.dumps([str(decimal_coordinates.latitude), str(decimal_coordinates.longitude)]),
+            lambda: json.dumps([fixed_coordinates.latitude_e7, fixed_coordinates.longitude_e7]),
+        ),
+        "dict key lookup": (
+            lambda: {decimal_coordinates: 1}[decimal_coordinates],
+            lambda: {fixed_coordinates: 1}[fixed_coordinates],
+        ),
+    }
+
+    print(f"{'operation':>26} {'Decimal, ns':>12} {'fixed, ns':>10}")
+    for title, (decimal_case, fixed_case) in cases.items():
+        decimal_ns = timeit.timeit(decimal_case, number=NUMBER) / NUMBER * 1e9
+        fixed_ns = timeit.timeit(fixed_case, number=NUMBER) / NUMBER * 1e9
+        print(f"{title:>26} {decimal_ns:>12.1f} {fixed_ns:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
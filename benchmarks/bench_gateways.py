@@ -0,0 +1,77 @@
+import asyncio
+import time
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from weather_tracker.domain.value_objects import Coordinates
+from weather_tracker.infrastructure.database.core_gateways import PgCoreLocationGateway, PgCoreUserGateway
+from weather_tracker.infrastructure.database.gateways import PgOrmLocationGateway, PgOrmUserGateway
+from weather_tracker.infrastructure.database.orm_models import Base, LocationORM, UserLocationORM, UserORM
+
+LOCATIONS = 100
+ROUNDS = 500
+
+
+async def seed(session_maker) -> uuid.UUID:
+    user_id = uuid.uuid4()
+    locations = [
+        {"id": uuid.uuid4(), "name": f"loc-{i}", "latitude": Decimal(i), "longitude": Decimal(i)}
+        for i in range(LOCATIONS)
+    ]
+    async with session_maker() as session:
+        await session.execute(insert(UserORM).values(id=user_id, login="user", hashed_password="x"))
+        await session.execute(insert(LocationORM), locations)
+        await session.execute(
+            insert(UserLocationORM), [{"user_id": user_id, "location_id": loc["id"]} for loc in locations]
+        )
+        await session.commit()
+    return user_id
+
+
+async def measure(session_maker, query) -> float:
+    async with session_maker() as session:
+        await query(session)
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            await query(session)
+            session.expunge_all()
+        return (time.perf_counter() - start) / ROUNDS * 1_000_000
+
+
+async def main():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    user_id = await seed(session_maker)
+    coordinates = Coordinates(latitude=Decimal(50), longitude=Decimal(50))
+
+    queries = {
+        "find_by_login": lambda gateways, s: gateways[0](session=s).find_by_login(login="user"),
+        "find_by_id": lambda gateways, s: gateways[0](session=s).find_by_id(user_id=user_id),
+        f"find_by_id(load_locations) x{LOCATIONS}": lambda gateways, s: gateways[0](session=s).find_by_id(
+            user_id=user_id, load_locations=True
+        ),
+        "get_by_coords": lambda gateways, s: gateways[1](session=s).get_by_coords(coordinates=coordinates),
+        f"find_by_user_id x{LOCATIONS}": lambda gateways, s: gateways[1](session=s).find_by_user_id(user_id=user_id),
+    }
+    implementations = {
+        "orm": (PgOrmUserGateway, PgOrmLocationGateway),
+        "core": (PgCoreUserGateway, PgCoreLocationGateway),
+    }
+
+    print(f"{'query':>36} {'orm, us':>10} {'core, us':>10}")
+    for title, query in queries.items():
+        results = []
+        for gateways in implementations.values():
+            results.append(await measure(session_maker, lambda s: query(gateways, s)))
+        print(f"{title:>36} {results[0]:>10.1f} {results[1]:>10.1f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from weather_tracker.presentation.middlewares import RequestLoggerMiddleware
+
+REQUESTS = 5_000
+
+logger = logging.getLogger("bench")
+
+
+class BaseHTTPRequestLoggerMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        logger.info(request.url)
+        return await call_next(request)
+
+
+def build_app(middleware) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/locations/{location_id}")
+    async def location(location_id: int):
+        return {"id": location_id, "name": "Moscow"}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(10):
+                yield b"chunk\n"
+
+        return StreamingResponse(chunks())
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+def make_receive():
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+    disconnected = asyncio.Event()
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    return receive
+
+
+async def drive(app: FastAPI, path: str) -> float:
+    async def send(message):
+        pass
+
+    def scope():
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 1),
+            "server": ("bench", 80),
+        }
+
+    for _ in range(100):
+        await app(scope(), make_receive(), send)
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await app(scope(), make_receive(), send)
+    return REQUESTS / (time.perf_counter() - start)
+
+
+async def main():
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])
+    stacks = {
+        "no middleware": None,
+        "BaseHTTPMiddleware": BaseHTTPRequestLoggerMiddleware,
+        "pure ASGI": RequestLoggerMiddleware,
+    }
+    print(f"{'stack':>20} {'json req/s':>11} {'stream req/s':>13}")
+    for title, middleware in stacks.items():
+        app = build_app(middleware)
+        json_rps = await drive(app, "/locations/1")
+        stream_rps = await drive(app, "/stream")
+        print(f"{title:>20} {json_rps:>11.0f} {stream_rps:>13.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
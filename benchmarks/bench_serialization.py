@@ -0,0 +1,68 @@
+import asyncio
+import json
+import random
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from weather_tracker.application.dto import LocationWeatherDTO
+from weather_tracker.domain.value_objects import Coordinates
+from weather_tracker.presentation.schemas import WeatherResponse, dump_weather_list
+
+ITEMS = 1000
+ROUNDS = 20
+STATES = ["Clear", "Clouds", "Rain", "Snow", "Mist"]
+
+
+def build_items() -> list[LocationWeatherDTO]:
+    random.seed(ITEMS)
+    return [
+        LocationWeatherDTO(
+            name=f"Location {i}",
+            coordinates=Coordinates.from_fixed(random.randint(-900_000_000, 900_000_000), random.randint(0, 10**9)),
+            country=random.choice(["RU", "KZ", None]),
+            main_state=random.choice(STATES),
+            temperature=random.uniform(-30, 35),
+            temperature_feels=random.uniform(-35, 35),
+            wind_speed=random.uniform(0, 15),
+            humidity=random.randint(20, 100),
+        )
+        for i in range(ITEMS)
+    ]
+
+
+async def fastapi_path(items: list[LocationWeatherDTO], field) -> bytes:
+    content = [WeatherResponse(**loc.to_dict()) for loc in items]
+    value = await serialize_response(field=field, response_content=content, is_coroutine=True)
+    return JSONResponse(content=value).body
+
+
+def measure(func) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    return (time.perf_counter() - start) / ROUNDS / ITEMS * 1e6
+
+
+def main():
+    items = build_items()
+    field = create_model_field(name="Response_locations_api", type_=list[WeatherResponse], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    old = loop.run_until_complete(fastapi_path(items, field))
+    new = dump_weather_list(items)
+    assert json.loads(old) == json.loads(new)
+
+    old_us = measure(lambda: loop.run_until_complete(fastapi_path(items, field)))
+    new_us = measure(lambda: dump_weather_list(items))
+    print(f"{'path':>36} {'us/item':>8} {'bytes':>8}")
+    print(f"{'to_dict + WeatherResponse + FastAPI':>36} {old_us:>8.2f} {len(old):>8}")
+    print(f"{'payload rows + TypeAdapter.dump_json':>36} {new_us:>8.2f} {len(new):>8}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import time
+import uuid
+from decimal import Decimal
+
+from weather_tracker.domain.entities import Location, User
+from weather_tracker.domain.value_objects import Coordinates
+
+SIZES = (100, 1000, 10000)
+ROUNDS = 20
+
+
+def load_user(locations: list[Location]) -> User:
+    user = User.create(login="user", hashed_password="x")
+    for location in locations:
+        user.add_location(location=location)
+    user.mark_saved()
+    return user
+
+
+def measure(locations: list[Location]) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        user = load_user(locations)
+        for location in user.locations:
+            assert location.coordinates is not None
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def main():
+    print(f"{'locations':>10} {'load, ms':>10} {'per location, us':>18}")
+    for size in SIZES:
+        locations = [
+            Location(id=uuid.uuid4(), name=f"loc-{i}", coordinates=Coordinates(Decimal(i), Decimal(i)))
+            for i in range(size)
+        ]
+        elapsed = measure(locations)
+        print(f"{size:>10} {elapsed:>10.2f} {elapsed / size * 1000:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import asyncio
+import time
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from weather_tracker.infrastructure.database.gateways import PgOrmLocationGateway, PgOrmUserGateway
+from weather_tracker.infrastructure.database.orm_models import Base, LocationORM, UserLocationORM, UserORM
+
+SIZES = (10, 100, 1000)
+ROUNDS = 50
+
+
+async def seed(session_maker, size: int) -> uuid.UUID:
+    user_id = uuid.uuid4()
+    locations = [
+        {"id": uuid.uuid4(), "name": f"loc-{size}-{i}", "latitude": Decimal(size), "longitude": Decimal(i)}
+        for i in range(size)
+    ]
+    async with session_maker() as session:
+        await session.execute(insert(UserORM).values(id=user_id, login=f"user{size}", hashed_password="x"))
+        await session.execute(insert(LocationORM), locations)
+        await session.execute(
+            insert(UserLocationORM), [{"user_id": user_id, "location_id": loc["id"]} for loc in locations]
+        )
+        await session.commit()
+    return user_id
+
+
+async def measure(session_maker, query) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        async with session_maker() as session:
+            await query(session)
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+async def main():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    print(f"{'locations':>10} {'aggregate, ms':>15} {'read model, ms':>15}")
+    for size in SIZES:
+        user_id = await seed(session_maker, size)
+        aggregate = await measure(
+            session_maker, lambda s: PgOrmUserGateway(session=s).find_by_id(user_id=user_id, load_locations=True)
+        )
+        read_model = await measure(session_maker, lambda s: PgOrmLocationGateway(session=s).find_by_user_id(user_id))
+        print(f"{size:>10} {aggregate:>15.3f} {read_model:>15.3f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+import argparse
+import asyncio
+from os import environ
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from weather_tracker.config import PostgresConfig
+
+SEED = [
+    "TRUNCATE user_locations, users, locations",
+    """
+    INSERT INTO locations (id, name, latitude, longitude)
+    SELECT gen_random_uuid(), 'loc-' || i, (i % 1800) / 10.0 - 89.9, (i / 1800) * 0.001 - 179
+    FROM generate_series(0, :locations - 1) AS i
+    """,
+    """
+    INSERT INTO users (id, login, hashed_password)
+    SELECT gen_random_uuid(), 'user-' || i, 'x' FROM generate_series(0, :users - 1) AS i
+    """,
+    """
+    INSERT INTO user_locations (user_id, location_id)
+    SELECT u.id, l.id
+    FROM (SELECT id, row_number() OVER (ORDER BY login) AS n FROM users) AS u
+    CROSS JOIN generate_series(0, :per_user - 1) AS k
+    JOIN (SELECT id, row_number() OVER (ORDER BY name) AS n FROM locations) AS l
+      ON l.n = (u.n * 7 + k * 1009) % (:locations / 2) + 1
+    """,
+    "ANALYZE",
+]
+
+QUERIES = {
+    "users tracking a location": """
+        SELECT user_id FROM user_locations
+        WHERE location_id = (SELECT location_id FROM user_locations ORDER BY user_id LIMIT 1)
+    """,
+    "unreferenced locations batch": """
+        SELECT l.id FROM locations AS l
+        WHERE NOT EXISTS (SELECT 1 FROM user_locations AS ul WHERE ul.location_id = l.id)
+        LIMIT 500
+    """,
+    "location by coordinates": """
+        SELECT id FROM locations WHERE latitude = 10.1 AND longitude = -178.95
+    """,
+}
+
+
+async def main(seed: bool, locations: int, users: int, per_user: int):
+    load_dotenv(override=True)
+    engine = create_async_engine(PostgresConfig(**environ).pg_async_url)
+    async with engine.begin() as conn:
+        if seed:
+            for statement in SEED:
+                await conn.execute(text(statement), {"locations": locations, "users": users, "per_user": per_user})
+        for title, query in QUERIES.items():
+            result = await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {query}"))
+            print(f"-- {title}")
+            for (line,) in result:
+                print(line)
+            print()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", action="store_true")
+    parser.add_argument("--locations", type=int, default=200_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--per-user", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(seed=args.seed, locations=args.locations, users=args.users, per_user=args.per_user))
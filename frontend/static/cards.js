@@ -4,6 +4,7 @@
 function createWeatherCard(location) {
     const card = document.createElement('div');
     card.className = 'col-12 col-lg-3 col-md-6 mb-4';
+    card.dataset.coordinates = `${location.latitude},${location.longitude}`;
 
     const weatherIconClass = getWeatherIconClass(location.mainState);
     const flagEmoji = getCountryFlagEmoji(location.country);
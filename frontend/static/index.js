@@ -7,12 +7,15 @@ let cachedUserName = localStorage.getItem('userName') || null;
 // Константы для API и селекторов
 const API_USER = '/api/user';
 const API_LOCATIONS = '/api/locations';
+const API_LOCATION_EVENTS = '/api/locations/events';
 const API_SEARCH = '/api/search';
 const API_LOGOUT = '/api/logout';
 const SEARCH_INPUT = '.location-search-input-group input';
 const NAV_SECTION = 'nav-auth-section';
 const USER_NAME_ELEMENT = 'user-name';
 
+let weatherEvents = null;
+
 function showError(message) {
     const errorContainer = document.querySelector('#error-container');
     errorContainer.innerHTML = ''; // Очищаем предыдущие ошибки
@@ -36,6 +39,10 @@ function showError(message) {
 
 // Функция для обработки выхода или неавторизованного состояния
 function resetAuthState() {
+    if (weatherEvents) {
+        weatherEvents.close();
+        weatherEvents = null;
+    }
     isAuthenticated = false;
     cachedUserName = null;
     localStorage.removeItem('isAuthenticated');
@@ -73,25 +80,43 @@ function updateNavMenu() {
 
 async function loadWeatherData() {
     try {
-        const response = await fetch('/api/locations', { credentials: 'include' });
-        if (!response.ok) {
-            if (response.status === 401) {
-                resetAuthState();
-                return;
-            }
-            throw new Error(`Failed to fetch data: ${response.status}`);
-        }
-        isAuthenticated = true;
-        localStorage.setItem('isAuthenticated', 'true');
-
-        const data = await response.json();
         const container = document.querySelector('#page-content .container .row');
-        container.innerHTML = '';
+        let cursor = null;
+        do {
+            const url = cursor ? `${API_LOCATIONS}?cursor=${encodeURIComponent(cursor)}` : API_LOCATIONS;
+            const response = await fetch(url, {
+                credentials: 'include',
+                headers: { 'Accept': 'application/x-ndjson' }
+            });
+            if (!response.ok) {
+                if (response.status === 401) {
+                    resetAuthState();
+                    return;
+                }
+                throw new Error(`Failed to fetch data: ${response.status}`);
+            }
+            if (!cursor) {
+                isAuthenticated = true;
+                localStorage.setItem('isAuthenticated', 'true');
+                container.innerHTML = '';
+            }
 
-        data.forEach(location => {
-            const card = createWeatherCard(location);
-            container.appendChild(card);
-        });
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            while (true) {
+                const { done, value } = await reader.read();
+                buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+                const lines = buffer.split('\n');
+                buffer = lines.pop();
+                lines.filter(line => line.trim()).forEach(line => {
+                    container.appendChild(createWeatherCard(JSON.parse(line)));
+                });
+                if (done) break;
+            }
+            cursor = response.headers.get('X-Next-Cursor');
+        } while (cursor);
+        subscribeWeatherUpdates();
     } catch (error) {
         console.error('Error loading weather data:', error);
         if (!error.message.includes('401')) {
@@ -100,6 +125,21 @@ async function loadWeatherData() {
     }
 }
 
+// Подписка на обновления погоды через SSE
+function subscribeWeatherUpdates() {
+    if (weatherEvents) {
+        weatherEvents.close();
+    }
+    weatherEvents = new EventSource(API_LOCATION_EVENTS, { withCredentials: true });
+    weatherEvents.addEventListener('weather', event => {
+        const location = JSON.parse(event.data);
+        const card = document.querySelector(`[data-coordinates="${location.latitude},${location.longitude}"]`);
+        if (card) {
+            card.replaceWith(createWeatherCard(location));
+        }
+    });
+}
+
 // Функция для поиска локаций
 async function searchLocations() {
     const input = document.querySelector(SEARCH_INPUT);
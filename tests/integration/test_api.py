@@ -165,3 +165,33 @@ async def test_remove_location(client: TestClient, ioc: AsyncContainer):
     client.cookies.set(name="session_id", value=session_id)
     response = client.delete("/", params=data)
     assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_batch_update_locations(client: TestClient, ioc: AsyncContainer):
+    data = {"login": "bob", "password": "password_1"}
+    response = client.post("/login", json=data)
+    assert response.status_code == 200
+
+    data = {
+        "add": [
+            {"name": "Kazan", "latitude": 55.7887, "longitude": 49.1221},
+            {"name": "Samara", "latitude": 53.1959, "longitude": 50.1002},
+        ],
+        "remove": [{"name": "Moscow", "latitude": 55.7504461, "longitude": 37.6174943}],
+    }
+    session_id = response.cookies["session_id"]
+    client.cookies.set(name="session_id", value=session_id)
+    response = client.post("/locations/batch", json=data)
+    assert response.status_code == 200
+    assert [(r["action"], r["status"]) for r in response.json()] == [("remove", "error"), ("add", "ok"), ("add", "ok")]
+
+    session_maker: async_sessionmaker[AsyncSession] = await ioc.get(async_sessionmaker[AsyncSession])
+    async with session_maker() as session:
+        query = (
+            select(LocationORM.name)
+            .join(UserLocationORM, LocationORM.id == UserLocationORM.location_id)
+            .join(UserORM, UserLocationORM.user_id == UserORM.id)
+            .where(UserORM.login == "bob")
+        )
+        assert set(await session.scalars(query)) == {"Kazan", "Samara"}
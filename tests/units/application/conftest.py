@@ -1,22 +1,29 @@
 import pytest
 
+from weather_tracker.application.dto import LocationLimits
 from weather_tracker.application.use_cases import (
     AddUserLocation,
+    BatchUpdateUserLocations,
+    GetPopularLocations,
     GetUserLocations,
     LoginUser,
     LogoutUser,
     RegisterUser,
     RemoveUserLocation,
     SearchLocation,
+    SubscribeWeatherUpdates,
 )
 
 from .mocks import (
     MockDBSession,
     MockHasher,
     MockLocationGateway,
+    MockLocationPopularity,
     MockUserGateway,
+    MockUserLocationsCache,
     MockUserSessionGateway,
     MockWeatherClient,
+    MockWeatherUpdates,
 )
 
 
@@ -41,8 +48,23 @@ def hasher():
 
 
 @pytest.fixture
-def location_gateway():
-    return MockLocationGateway()
+def location_gateway(user_gateway):
+    return MockLocationGateway(user_location_storage=user_gateway.user_location_storage)
+
+
+@pytest.fixture
+def locations_cache():
+    return MockUserLocationsCache()
+
+
+@pytest.fixture
+def popularity():
+    return MockLocationPopularity()
+
+
+@pytest.fixture
+def location_limits():
+    return LocationLimits(max_per_user=3, page_size=2, max_page_size=3)
 
 
 @pytest.fixture(scope="module")
@@ -66,35 +88,74 @@ def logout_user(user_session_gateway):
 
 
 @pytest.fixture
-def add_user_location(user_gateway, location_gateway, db_session, user_session_gateway):
+def add_user_location(
+    user_gateway, location_gateway, db_session, user_session_gateway, locations_cache, location_limits, popularity
+):
     return AddUserLocation(
         user_gateway=user_gateway,
         location_gateway=location_gateway,
         user_session_gateway=user_session_gateway,
         db_session=db_session,
+        locations_cache=locations_cache,
+        limits=location_limits,
+        popularity=popularity,
     )
 
 
 @pytest.fixture
-def remove_user_location(user_gateway, location_gateway, db_session, user_session_gateway):
+def remove_user_location(user_gateway, location_gateway, db_session, user_session_gateway, locations_cache, popularity):
     return RemoveUserLocation(
         user_gateway=user_gateway,
         location_gateway=location_gateway,
         db_session=db_session,
         user_session_gateway=user_session_gateway,
+        locations_cache=locations_cache,
+        popularity=popularity,
     )
 
 
 @pytest.fixture
-def get_user_locations(user_gateway, location_gateway, weather_client, user_session_gateway):
-    return GetUserLocations(
+def batch_update_user_locations(
+    user_gateway, location_gateway, db_session, user_session_gateway, locations_cache, location_limits, popularity
+):
+    return BatchUpdateUserLocations(
         user_gateway=user_gateway,
+        location_gateway=location_gateway,
+        user_session_gateway=user_session_gateway,
+        db_session=db_session,
+        locations_cache=locations_cache,
+        limits=location_limits,
+        popularity=popularity,
+    )
+
+
+@pytest.fixture
+def get_user_locations(location_gateway, weather_client, user_session_gateway, locations_cache, location_limits):
+    return GetUserLocations(
         location_gateway=location_gateway,
         weather_client=weather_client,
         user_session_gateway=user_session_gateway,
+        locations_cache=locations_cache,
+        limits=location_limits,
     )
 
 
 @pytest.fixture
 def search_location(weather_client):
     return SearchLocation(weather_client=weather_client)
+
+
+@pytest.fixture
+def get_popular_locations(popularity, user_session_gateway, location_limits):
+    return GetPopularLocations(popularity=popularity, user_session_gateway=user_session_gateway, limits=location_limits)
+
+
+@pytest.fixture
+def subscribe_weather_updates(location_gateway, user_session_gateway, db_session, locations_cache):
+    return SubscribeWeatherUpdates(
+        location_gateway=location_gateway,
+        user_session_gateway=user_session_gateway,
+        db_session=db_session,
+        locations_cache=locations_cache,
+        weather_updates=MockWeatherUpdates(),
+    )
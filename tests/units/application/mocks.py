@@ -1,3 +1,4 @@
+import asyncio
 import random
 import uuid
 from datetime import UTC, datetime, timedelta
@@ -5,14 +6,25 @@ from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
-from weather_tracker.application.dto import LocationDTO, LocationWeatherDTO, UserSessionDTO
+from weather_tracker.application.dto import (
+    CachedUserLocationsDTO,
+    LocationDTO,
+    LocationWeatherDTO,
+    PopularLocationDTO,
+    UserLocationDTO,
+    UserSessionDTO,
+)
 from weather_tracker.application.interfaces import (
     DBSession,
     Hasher,
     LocationGateway,
+    LocationPopularity,
     UserGateway,
+    UserLocationsCache,
     UserSessionGateway,
     WeatherClient,
+    WeatherSubscription,
+    WeatherUpdates,
 )
 from weather_tracker.domain.entities import Location, User
 from weather_tracker.domain.value_objects import Coordinates
@@ -21,7 +33,7 @@ from weather_tracker.domain.value_objects import Coordinates
 class MockUserGateway(UserGateway):
     def __init__(self):
         self.storage: list[User] = []
-        self.user_location_storage: dict[UUID, list[Location]] = {}
+        self.user_location_storage: dict[UUID, tuple[Location, ...]] = {}
 
     async def find_by_login(self, login: str) -> Optional[User]:
         for usr in self.storage:
@@ -29,7 +41,7 @@ class MockUserGateway(UserGateway):
                 return usr
         return None
 
-    async def find_by_id(self, user_id: UUID, load_locations: bool = False) -> Optional[User]:
+    async def find_by_id(self, user_id: UUID, load_locations: bool = False, for_update: bool = False) -> Optional[User]:
         for usr in self.storage:
             if usr.id == user_id:
                 return usr
@@ -40,6 +52,7 @@ class MockUserGateway(UserGateway):
             self.storage.append(user)
 
         self.user_location_storage[user.id] = user.locations
+        user.mark_saved()
 
 
 class MockHasher(Hasher):
@@ -75,23 +88,85 @@ class MockUserSessionGateway(UserSessionGateway):
 
 
 class MockDBSession(DBSession):
+    def __init__(self):
+        self.closed = False
+
     async def commit(self) -> None:
         pass
 
+    async def close(self) -> None:
+        self.closed = True
+
 
 class MockLocationGateway(LocationGateway):
-    def __init__(self):
+    def __init__(self, user_location_storage: Optional[dict[UUID, tuple[Location, ...]]] = None):
         self.storage: list[Location] = []
+        self.user_location_storage = user_location_storage if user_location_storage is not None else {}
 
     async def save(self, location: Location):
         self.storage.append(location)
 
+    async def upsert(self, location: Location) -> Location:
+        exists_location = await self.get_by_coords(coordinates=location.coordinates)
+        if exists_location is not None:
+            return exists_location
+        self.storage.append(location)
+        return location
+
+    async def upsert_many(self, new_locations: list[Location]) -> list[Location]:
+        return [await self.upsert(location=location) for location in new_locations]
+
     async def get_by_coords(self, coordinates: Coordinates) -> Optional[Location]:
         for loc in self.storage:
             if loc.coordinates == coordinates:
                 return loc
         return None
 
+    async def find_by_user_id(self, user_id: UUID) -> list[UserLocationDTO]:
+        return [
+            UserLocationDTO(id=loc.id, name=loc.name, coordinates=loc.coordinates)
+            for loc in self.user_location_storage.get(user_id, [])
+        ]
+
+
+class MockUserLocationsCache(UserLocationsCache):
+    def __init__(self):
+        self.versions: dict[UUID, int] = {}
+        self.storage: dict[UUID, tuple[int, list[UserLocationDTO]]] = {}
+
+    async def get(self, user_id: UUID) -> CachedUserLocationsDTO:
+        version = self.versions.get(user_id, 0)
+        if user_id in self.storage and self.storage[user_id][0] == version:
+            return CachedUserLocationsDTO(version=version, locations=self.storage[user_id][1])
+        return CachedUserLocationsDTO(version=version)
+
+    async def set(self, user_id: UUID, version: int, locations: list[UserLocationDTO]) -> None:
+        self.storage[user_id] = (version, locations)
+
+    async def invalidate(self, user_id: UUID) -> None:
+        self.versions[user_id] = self.versions.get(user_id, 0) + 1
+        self.storage.pop(user_id, None)
+
+
+class MockLocationPopularity(LocationPopularity):
+    def __init__(self):
+        self.storage: dict[UUID, PopularLocationDTO] = {}
+
+    async def record(self, added: list[Location], removed: list[Location]) -> None:
+        for loc in added:
+            subscribers = self.storage[loc.id].subscribers if loc.id in self.storage else 0
+            self.storage[loc.id] = PopularLocationDTO(
+                id=loc.id, name=loc.name, coordinates=loc.coordinates, subscribers=subscribers + 1
+            )
+        for loc in removed:
+            if loc.id in self.storage:
+                self.storage[loc.id].subscribers -= 1
+                if self.storage[loc.id].subscribers <= 0:
+                    del self.storage[loc.id]
+
+    async def top(self, limit: int) -> list[PopularLocationDTO]:
+        return sorted(self.storage.values(), key=lambda loc: loc.subscribers, reverse=True)[:limit]
+
 
 class MockWeatherClient(WeatherClient):
     async def search_location(self, name: str) -> list[LocationDTO]:
@@ -102,7 +177,7 @@ class MockWeatherClient(WeatherClient):
                 locations.append(LocationDTO(name=name, coordinates=coords))
         return locations
 
-    async def get_weather_by_location(self, location: Location) -> LocationWeatherDTO:
+    async def get_weather_by_location(self, location: Location | UserLocationDTO) -> LocationWeatherDTO:
         return LocationWeatherDTO(
             name=location.name,
             coordinates=location.coordinates,
@@ -113,3 +188,36 @@ class MockWeatherClient(WeatherClient):
             humidity=90,
             wind_speed=0,
         )
+
+
+class MockDelayedWeatherClient(MockWeatherClient):
+    def __init__(self, delays: dict[str, float]):
+        self.delays = delays
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_weather_by_location(self, location: Location | UserLocationDTO) -> LocationWeatherDTO:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(location.name, 0))
+            return await super().get_weather_by_location(location=location)
+        finally:
+            self.in_flight -= 1
+
+
+class MockWeatherSubscription(WeatherSubscription):
+    def __init__(self, locations: list[UserLocationDTO]):
+        self.locations = locations
+        self.closed = False
+
+    async def next_updates(self) -> list[LocationWeatherDTO]:
+        return []
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class MockWeatherUpdates(WeatherUpdates):
+    async def subscribe(self, locations: list[UserLocationDTO]) -> WeatherSubscription:
+        return MockWeatherSubscription(locations=locations)
@@ -3,11 +3,13 @@ from decimal import Decimal
 
 import pytest
 
-from weather_tracker.application.dto import LocationAddInput, LoginUserInput
-from weather_tracker.application.exceptions import UserLocationError
+from weather_tracker.application.dto import LocationAddInput, LocationsBatchInput, LoginUserInput
+from weather_tracker.application.exceptions import InvalidCursorError, UserLocationError
 from weather_tracker.domain.entities import Location, User
 from weather_tracker.domain.value_objects import Coordinates
 
+from .mocks import MockDelayedWeatherClient
+
 
 @pytest.mark.asyncio
 async def test_add_new_location(login_user, add_user_location):
@@ -86,7 +88,7 @@ async def test_remove_not_user_location(remove_user_location, login_user):
 
 
 @pytest.mark.asyncio
-async def test_get_user_locations(get_user_locations, login_user):
+async def test_get_user_locations(get_user_locations, login_user, user_gateway):
     exists_user = User(id=uuid.uuid4(), login="usr", hashed_password="hashed_password")
 
     location1 = Location(
@@ -102,23 +104,176 @@ async def test_get_user_locations(get_user_locations, login_user):
     exists_user.add_location(location=location1)
     exists_user.add_location(location=location2)
 
-    await get_user_locations.user_gateway.save(user=exists_user)
+    await user_gateway.save(user=exists_user)
     session = await login_user.execute(LoginUserInput(login=exists_user.login, password=exists_user.hashed_password))
     result = await get_user_locations.execute(session_id=str(session.session_id))
 
-    assert len(result) == 2
-    assert result[0].name == "Moscow"
-    assert result[0].temperature is not None
+    assert len(result.items) == 2
+    assert {loc.name for loc in result.items} == {"Moscow", "Kazan"}
+    assert result.items[0].temperature is not None
+    assert result.next_cursor is None
 
 
 @pytest.mark.asyncio
-async def test_get_user_not_locations(get_user_locations, login_user):
+async def test_get_user_not_locations(get_user_locations, login_user, user_gateway):
     exists_user = User(id=uuid.uuid4(), login="usr", hashed_password="hashed_password")
-    await get_user_locations.user_gateway.save(user=exists_user)
+    await user_gateway.save(user=exists_user)
     session = await login_user.execute(LoginUserInput(login=exists_user.login, password=exists_user.hashed_password))
     result = await get_user_locations.execute(session_id=str(session.session_id))
 
-    assert len(result) == 0
+    assert len(result.items) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_user_locations_after_write(get_user_locations, add_user_location, remove_user_location, login_user):
+    exists_user = User(id=uuid.uuid4(), login="usr", hashed_password="hashed_password")
+    await add_user_location.user_gateway.save(user=exists_user)
+    session = await login_user.execute(LoginUserInput(login=exists_user.login, password=exists_user.hashed_password))
+    moscow = LocationAddInput(name="Moscow", coordinates=Coordinates(latitude=Decimal(50), longitude=Decimal(60)))
+    kazan = LocationAddInput(name="Kazan", coordinates=Coordinates(latitude=Decimal(60), longitude=Decimal(60)))
+
+    assert (await get_user_locations.execute(session_id=str(session.session_id))).items == []
+    await add_user_location.execute(session_id=str(session.session_id), location_data=moscow)
+    await add_user_location.execute(session_id=str(session.session_id), location_data=kazan)
+
+    result = await get_user_locations.execute(session_id=str(session.session_id))
+    assert {loc.name for loc in result.items} == {"Moscow", "Kazan"}
+    version = result.version
+
+    storage = get_user_locations.location_gateway.user_location_storage
+    committed = dict(storage)
+    storage.clear()
+    cached = await get_user_locations.execute(session_id=str(session.session_id))
+    assert {loc.name for loc in cached.items} == {"Moscow", "Kazan"}
+    assert cached.version == version
+    storage.update(committed)
+
+    await remove_user_location.execute(session_id=str(session.session_id), location_data=moscow)
+    result = await get_user_locations.execute(session_id=str(session.session_id))
+    assert [loc.name for loc in result.items] == ["Kazan"]
+    assert result.version > version
+
+
+@pytest.mark.asyncio
+async def test_get_user_locations_pages(get_user_locations, login_user, user_gateway):
+    exists_user = User(id=uuid.uuid4(), login="usr", hashed_password="hashed_password")
+    locations = [
+        Location.create(name=f"loc-{i}", coordinates=Coordinates(latitude=Decimal(i), longitude=Decimal(i)))
+        for i in range(3)
+    ]
+    for location in locations:
+        exists_user.add_location(location=location)
+    await user_gateway.save(user=exists_user)
+    session = await login_user.execute(LoginUserInput(login=exists_user.login, password=exists_user.hashed_password))
+
+    first = await get_user_locations.execute(session_id=str(session.session_id))
+    second = await get_user_locations.execute(session_id=str(session.session_id), cursor=first.next_cursor)
+    single = await get_user_locations.execute(session_id=str(session.session_id), limit=100)
+
+    expected = [loc.name for loc in sorted(locations, key=lambda loc: loc.id)]
+    assert [loc.name for loc in first.items + second.items] == expected
+    assert second.next_cursor is None
+    assert len(single.items) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_user_locations_invalid_cursor(get_user_locations, login_user, user_gateway):
+    exists_user = User(id=uuid.uuid4(), login="usr", hashed_password="hashed_password")
+    await user_gateway.save(user=exists_user)
+    session = await login_user.execute(LoginUserInput(login=exists_user.login, password=exists_user.hashed_password))
+
+    with pytest.raises(InvalidCursorError):
+        await get_user_locations.execute(session_id=str(session.session_id), cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_add_location_over_limit(add_user_location, login_user):
+    exists_user = User(id=uuid.uuid4(), login="usr", hashed_password="hashed_password")
+    await add_user_location.user_gateway.save(user=exists_user)
+    session = await login_user.execute(LoginUserInput(login=exists_user.login, password=exists_user.hashed_password))
+
+    for i in range(3):
+        loc_data = LocationAddInput(name=f"loc-{i}", coordinates=Coordinates(latitude=Decimal(i), longitude=Decimal(i)))
+        await add_user_location.execute(session_id=str(session.session_id), location_data=loc_data)
+
+    loc_data = LocationAddInput(name="loc-3", coordinates=Coordinates(latitude=Decimal(3), longitude=Decimal(3)))
+    with pytest.raises(UserLocationError):
+        await add_user_location.execute(session_id=str(session.session_id), location_data=loc_data)
+    assert len(exists_user.locations) == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_update_locations(batch_update_user_locations, get_user_locations, login_user):
+    moscow = Location.create(name="Moscow", coordinates=Coordinates(latitude=Decimal(50), longitude=Decimal(60)))
+    exists_user = User(id=uuid.uuid4(), login="usr", hashed_password="hashed_password")
+    exists_user.add_location(location=moscow)
+    await batch_update_user_locations.location_gateway.save(location=moscow)
+    await batch_update_user_locations.user_gateway.save(user=exists_user)
+    session = await login_user.execute(LoginUserInput(login=exists_user.login, password=exists_user.hashed_password))
+
+    batch = LocationsBatchInput(
+        add=[
+            LocationAddInput(name=f"loc-{i}", coordinates=Coordinates(latitude=Decimal(i), longitude=Decimal(i)))
+            for i in range(4)
+        ],
+        remove=[
+            LocationAddInput(name="Moscow", coordinates=moscow.coordinates),
+            LocationAddInput(name="Kazan", coordinates=Coordinates(latitude=Decimal(60), longitude=Decimal(60))),
+        ],
+    )
+    results = await batch_update_user_locations.execute(session_id=str(session.session_id), batch=batch)
+
+    assert [(r.action, r.status) for r in results] == [
+        ("remove", "ok"),
+        ("remove", "error"),
+        ("add", "ok"),
+        ("add", "ok"),
+        ("add", "ok"),
+        ("add", "error"),
+    ]
+    page = await get_user_locations.execute(session_id=str(session.session_id), limit=3)
+    assert {loc.name for loc in page.items} == {"loc-0", "loc-1", "loc-2"}
+
+
+@pytest.mark.asyncio
+async def test_batch_update_locations_without_changes(batch_update_user_locations, login_user):
+    exists_user = User(id=uuid.uuid4(), login="usr", hashed_password="hashed_password")
+    await batch_update_user_locations.user_gateway.save(user=exists_user)
+    session = await login_user.execute(LoginUserInput(login=exists_user.login, password=exists_user.hashed_password))
+
+    kazan = LocationAddInput(name="Kazan", coordinates=Coordinates(latitude=Decimal(60), longitude=Decimal(60)))
+    results = await batch_update_user_locations.execute(
+        session_id=str(session.session_id), batch=LocationsBatchInput(add=[], remove=[kazan])
+    )
+
+    assert [(r.action, r.status) for r in results] == [("remove", "error")]
+    assert batch_update_user_locations.locations_cache.versions == {}
+    assert batch_update_user_locations.popularity.storage == {}
+
+
+@pytest.mark.asyncio
+async def test_get_popular_locations(add_user_location, remove_user_location, get_popular_locations, login_user):
+    moscow = LocationAddInput(name="Moscow", coordinates=Coordinates(latitude=Decimal(50), longitude=Decimal(60)))
+    kazan = LocationAddInput(name="Kazan", coordinates=Coordinates(latitude=Decimal(60), longitude=Decimal(60)))
+    sessions = []
+    for login in ["usr1", "usr2"]:
+        exists_user = User(id=uuid.uuid4(), login=login, hashed_password="hashed_password")
+        await add_user_location.user_gateway.save(user=exists_user)
+        session = await login_user.execute(LoginUserInput(login=login, password=exists_user.hashed_password))
+        sessions.append(str(session.session_id))
+
+    for session_id in sessions:
+        await add_user_location.execute(session_id=session_id, location_data=moscow)
+    await add_user_location.execute(session_id=sessions[0], location_data=kazan)
+    await remove_user_location.execute(session_id=sessions[1], location_data=moscow)
+    await add_user_location.execute(session_id=sessions[1], location_data=kazan)
+    await remove_user_location.execute(session_id=sessions[0], location_data=kazan)
+
+    result = await get_popular_locations.execute(session_id=sessions[0])
+    assert [(loc.name, loc.subscribers) for loc in result] == [("Moscow", 1), ("Kazan", 1)]
+    assert len(await get_popular_locations.execute(session_id=sessions[0], limit=1)) == 1
+    with pytest.raises(ValueError):
+        await get_popular_locations.execute(session_id=str(uuid.uuid4()))
 
 
 @pytest.mark.asyncio
@@ -131,3 +286,44 @@ async def test_search_location(search_location):
 async def test_search_not_exists_location(search_location):
     result = await search_location.execute(location_name="Stalingrad")
     assert len(result) == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_user_locations_as_completed(get_user_locations, login_user, user_gateway):
+    exists_user = User(id=uuid.uuid4(), login="usr", hashed_password="hashed_password")
+    locations = [
+        Location.create(name=f"loc-{i}", coordinates=Coordinates(latitude=Decimal(i), longitude=Decimal(i)))
+        for i in range(3)
+    ]
+    for location in locations:
+        exists_user.add_location(location=location)
+    await user_gateway.save(user=exists_user)
+    session = await login_user.execute(LoginUserInput(login=exists_user.login, password=exists_user.hashed_password))
+
+    first, second, third = sorted(locations, key=lambda loc: loc.id)
+    weather_client = MockDelayedWeatherClient(delays={first.name: 0.05, second.name: 0.01, third.name: 0})
+    get_user_locations.weather_client = weather_client
+    get_user_locations.limits.stream_concurrency = 2
+
+    page = await get_user_locations.execute_stream(session_id=str(session.session_id), limit=3)
+    names = [loc.name async for loc in page.items]
+
+    assert names == [second.name, third.name, first.name]
+    assert weather_client.max_in_flight == 2
+    assert page.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_subscribe_weather_updates_releases_db_session(
+    add_user_location, subscribe_weather_updates, login_user, db_session
+):
+    exists_user = User(id=uuid.uuid4(), login="usr", hashed_password="hashed_password")
+    await add_user_location.user_gateway.save(user=exists_user)
+    session = await login_user.execute(LoginUserInput(login=exists_user.login, password=exists_user.hashed_password))
+    moscow = LocationAddInput(name="Moscow", coordinates=Coordinates(latitude=Decimal(50), longitude=Decimal(60)))
+    await add_user_location.execute(session_id=str(session.session_id), location_data=moscow)
+
+    subscription = await subscribe_weather_updates.execute(session_id=str(session.session_id))
+
+    assert db_session.closed
+    assert [loc.name for loc in subscription.locations] == ["Moscow"]
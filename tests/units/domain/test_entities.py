@@ -38,6 +38,16 @@ def test_user_add_same_location():
         user.add_location(location=moscow)
 
 
+def test_user_add_location_over_limit():
+    user = User.create(login="test", hashed_password="hashed_password")
+    moscow = Location.create(name="Moscow", coordinates=Coordinates(longitude=Decimal(5), latitude=Decimal(5)))
+    kazan = Location.create(name="Kazan", coordinates=Coordinates(longitude=Decimal(6), latitude=Decimal(6)))
+    user.add_location(location=moscow, max_locations=1)
+    with pytest.raises(DomainError):
+        user.add_location(location=kazan, max_locations=1)
+    assert user.locations == (moscow,)
+
+
 def test_user_delete_location():
     user = User.create(login="test", hashed_password="hashed_password")
     coordinates = Coordinates(longitude=Decimal(5.0), latitude=Decimal(5))
@@ -57,3 +67,56 @@ def test_user_delete_nonexistent_location():
 
     with pytest.raises(DomainError):
         user.remove_location(location=ufa)
+
+
+def test_user_tracks_location_changes():
+    user = User.create(login="test", hashed_password="hashed_password")
+    moscow = Location.create(name="Moscow", coordinates=Coordinates(longitude=Decimal(5), latitude=Decimal(5)))
+    ufa = Location.create(name="Ufa", coordinates=Coordinates(longitude=Decimal(2), latitude=Decimal(5)))
+    user.add_location(location=moscow)
+    user.add_location(location=ufa)
+    user.mark_saved()
+    assert not user.is_new
+    assert user.added_locations == []
+
+    user.remove_location(location=moscow)
+    assert user.removed_locations == [moscow]
+
+    user.add_location(location=moscow)
+    user.remove_location(location=ufa)
+    assert user.added_locations == []
+    assert user.removed_locations == [ufa]
+
+
+def test_coordinates_equality():
+    coordinates = Coordinates(latitude=Decimal(5), longitude=Decimal(6))
+
+    assert coordinates == Coordinates(latitude=Decimal("5.0"), longitude=Decimal(6))
+    assert coordinates != Coordinates(latitude=Decimal(5), longitude=Decimal(7))
+    assert len({coordinates, Coordinates(latitude=Decimal("5.00"), longitude=Decimal("6.00"))}) == 1
+
+
+def test_user_locations_keep_insertion_order():
+    user = User.create(login="test", hashed_password="hashed_password")
+    locations = [
+        Location.create(name=f"loc-{i}", coordinates=Coordinates(latitude=Decimal(i), longitude=Decimal(i)))
+        for i in range(5)
+    ]
+    for location in locations:
+        user.add_location(location=location)
+    user.remove_location(location=locations[2])
+    user.add_location(location=locations[2])
+
+    assert [loc.name for loc in user.locations] == ["loc-0", "loc-1", "loc-3", "loc-4", "loc-2"]
+    assert user.locations is user.locations
+
+
+def test_coordinates_fixed_point():
+    coordinates = Coordinates(latitude=Decimal("55.7504461"), longitude=37.6174943)
+
+    assert coordinates.latitude_e7 == 557504461
+    assert coordinates.longitude_e7 == 376174943
+    assert coordinates.latitude == Decimal("55.7504461")
+    assert coordinates.longitude == Decimal("37.6174943")
+    assert Coordinates(latitude=-90, longitude=Decimal("-179.99999995")).longitude_e7 == -1800000000
+    assert Coordinates.from_fixed(557504461, 376174943) == coordinates
@@ -7,10 +7,15 @@ from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from weather_tracker.config import Config
+from weather_tracker.infrastructure.database.core_gateways import PgCoreLocationGateway, PgCoreUserGateway
 from weather_tracker.infrastructure.database.gateways import PgOrmLocationGateway, PgOrmUserGateway
 from weather_tracker.infrastructure.database.orm_models import Base
+from weather_tracker.infrastructure.external_api.caching_weather_client import CachingWeatherClient
 from weather_tracker.infrastructure.external_api.open_weather_client import OpenWeatherClient
+from weather_tracker.infrastructure.locations_cache import RedisUserLocationsCache
+from weather_tracker.infrastructure.popularity import RedisLocationPopularity
 from weather_tracker.infrastructure.session_gateway import RedisUserSessionGateway
+from weather_tracker.infrastructure.weather_updates import RedisWeatherUpdatesHub
 
 from .mocks import MockAsyncHTTPClient, MockDatabase
 
@@ -49,14 +54,14 @@ async def db_session(database: MockDatabase) -> AsyncGenerator[AsyncSession, Non
         yield session
 
 
-@pytest_asyncio.fixture
-async def pg_user_gateway(db_session: AsyncSession) -> PgOrmUserGateway:
-    return PgOrmUserGateway(session=db_session)
+@pytest_asyncio.fixture(params=[PgOrmUserGateway, PgCoreUserGateway])
+async def pg_user_gateway(request, db_session: AsyncSession) -> PgOrmUserGateway | PgCoreUserGateway:
+    return request.param(session=db_session)
 
 
-@pytest_asyncio.fixture
-async def pg_location_gateway(db_session: AsyncSession) -> PgOrmLocationGateway:
-    return PgOrmLocationGateway(session=db_session)
+@pytest_asyncio.fixture(params=[PgOrmLocationGateway, PgCoreLocationGateway])
+async def pg_location_gateway(request, db_session: AsyncSession) -> PgOrmLocationGateway | PgCoreLocationGateway:
+    return request.param(session=db_session)
 
 
 @pytest.fixture
@@ -67,3 +72,27 @@ def redis_client() -> Redis:
 @pytest_asyncio.fixture
 async def redis_session_gateway(redis_client, test_config) -> RedisUserSessionGateway:
     return RedisUserSessionGateway(redis_client=redis_client, config=test_config.redis)
+
+
+@pytest_asyncio.fixture
+async def redis_locations_cache(redis_client, test_config) -> RedisUserLocationsCache:
+    return RedisUserLocationsCache(redis_client=redis_client, config=test_config.redis)
+
+
+@pytest_asyncio.fixture
+async def redis_location_popularity(redis_client) -> RedisLocationPopularity:
+    return RedisLocationPopularity(redis_client=redis_client)
+
+
+@pytest_asyncio.fixture
+async def caching_weather_client(open_weather_client, redis_client, test_config) -> CachingWeatherClient:
+    return CachingWeatherClient(
+        weather_client=open_weather_client, redis_client=redis_client, config=test_config.open_weather
+    )
+
+
+@pytest_asyncio.fixture
+async def weather_updates_hub(redis_client) -> AsyncGenerator[RedisWeatherUpdatesHub, None]:
+    hub = RedisWeatherUpdatesHub(redis_client=redis_client, poll_timeout=0.01)
+    yield hub
+    await hub.close()
@@ -0,0 +1,181 @@
+from decimal import Decimal
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from weather_tracker.domain.entities import Location, User
+from weather_tracker.domain.value_objects import Coordinates
+from weather_tracker.infrastructure.database.gateways import PgOrmLocationGateway, PgOrmUserGateway
+from weather_tracker.infrastructure.database.instrumentation import (
+    CountingStatementCache,
+    InstrumentedAsyncAdaptedQueuePool,
+    PoolInstrumentation,
+)
+from weather_tracker.infrastructure.database.maintenance import LocationGarbageCollector, location_subscriber_counts
+from weather_tracker.infrastructure.database.orm_models import Base, LocationORM
+from weather_tracker.infrastructure.database.replicas import (
+    ReplicaLocationGateway,
+    ReplicaRouter,
+    ReplicaUserGateway,
+)
+from weather_tracker.infrastructure.database.session import pg_replica_session_makers
+
+from .mocks import MockDatabase
+
+
+@pytest.mark.asyncio
+async def test_pool_instrumentation_records_checkouts(tmp_path):
+    engine = create_async_engine(
+        url=f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedAsyncAdaptedQueuePool, pool_size=2
+    )
+    instrumentation = PoolInstrumentation()
+    waits = []
+    queries = []
+    instrumentation.checkout_hooks.append(waits.append)
+    instrumentation.query_hooks.append(lambda statement, duration: queries.append(statement))
+    instrumentation.attach(engine=engine)
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        stats = instrumentation.snapshot()
+        assert stats.checked_out == 1
+        assert stats.size == 2
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    stats = instrumentation.snapshot()
+    assert stats.checkouts == 2
+    assert stats.checked_out == 0
+    assert len(waits) == 2
+    assert queries == ["SELECT", "SELECT"]
+    assert stats.checkout_wait_max >= stats.checkout_wait_avg > 0
+    await engine.dispose()
+
+
+def test_counting_statement_cache_hit_rate():
+    instrumentation = PoolInstrumentation()
+    cache = CountingStatementCache(cache={}, instrumentation=instrumentation)
+
+    assert "SELECT 1" not in cache
+    cache["SELECT 1"] = object()
+    assert "SELECT 1" in cache
+    assert "SELECT 1" in cache
+
+    stats = instrumentation.snapshot()
+    assert stats.statement_cache_hits == 2
+    assert stats.statement_cache_misses == 1
+    assert stats.statement_cache_hit_rate == pytest.approx(2 / 3)
+
+
+def test_replica_router_round_robin():
+    router = ReplicaRouter(replicas=["replica1", "replica2"], redis_client=FakeRedis(), sticky_sec=5)
+
+    assert [router.next_replica() for _ in range(3)] == ["replica1", "replica2", "replica1"]
+    assert ReplicaRouter(replicas=[], redis_client=FakeRedis(), sticky_sec=5).next_replica() is None
+
+
+def test_replica_session_makers_are_instrumented(test_config):
+    pg_config = test_config.postgres.model_copy(update={"replica_hosts": ["replica1", "replica2:6432"]})
+    instrumentations = []
+
+    def factory():
+        instrumentations.append(PoolInstrumentation())
+        return instrumentations[-1]
+
+    replicas = pg_replica_session_makers(pg_config=pg_config, instrumentation_factory=factory)
+
+    assert len(instrumentations) == 2
+    assert [replica.kw["bind"].pool for replica in replicas] == [item.pool for item in instrumentations]
+    assert all(replica.kw["bind"].pool.instrumentation is item for replica, item in zip(replicas, instrumentations))
+
+
+@pytest.mark.asyncio
+async def test_replica_gateways_read_your_writes(database: MockDatabase, tmp_path):
+    replica_db = MockDatabase(db_url=f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    async with replica_db.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    router = ReplicaRouter(replicas=[replica_db.async_session_maker], redis_client=FakeRedis(), sticky_sec=5)
+
+    user = User.create(login="test", hashed_password="hashed_password")
+    async with database.async_session_maker() as session:
+        location = await PgOrmLocationGateway(session=session).upsert(
+            location=Location.create(name="Moscow", coordinates=Coordinates(Decimal(50), Decimal(60)))
+        )
+        user.add_location(location)
+        await PgOrmUserGateway(session=session).save(user=user)
+        await session.commit()
+
+    async with database.async_session_maker() as session:
+        location_gateway = ReplicaLocationGateway(
+            primary=PgOrmLocationGateway(session=session), replica_gateway=PgOrmLocationGateway, replica_router=router
+        )
+        user_gateway = ReplicaUserGateway(
+            primary=PgOrmUserGateway(session=session), replica_gateway=PgOrmUserGateway, replica_router=router
+        )
+
+        assert await location_gateway.find_by_user_id(user_id=user.id) == []
+        assert (await user_gateway.find_by_login(login="test")).id == user.id
+
+        await router.mark_written(user_id=user.id)
+        assert len(await location_gateway.find_by_user_id(user_id=user.id)) == 1
+    await replica_db.engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_location_garbage_collector(database: MockDatabase):
+    user = User.create(login="test", hashed_password="hashed_password")
+    async with database.async_session_maker() as session:
+        location_gateway = PgOrmLocationGateway(session=session)
+        tracked = await location_gateway.upsert(
+            location=Location.create(name="Moscow", coordinates=Coordinates(Decimal(50), Decimal(60)))
+        )
+        for i in range(5):
+            await location_gateway.save(
+                location=Location.create(name=f"loc-{i}", coordinates=Coordinates(Decimal(i), Decimal(i)))
+            )
+        user.add_location(tracked)
+        await PgOrmUserGateway(session=session).save(user=user)
+        await session.commit()
+
+    reported = []
+
+    async def on_batch(stats):
+        reported.append(stats.deleted)
+
+    collector = LocationGarbageCollector(session_maker=database.async_session_maker, batch_size=2)
+    batches = await collector.run(on_batch=on_batch)
+
+    assert [stats.deleted for stats in batches] == [2, 2, 1]
+    assert reported == [2, 2, 1]
+    assert all(stats.elapsed > 0 for stats in batches)
+    async with database.async_session_maker() as session:
+        assert list(await session.scalars(select(LocationORM.id))) == [tracked.id]
+    assert (await collector.run(max_batches=1))[0].deleted == 0
+
+
+@pytest.mark.asyncio
+async def test_location_subscriber_counts(database: MockDatabase):
+    moscow = Location.create(name="Moscow", coordinates=Coordinates(Decimal(50), Decimal(60)))
+    kazan = Location.create(name="Kazan", coordinates=Coordinates(Decimal(60), Decimal(60)))
+    async with database.async_session_maker() as session:
+        location_gateway = PgOrmLocationGateway(session=session)
+        for location in (
+            moscow,
+            kazan,
+            Location.create(name="Samara", coordinates=Coordinates(Decimal(1), Decimal(1))),
+        ):
+            await location_gateway.save(location=location)
+        for login, locations in (("first", [moscow, kazan]), ("second", [moscow])):
+            user = User.create(login=login, hashed_password="hashed_password")
+            for location in locations:
+                user.add_location(location)
+            await PgOrmUserGateway(session=session).save(user=user)
+        await session.commit()
+
+    counts = await location_subscriber_counts(session_maker=database.async_session_maker)
+
+    assert sorted((loc.name, loc.subscribers) for loc in counts) == [("Kazan", 1), ("Moscow", 2)]
+    assert {loc.coordinates for loc in counts} == {moscow.coordinates, kazan.coordinates}
@@ -1,19 +1,28 @@
+import asyncio
+import os
+import random
 import time
 import uuid
 from decimal import Decimal
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import delete, select
 
+from weather_tracker.application.dto import PopularLocationDTO, UserLocationDTO
 from weather_tracker.domain.entities import Location, User
 from weather_tracker.domain.value_objects import Coordinates
+from weather_tracker.infrastructure.database.core_gateways import PgCoreLocationGateway
 from weather_tracker.infrastructure.database.gateways import PgOrmLocationGateway, PgOrmUserGateway
-from weather_tracker.infrastructure.database.orm_models import LocationORM, UserLocationORM, UserORM
+from weather_tracker.infrastructure.database.orm_models import Base, LocationORM, UserLocationORM, UserORM
+from weather_tracker.infrastructure.locations_cache import RedisUserLocationsCache
+from weather_tracker.infrastructure.popularity import RedisLocationPopularity
 from weather_tracker.infrastructure.session_gateway import (
     RedisUserSessionGateway,
     SessionNotFoundError,
 )
 
+from .mocks import MockDatabase
+
 
 @pytest.mark.asyncio
 async def test_add_user(pg_user_gateway: PgOrmUserGateway):
@@ -107,6 +116,25 @@ async def test_remove_user_with_locations(pg_user_gateway: PgOrmUserGateway):
     assert len(list(result)) == 0
 
 
+@pytest.mark.asyncio
+async def test_remove_location_keeps_other_users_links(pg_user_gateway: PgOrmUserGateway):
+    user = User.create(login="test", hashed_password="hashed_password")
+    other_user = User.create(login="other", hashed_password="hashed_password")
+    loc1 = Location.create(name="Moscow", coordinates=Coordinates(Decimal(50), Decimal(60)))
+    user.add_location(loc1)
+    other_user.add_location(loc1)
+    await pg_user_gateway.save(user=user)
+    await pg_user_gateway.save(user=other_user)
+    await pg_user_gateway.session.commit()
+
+    user.remove_location(loc1)
+    await pg_user_gateway.save(user=user)
+    await pg_user_gateway.session.commit()
+
+    result = await pg_user_gateway.session.scalars(select(UserLocationORM.user_id))
+    assert list(result) == [other_user.id]
+
+
 @pytest.mark.asyncio
 async def test_find_user_with_locations(pg_user_gateway: PgOrmUserGateway, pg_location_gateway: PgOrmLocationGateway):
     user = User.create(login="test", hashed_password="hashed_password")
@@ -122,6 +150,28 @@ async def test_find_user_with_locations(pg_user_gateway: PgOrmUserGateway, pg_lo
     assert len(user_copy.locations) == 1
     assert user_copy.locations[0].name == "Moscow"
 
+    locked = await pg_user_gateway.find_by_id(user_id=user.id, load_locations=True, for_update=True)
+    assert [loc.id for loc in locked.locations] == [loc1.id]
+
+
+@pytest.mark.asyncio
+async def test_find_locations_by_user_id(pg_user_gateway: PgOrmUserGateway, pg_location_gateway: PgOrmLocationGateway):
+    user = User.create(login="test", hashed_password="hashed_password")
+    other_user = User.create(login="other", hashed_password="hashed_password")
+    loc1 = Location.create(name="Moscow", coordinates=Coordinates(Decimal(50), Decimal(60)))
+    loc2 = Location.create(name="Kazan", coordinates=Coordinates(Decimal(60), Decimal(60)))
+    for loc in (loc1, loc2):
+        await pg_location_gateway.save(location=loc)
+        user.add_location(loc)
+    other_user.add_location(loc1)
+    await pg_user_gateway.save(user=user)
+    await pg_user_gateway.save(user=other_user)
+    await pg_user_gateway.session.commit()
+
+    result = await pg_location_gateway.find_by_user_id(user_id=user.id)
+    assert {loc.name for loc in result} == {"Moscow", "Kazan"}
+    assert {loc.id for loc in result} == {loc1.id, loc2.id}
+
 
 @pytest.mark.asyncio
 async def test_save_location(pg_location_gateway: PgOrmLocationGateway):
@@ -134,6 +184,94 @@ async def test_save_location(pg_location_gateway: PgOrmLocationGateway):
     assert result.name == "Moscow"
 
 
+@pytest.mark.asyncio
+async def test_upsert_location(pg_location_gateway: PgOrmLocationGateway):
+    loc = Location.create(name="Moscow", coordinates=Coordinates(Decimal(50), Decimal(60)))
+    same_coords = Location.create(name="Moskva", coordinates=Coordinates(Decimal(50), Decimal(60)))
+
+    created = await pg_location_gateway.upsert(location=loc)
+    existing = await pg_location_gateway.upsert(location=same_coords)
+    await pg_location_gateway.session.commit()
+
+    assert created.id == loc.id
+    assert existing.id == loc.id
+    assert existing.name == "Moscow"
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_locations(pg_location_gateway: PgOrmLocationGateway):
+    existing = await pg_location_gateway.upsert(
+        location=Location.create(name="Moscow", coordinates=Coordinates(Decimal(50), Decimal(60)))
+    )
+    locations = [
+        Location.create(name="Kazan", coordinates=Coordinates(Decimal("55.7887"), Decimal("49.1221"))),
+        Location.create(name="Moskva", coordinates=Coordinates(Decimal(50), Decimal(60))),
+        Location.create(name="Kazan", coordinates=Coordinates(Decimal("55.7887"), Decimal("49.1221"))),
+    ]
+
+    result = await pg_location_gateway.upsert_many(new_locations=locations)
+    await pg_location_gateway.session.commit()
+
+    assert [loc.name for loc in result] == ["Kazan", "Moscow", "Kazan"]
+    assert result[0].id == locations[0].id
+    assert result[1].id == existing.id
+    assert result[2].id == locations[0].id
+    assert await pg_location_gateway.upsert_many(new_locations=[]) == []
+
+
+@pytest.mark.asyncio
+async def test_upsert_location_concurrently_smoke(tmp_path):
+    db = MockDatabase(db_url=f"sqlite+aiosqlite:///{tmp_path / 'upsert.db'}")
+    async with db.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def add_location():
+        async with db.async_session_maker() as session:
+            location = Location.create(name="Moscow", coordinates=Coordinates(Decimal(50), Decimal(60)))
+            result = await PgOrmLocationGateway(session=session).upsert(location=location)
+            await session.commit()
+            return result.id
+
+    ids = await asyncio.gather(*[add_location() for _ in range(20)])
+
+    assert len(set(ids)) == 1
+    async with db.async_session_maker() as session:
+        assert len(list(await session.scalars(select(LocationORM)))) == 1
+    await db.engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.environ.get("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL is not set")
+@pytest.mark.parametrize("gateway_class", [PgOrmLocationGateway, PgCoreLocationGateway])
+async def test_upsert_location_concurrently_postgres(gateway_class):
+    db = MockDatabase(db_url=os.environ["TEST_POSTGRES_URL"])
+    async with db.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    coordinates = Coordinates(Decimal(random.randint(-89_000_000, 89_000_000)) / 1_000_000, Decimal(179))
+
+    async def add_location():
+        async with db.async_session_maker() as session:
+            location = Location.create(name="Moscow", coordinates=coordinates)
+            result = await gateway_class(session=session).upsert(location=location)
+            await session.commit()
+            return result.id
+
+    try:
+        ids = await asyncio.gather(*[add_location() for _ in range(20)])
+
+        assert len(set(ids)) == 1
+        async with db.async_session_maker() as session:
+            query = select(LocationORM.id).filter_by(latitude=coordinates.latitude, longitude=coordinates.longitude)
+            assert list(await session.scalars(query)) == [ids[0]]
+    finally:
+        async with db.async_session_maker() as session:
+            await session.execute(
+                delete(LocationORM).filter_by(latitude=coordinates.latitude, longitude=coordinates.longitude)
+            )
+            await session.commit()
+        await db.engine.dispose()
+
+
 @pytest.mark.asyncio
 async def test_get_location_by_coords(pg_location_gateway: PgOrmLocationGateway):
     loc1 = Location.create(name="Moscow", coordinates=Coordinates(Decimal(50), Decimal(60)))
@@ -194,3 +332,76 @@ async def test_delete_redis_session(redis_session_gateway: RedisUserSessionGatew
     await redis_session_gateway.delete(session_id=session.session_id)
     with pytest.raises(SessionNotFoundError):
         await redis_session_gateway.get_user_id(session_id=session.session_id)
+
+
+@pytest.mark.asyncio
+async def test_redis_locations_cache_miss(redis_locations_cache: RedisUserLocationsCache):
+    cached = await redis_locations_cache.get(user_id=uuid.uuid4())
+
+    assert cached.version == 0
+    assert cached.locations is None
+
+
+@pytest.mark.asyncio
+async def test_redis_locations_cache_set(redis_locations_cache: RedisUserLocationsCache):
+    user_id = uuid.uuid4()
+    location = UserLocationDTO(
+        id=uuid.uuid4(), name="Moscow", coordinates=Coordinates(Decimal("55.7558"), Decimal("37.6173"))
+    )
+    cached = await redis_locations_cache.get(user_id=user_id)
+    await redis_locations_cache.set(user_id=user_id, version=cached.version, locations=[location])
+
+    cached = await redis_locations_cache.get(user_id=user_id)
+    assert cached.locations == [location]
+
+
+@pytest.mark.asyncio
+async def test_redis_locations_cache_invalidate(redis_locations_cache: RedisUserLocationsCache, redis_client):
+    user_id = uuid.uuid4()
+    location = UserLocationDTO(id=uuid.uuid4(), name="Moscow", coordinates=Coordinates(Decimal(50), Decimal(60)))
+    stale = await redis_locations_cache.get(user_id=user_id)
+    await redis_locations_cache.set(user_id=user_id, version=stale.version, locations=[location])
+
+    await redis_locations_cache.invalidate(user_id=user_id)
+    await redis_locations_cache.set(user_id=user_id, version=stale.version, locations=[])
+
+    cached = await redis_locations_cache.get(user_id=user_id)
+    assert cached.version == 1
+    assert cached.locations is None
+    assert 0 < await redis_client.ttl(f"user-locations-version:{user_id}") <= redis_locations_cache.version_lifetime
+
+
+@pytest.mark.asyncio
+async def test_redis_location_popularity(redis_location_popularity: RedisLocationPopularity):
+    moscow = Location.create(name="Moscow", coordinates=Coordinates(Decimal("55.7504461"), Decimal("37.6174943")))
+    kazan = Location.create(name="Kazan", coordinates=Coordinates(Decimal(60), Decimal(60)))
+    samara = Location.create(name="Samara", coordinates=Coordinates(Decimal(53), Decimal(50)))
+
+    await redis_location_popularity.record(added=[moscow, kazan, samara], removed=[])
+    await redis_location_popularity.record(added=[moscow], removed=[kazan])
+    await redis_location_popularity.record(added=[], removed=[])
+
+    top = await redis_location_popularity.top(limit=5)
+    assert [(loc.id, loc.subscribers) for loc in top] == [(moscow.id, 2), (samara.id, 1)]
+    assert top[0].coordinates == moscow.coordinates
+    assert len(await redis_location_popularity.top(limit=1)) == 1
+    redis_client = redis_location_popularity.redis_client
+    assert not await redis_client.hexists(redis_location_popularity.info_key, str(kazan.id))
+
+    await redis_location_popularity.forget(location_ids=[samara.id, kazan.id])
+    assert [loc.id for loc in await redis_location_popularity.top(limit=5)] == [moscow.id]
+
+
+@pytest.mark.asyncio
+async def test_redis_location_popularity_rebuild(redis_location_popularity: RedisLocationPopularity):
+    moscow = Location.create(name="Moscow", coordinates=Coordinates(Decimal(50), Decimal(60)))
+    kazan = Location.create(name="Kazan", coordinates=Coordinates(Decimal(60), Decimal(60)))
+    await redis_location_popularity.record(added=[moscow, kazan], removed=[])
+
+    rebuilt = PopularLocationDTO(id=kazan.id, name=kazan.name, coordinates=kazan.coordinates, subscribers=3)
+    await redis_location_popularity.rebuild(locations=[rebuilt])
+    assert await redis_location_popularity.top(limit=5) == [rebuilt]
+    assert await redis_location_popularity.redis_client.hlen(redis_location_popularity.info_key) == 1
+
+    await redis_location_popularity.rebuild(locations=[])
+    assert await redis_location_popularity.top(limit=5) == []
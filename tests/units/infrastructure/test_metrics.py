@@ -0,0 +1,48 @@
+import pytest
+
+from weather_tracker.infrastructure.metrics import (
+    instrument_use_cases,
+    observe_request,
+    observe_upstream,
+    record_cache_lookup,
+    render_metrics,
+)
+
+
+class SampleUseCase:
+    async def execute(self, fail: bool = False):
+        if fail:
+            raise ValueError
+        return "done"
+
+    async def execute_stream(self):
+        return "page"
+
+
+@pytest.mark.asyncio
+async def test_instrument_use_cases():
+    instrument_use_cases(SampleUseCase)
+    instrument_use_cases(SampleUseCase)
+
+    assert await SampleUseCase().execute() == "done"
+    with pytest.raises(ValueError):
+        await SampleUseCase().execute(fail=True)
+
+    content, _ = render_metrics()
+    assert b'use_case_duration_seconds_count{method="execute",outcome="ok",use_case="SampleUseCase"} 1.0' in content
+    assert b'use_case_duration_seconds_count{method="execute",outcome="error",use_case="SampleUseCase"} 1.0' in content
+    assert not getattr(SampleUseCase.execute_stream, "__instrumented__", False)
+
+
+def test_render_metrics():
+    observe_request("GET", "/metrics-test/{id}", 200, 0.01)
+    observe_upstream("https://api.example.org/data/2.5/weather", 503, 0.2)
+    observe_upstream("https://api.example.org/data/2.5/weather", None, 0.2)
+    record_cache_lookup("metrics-test", hit=True)
+
+    content, media_type = render_metrics()
+    assert media_type.startswith("text/plain")
+    assert b'http_request_duration_seconds_count{method="GET",route="/metrics-test/{id}",status="200"}' in content
+    assert b'host="api.example.org",path="/data/2.5/weather",status_class="5xx"' in content
+    assert b'host="api.example.org",path="/data/2.5/weather",status_class="error"' in content
+    assert b'cache_lookups_total{cache="metrics-test",result="hit"} 1.0' in content
@@ -0,0 +1,195 @@
+import threading
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from weather_tracker.config import TracingConfig
+from weather_tracker.infrastructure.httpl_client.aiohttp_client import AiohttpClient
+from weather_tracker.infrastructure.tracing import (
+    TRACEPARENT,
+    TRACERESPONSE,
+    InMemorySpanExporter,
+    JsonLinesSpanExporter,
+    SpanContext,
+    Tracer,
+    format_traceparent,
+    parse_traceparent,
+    set_tracer,
+    trace_classes,
+)
+from weather_tracker.presentation.middlewares import register_middlewares
+
+
+class SampleGateway:
+    async def find(self, fail: bool = False):
+        if fail:
+            raise LookupError
+        return "found"
+
+    async def _private(self):
+        return "private"
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    previous = set_tracer(Tracer(exporter=exporter, sample_rate=1.0))
+    yield exporter
+    set_tracer(previous)
+
+
+def test_traceparent_roundtrip():
+    context = SpanContext("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", True)
+
+    assert format_traceparent(context) == "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    assert parse_traceparent(format_traceparent(context)) == context
+    assert parse_traceparent("00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00").sampled is False
+    assert parse_traceparent("00-00000000000000000000000000000000-00f067aa0ba902b7-01") is None
+    assert parse_traceparent("garbage") is None
+    assert parse_traceparent(None) is None
+
+
+def test_nested_spans(exporter):
+    tracer = Tracer(exporter=exporter, sample_rate=1.0)
+    with tracer.span("request") as root:
+        with tracer.span("gateway", table="users") as child:
+            pass
+
+    assert [span.name for span in exporter.spans] == ["gateway", "request"]
+    assert child.trace_id == root.trace_id
+    assert child.parent_id == root.span_id
+    assert root.parent_id is None
+    assert child.attributes == {"table": "users"}
+    assert child.duration is not None
+
+
+def test_sampling():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter=exporter, sample_rate=0.0)
+    with tracer.span("request") as span:
+        pass
+    assert not span.sampled
+    assert span.traceparent.endswith("-00")
+    assert exporter.spans == []
+
+    remote = parse_traceparent("00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01")
+    with tracer.span("request", parent=remote) as span:
+        pass
+    assert exporter.spans == [span]
+    assert span.parent_id == remote.span_id
+
+
+@pytest.mark.asyncio
+async def test_trace_classes(exporter):
+    trace_classes(SampleGateway)
+    trace_classes(SampleGateway)
+
+    assert await SampleGateway().find() == "found"
+    with pytest.raises(LookupError):
+        await SampleGateway().find(fail=True)
+    assert await SampleGateway()._private() == "private"
+
+    assert [(span.name, span.status) for span in exporter.spans] == [
+        ("SampleGateway.find", "ok"),
+        ("SampleGateway.find", "error"),
+    ]
+    assert exporter.spans[1].attributes["error.type"] == "LookupError"
+
+
+class RecordingJsonLinesSpanExporter(JsonLinesSpanExporter):
+    def __init__(self, filename: str, batch_size: int):
+        super().__init__(filename, batch_size=batch_size)
+        self.threads = []
+
+    def _write(self, lines: list[str]) -> None:
+        self.threads.append(threading.current_thread())
+        super()._write(lines)
+
+
+def test_json_lines_exporter(tmp_path):
+    filename = tmp_path / "traces.jsonl"
+    exporter = RecordingJsonLinesSpanExporter(str(filename), batch_size=2)
+    tracer = Tracer(exporter=exporter, sample_rate=1.0)
+    for name in ("first", "second", "third"):
+        with tracer.span(name):
+            pass
+
+    tracer.flush()
+    assert [line.count('"name"') for line in filename.read_text().splitlines()] == [1, 1, 1]
+    assert len(exporter.threads) == 2
+    assert threading.main_thread() not in exporter.threads
+
+    with tracer.span("fourth"):
+        pass
+    tracer.flush()
+    assert len(filename.read_text().splitlines()) == 4
+
+
+def test_tracing_middleware(exporter):
+    app = FastAPI()
+
+    @app.get("/locations/{location_id}")
+    async def location(location_id: int):
+        return {"id": location_id}
+
+    register_middlewares(app=app)
+    incoming = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    with TestClient(app) as client:
+        response = client.get("/locations/1", headers={TRACEPARENT: incoming})
+
+    (span,) = exporter.spans
+    assert span.name == "GET /locations/{location_id}"
+    assert span.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert span.parent_id == "00f067aa0ba902b7"
+    assert span.attributes["http.status_code"] == 200
+    assert response.headers[TRACERESPONSE] == span.traceparent
+
+
+@pytest.mark.parametrize("trust_parent", [False, True])
+def test_tracing_middleware_untrusted_parent(trust_parent):
+    exporter = InMemorySpanExporter()
+    previous = set_tracer(Tracer(exporter=exporter, sample_rate=0.0))
+    app = FastAPI()
+
+    @app.get("/locations")
+    async def locations():
+        return []
+
+    register_middlewares(app=app, tracing=TracingConfig(TRACING_TRUST_PARENT=trust_parent))
+    incoming = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    try:
+        with TestClient(app) as client:
+            response = client.get("/locations", headers={TRACEPARENT: incoming})
+    finally:
+        set_tracer(previous)
+
+    assert len(exporter.spans) == int(trust_parent)
+    assert (TRACERESPONSE in response.headers) is trust_parent
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_client_propagates_traceparent(exporter):
+    received = []
+
+    async def handler(request: web.Request):
+        received.append(request.headers.get(TRACEPARENT))
+        return web.json_response({"ok": True})
+
+    upstream = web.Application()
+    upstream.router.add_get("/weather", handler)
+    async with TestServer(upstream) as server:
+        client = AiohttpClient(timeout=5)
+        try:
+            with Tracer(exporter=exporter, sample_rate=1.0).span("request") as root:
+                assert await client.get(str(server.make_url("/weather")), params={"q": "x"}) == {"ok": True}
+        finally:
+            await client.close()
+
+    http_span = exporter.spans[0]
+    assert http_span.name == "HTTP GET"
+    assert http_span.parent_id == root.span_id
+    assert http_span.attributes["http.status_code"] == 200
+    assert received == [http_span.traceparent]
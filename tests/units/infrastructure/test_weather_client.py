@@ -1,9 +1,13 @@
+import asyncio
+import uuid
 from decimal import Decimal
 
 import pytest
 
+from weather_tracker.application.dto import UserLocationDTO
 from weather_tracker.domain.entities import Location
 from weather_tracker.domain.value_objects import Coordinates
+from weather_tracker.infrastructure.external_api.caching_weather_client import weather_channel
 from weather_tracker.infrastructure.external_api.exceptions import OpenWeatherClientError
 from weather_tracker.infrastructure.httpl_client.exceptions import AsyncClientInternalError
 
@@ -53,3 +57,71 @@ async def test_get_weather_client_error(open_weather_client):
     location = Location.create(name="Moscow", coordinates=Coordinates(Decimal(60), Decimal(60)))
     with pytest.raises(OpenWeatherClientError):
         await open_weather_client.get_weather_by_location(location=location)
+
+
+@pytest.mark.asyncio
+async def test_caching_weather_client(caching_weather_client, redis_client, test_config):
+    location = Location.create(name="Moscow", coordinates=Coordinates(Decimal(40), Decimal(60)))
+
+    weather = await caching_weather_client.get_weather_by_location(location=location)
+    assert weather.temperature == 10
+    assert weather.expires_at is not None
+
+    key = f"weather:{location.coordinates.latitude_e7}:{location.coordinates.longitude_e7}"
+    assert 0 < await redis_client.ttl(key) <= test_config.open_weather.weather_cache_ttl
+
+    renamed = Location.create(name="Moskva", coordinates=location.coordinates)
+    cached = await caching_weather_client.get_weather_by_location(location=renamed)
+    assert cached.name == "Moskva"
+    assert cached.temperature == weather.temperature
+    assert cached.expires_at == weather.expires_at
+
+
+@pytest.mark.asyncio
+async def test_caching_weather_client_does_not_cache_errors(caching_weather_client, redis_client):
+    location = Location.create(name="Moscow", coordinates=Coordinates(Decimal(60), Decimal(60)))
+    with pytest.raises(OpenWeatherClientError):
+        await caching_weather_client.get_weather_by_location(location=location)
+    assert await redis_client.keys("weather:*") == []
+
+
+@pytest.mark.asyncio
+async def test_weather_updates_fan_out(caching_weather_client, weather_updates_hub):
+    coordinates = Coordinates(Decimal(41), Decimal(61))
+    first = await weather_updates_hub.subscribe(
+        locations=[UserLocationDTO(id=uuid.uuid4(), name="Moscow", coordinates=coordinates)]
+    )
+    second = await weather_updates_hub.subscribe(
+        locations=[UserLocationDTO(id=uuid.uuid4(), name="Moskva", coordinates=coordinates)]
+    )
+    assert weather_updates_hub.channels == 1
+
+    await caching_weather_client.get_weather_by_location(location=Location.create(name="M", coordinates=coordinates))
+
+    first_updates = await asyncio.wait_for(first.next_updates(), timeout=1)
+    second_updates = await asyncio.wait_for(second.next_updates(), timeout=1)
+    assert [(w.name, w.temperature) for w in first_updates] == [("Moscow", 10)]
+    assert [(w.name, w.temperature) for w in second_updates] == [("Moskva", 10)]
+
+    await first.close()
+    assert weather_updates_hub.channels == 1
+    await second.close()
+    assert weather_updates_hub.channels == 0
+
+
+@pytest.mark.asyncio
+async def test_weather_updates_coalesce_for_slow_consumer(redis_client, weather_updates_hub):
+    moscow = UserLocationDTO(id=uuid.uuid4(), name="Moscow", coordinates=Coordinates(Decimal(42), Decimal(62)))
+    kazan = UserLocationDTO(id=uuid.uuid4(), name="Kazan", coordinates=Coordinates(Decimal(43), Decimal(63)))
+    subscription = await weather_updates_hub.subscribe(locations=[moscow, kazan])
+
+    for temperature in range(5):
+        for loc in (moscow, kazan):
+            await redis_client.publish(
+                weather_channel(loc.coordinates), f"[null, null, {temperature}, null, null, null, null, null]"
+            )
+    await asyncio.sleep(0.1)
+
+    updates = await asyncio.wait_for(subscription.next_updates(), timeout=1)
+    assert sorted((w.name, w.temperature) for w in updates) == [("Kazan", 4), ("Moscow", 4)]
+    await subscription.close()
@@ -0,0 +1,51 @@
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from weather_tracker.presentation.compression import CompressionMiddleware, parse_accept_encoding
+
+
+class CountingCompressionMiddleware(CompressionMiddleware):
+    calls = 0
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        CountingCompressionMiddleware.calls += 1
+        return super().compress(body, encoding)
+
+
+def build_client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/large")
+    async def large(response: Response):
+        response.headers["ETag"] = '"large-v1"'
+        return [{"name": f"loc-{i}", "temperature": i} for i in range(200)]
+
+    @app.get("/small")
+    async def small():
+        return {"name": "Moscow"}
+
+    return TestClient(CountingCompressionMiddleware(app, minimum_size=500, brotli_quality=1))
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, deflate, br;q=0") == {"gzip", "deflate"}
+    assert parse_accept_encoding("br;q=0.5, identity") == {"br", "identity"}
+
+
+def test_compression_threshold_and_cache():
+    CountingCompressionMiddleware.calls = 0
+    client = build_client()
+
+    first = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["etag"] == 'W/"large-v1"'
+    assert "Accept-Encoding" in first.headers["vary"]
+    assert first.json() == second.json() == [{"name": f"loc-{i}", "temperature": i} for i in range(200)]
+    assert CountingCompressionMiddleware.calls == 1
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["etag"] == '"large-v1"'
@@ -0,0 +1,166 @@
+import json
+import uuid
+from typing import AsyncIterable
+
+import pytest
+from dishka import Provider, Scope, make_async_container, provide
+from dishka.integrations.fastapi import setup_dishka
+from fakeredis.aioredis import FakeRedis
+from fastapi.testclient import TestClient
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.requests import ClientDisconnect
+
+from weather_tracker.app import create_app
+from weather_tracker.application.interfaces import WeatherClient, WeatherUpdates
+from weather_tracker.config import Config
+from weather_tracker.infrastructure.database.orm_models import Base
+from weather_tracker.ioc import AppProvider
+
+from ..application.mocks import MockWeatherClient
+
+MOSCOW = {"name": "Moscow", "latitude": 55.7504461, "longitude": 37.6174943}
+KAZAN = {"name": "Kazan", "latitude": 55.7887, "longitude": 49.1221}
+
+
+class HandlersProvider(Provider):
+    def __init__(self, db_url: str):
+        super().__init__()
+        self.db_url = db_url
+
+    @provide(scope=Scope.APP)
+    def get_redis(self) -> Redis:
+        return FakeRedis()
+
+    @provide(scope=Scope.APP)
+    def get_weather_client(self) -> WeatherClient:
+        return MockWeatherClient()
+
+    @provide(scope=Scope.APP)
+    async def get_session_maker(self) -> AsyncIterable[async_sessionmaker[AsyncSession]]:
+        engine = create_async_engine(url=self.db_url)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        yield async_sessionmaker(engine)
+        await engine.dispose()
+
+
+@pytest.fixture
+def client(tmp_path):
+    container = make_async_container(
+        AppProvider(),
+        HandlersProvider(f"sqlite+aiosqlite:///{tmp_path / 'handlers.db'}"),
+        context={Config: Config.from_env()},
+    )
+    app = create_app()
+    setup_dishka(container, app)
+    with TestClient(app) as client:
+        assert client.post("/register", json={"login": "bob", "password": "password_1"}).status_code == 200
+        response = client.post("/login", json={"login": "bob", "password": "password_1"})
+        client.cookies.set(name="session_id", value=response.cookies["session_id"])
+        assert client.post("/search", json=MOSCOW).status_code == 200
+        yield client
+
+
+def test_locations_conditional_requests(client: TestClient):
+    response = client.get("/locations")
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert [loc["name"] for loc in response.json()] == ["Moscow"]
+    etag = response.headers["ETag"]
+
+    response = client.get("/locations", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    assert client.post("/search", json=KAZAN).status_code == 200
+    response = client.get("/locations", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert sorted(loc["name"] for loc in response.json()) == ["Kazan", "Moscow"]
+
+
+@pytest.mark.parametrize(
+    "headers, params, media_type",
+    [
+        ({}, {}, "application/json"),
+        ({"Accept": "application/x-ndjson"}, {}, "application/x-ndjson"),
+        ({"Accept": "application/x-ndjson;q=0"}, {}, "application/json"),
+        ({"Accept": "application/x-ndjson;q=0, application/json"}, {}, "application/json"),
+        ({"Accept": "text/html, */*;q=0.8"}, {}, "application/json"),
+        ({"Accept": "application/json"}, {"stream": "true"}, "application/x-ndjson"),
+    ],
+)
+def test_locations_content_negotiation(client: TestClient, headers, params, media_type):
+    response = client.get("/locations", headers=headers, params=params)
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].split(";")[0] == media_type
+    assert response.headers["Vary"] == "Accept"
+
+
+def test_locations_ndjson_framing(client: TestClient):
+    assert client.post("/search", json=KAZAN).status_code == 200
+
+    response = client.get("/locations", headers={"Accept": "application/x-ndjson"}, params={"limit": 1})
+    assert response.headers["Cache-Control"] == "no-store"
+    assert response.text.endswith("\n")
+    first_page = [json.loads(line) for line in response.text.split("\n")[:-1]]
+    assert len(first_page) == 1
+
+    response = client.get("/locations", params={"stream": "true", "cursor": response.headers["X-Next-Cursor"]})
+    assert response.text.endswith("\n")
+    second_page = [json.loads(line) for line in response.text.split("\n")[:-1]]
+    assert "X-Next-Cursor" not in response.headers
+    assert sorted(loc["name"] for loc in first_page + second_page) == ["Kazan", "Moscow"]
+
+
+def test_popular_locations_requires_session(client: TestClient):
+    response = client.get("/locations/popular")
+    assert response.status_code == 200
+    assert [(loc["name"], loc["subscribers"]) for loc in response.json()] == [("Moscow", 1)]
+
+    client.cookies.clear()
+    assert client.get("/locations/popular").status_code == 401
+    client.cookies.set(name="session_id", value=str(uuid.uuid4()))
+    assert client.get("/locations/popular").status_code == 401
+
+
+@pytest.mark.parametrize("coordinates", [{"latitude": 1000}, {"latitude": -90.5}, {"longitude": 180.1}])
+def test_out_of_range_coordinates_are_rejected(client: TestClient, coordinates):
+    location = {**KAZAN, **coordinates}
+
+    assert client.post("/search", json=location).status_code == 422
+    assert client.post("/locations/batch", json={"add": [location]}).status_code == 422
+
+
+def test_events_disconnect_before_first_chunk(client: TestClient):
+    container = client.app.state.dishka_container
+    hub = client.portal.call(container.get, WeatherUpdates)
+    session_id = next(cookie.value for cookie in client.cookies.jar if cookie.name == "session_id")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/locations/events",
+        "raw_path": b"/locations/events",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"cookie", f"session_id={session_id}".encode())],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+        "state": {},
+    }
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        raise OSError("client went away")
+
+    with pytest.raises(ClientDisconnect):
+        client.portal.call(client.app, scope, receive, send)
+    assert hub.channels == 0
@@ -0,0 +1,32 @@
+from weather_tracker.presentation.http_cache import etag_matches, make_etag, preferred_media_type
+
+
+def test_make_etag():
+    etag = make_etag(1, None, [("Moscow", 1, 2, 100)])
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag(1, None, [("Moscow", 1, 2, 100)])
+    assert etag != make_etag(2, None, [("Moscow", 1, 2, 100)])
+    assert etag != make_etag(1, None, [("Moscow", 1, 2, 101)])
+
+
+def test_etag_matches():
+    etag = make_etag("Moscow")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_preferred_media_type():
+    offered = ("application/json", "application/x-ndjson")
+
+    assert preferred_media_type(None, offered) == "application/json"
+    assert preferred_media_type("application/x-ndjson", offered) == "application/x-ndjson"
+    assert preferred_media_type("Application/X-NDJSON; charset=utf-8", offered) == "application/x-ndjson"
+    assert preferred_media_type("application/x-ndjson;q=0", offered) is None
+    assert preferred_media_type("application/x-ndjson;q=0, */*", offered) == "application/json"
+    assert preferred_media_type("application/json;q=0.5, application/x-ndjson", offered) == "application/x-ndjson"
+    assert preferred_media_type("application/*;q=0.9, application/x-ndjson;q=0.8", offered) == "application/json"
+    assert preferred_media_type("text/html, */*;q=0.8", offered) == "application/json"
+    assert preferred_media_type("application/x-ndjson;q=oops", offered) is None
@@ -0,0 +1,28 @@
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from weather_tracker.presentation.middlewares import UNMATCHED_ROUTE, register_middlewares
+
+
+def test_request_logger_observers():
+    observed = []
+    app = FastAPI()
+
+    @app.get("/locations/{location_id}")
+    async def location(location_id: int):
+        if location_id == 0:
+            raise HTTPException(status_code=404)
+        return {"id": location_id}
+
+    register_middlewares(app=app, observers=[lambda *args: observed.append(args)])
+    with TestClient(app) as client:
+        client.get("/locations/1")
+        client.get("/locations/0")
+        client.get("/unknown")
+
+    assert [(method, route, status) for method, route, status, _ in observed] == [
+        ("GET", "/locations/{location_id}", 200),
+        ("GET", "/locations/{location_id}", 404),
+        ("GET", UNMATCHED_ROUTE, 404),
+    ]
+    assert all(duration >= 0 for *_, duration in observed)
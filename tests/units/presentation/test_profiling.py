@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from weather_tracker.config import ProfilingConfig
+from weather_tracker.infrastructure.profiling import (
+    PROFILE_FILE_HEADER,
+    PROFILE_HEADER,
+    sign_profile_token,
+    verify_profile_token,
+)
+from weather_tracker.presentation.middlewares import register_middlewares
+
+
+def test_profile_token():
+    token = sign_profile_token("secret", "/locations", expires=1000)
+
+    assert verify_profile_token("secret", "/locations", token, now=999)
+    assert not verify_profile_token("secret", "/locations", token, now=1001)
+    assert not verify_profile_token("secret", "/search", token, now=999)
+    assert not verify_profile_token("other", "/locations", token, now=999)
+    assert not verify_profile_token("secret", "/locations", "garbage", now=999)
+
+
+def make_app(tmp_path, **settings) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/locations")
+    async def locations():
+        await asyncio.sleep(0.01)
+        return {"ok": True}
+
+    config = ProfilingConfig(PROFILING_DIR=str(tmp_path), **settings)
+    register_middlewares(app=app, profiling=config)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_profiling_middleware_signed_header(tmp_path):
+    pytest.importorskip("pyinstrument")
+    app = make_app(tmp_path, PROFILING_SECRET="secret")
+    token = sign_profile_token("secret", "/locations", expires=int(time.time()) + 60)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        plain = await client.get("/locations")
+        forged = await client.get("/locations", headers={PROFILE_HEADER: "1.deadbeef"})
+        responses = await asyncio.gather(*(client.get("/locations", headers={PROFILE_HEADER: token}) for _ in range(2)))
+
+    assert PROFILE_FILE_HEADER not in plain.headers
+    assert PROFILE_FILE_HEADER not in forged.headers
+    files = sorted(response.headers[PROFILE_FILE_HEADER] for response in responses)
+    assert sorted(path.name for path in tmp_path.iterdir()) == files
+    assert all(name.endswith(".speedscope.json") for name in files)
+
+
+@pytest.mark.asyncio
+async def test_profiling_middleware_sample_rate(tmp_path):
+    pytest.importorskip("pyinstrument")
+    app = make_app(tmp_path, PROFILING_SAMPLE_RATE=1.0, PROFILING_FORMAT="html")
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/locations")
+        events = await client.get("/locations", headers={"Accept": "text/event-stream"})
+
+    assert response.headers[PROFILE_FILE_HEADER].endswith(".html")
+    assert PROFILE_FILE_HEADER not in events.headers
+    assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,28 @@
+import json
+from decimal import Decimal
+
+from weather_tracker.application.dto import LocationWeatherDTO
+from weather_tracker.domain.value_objects import Coordinates
+from weather_tracker.presentation.schemas import WeatherResponse, dump_weather, dump_weather_list
+
+
+def test_dump_weather_list_matches_response_model():
+    items = [
+        LocationWeatherDTO(
+            name="Moscow",
+            coordinates=Coordinates(Decimal("55.7504461"), Decimal("37.6174943")),
+            country="RU",
+            main_state="Clear",
+            temperature=12.7,
+            temperature_feels="-3.2",
+            wind_speed=None,
+            humidity=80,
+        ),
+        LocationWeatherDTO(
+            name="Kazan", coordinates=Coordinates(55, 49), country=None, main_state=None, temperature="n/a"
+        ),
+    ]
+    expected = [WeatherResponse(**loc.to_dict()).model_dump(mode="json", by_alias=True) for loc in items]
+
+    assert json.loads(dump_weather_list(items)) == expected
+    assert json.loads(dump_weather(items[0])) == expected[0]
@@ -0,0 +1,40 @@
+import pytest
+from dishka import Provider, Scope, make_async_container, provide
+from dishka.integrations.fastapi import setup_dishka
+from fakeredis.aioredis import FakeRedis
+from redis.asyncio import Redis
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from weather_tracker.app import create_app
+from weather_tracker.config import Config
+from weather_tracker.infrastructure.database.replicas import ReplicaRouter
+from weather_tracker.infrastructure.httpl_client.interfaces import AsyncHTTPClient
+from weather_tracker.ioc import AppProvider
+
+
+class FakeRedisProvider(Provider):
+    @provide(scope=Scope.APP)
+    def get_redis(self) -> Redis:
+        return FakeRedis()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_closes_container():
+    config = Config.from_env("test.env")
+    config = config.model_copy(update={"postgres": config.postgres.model_copy(update={"replica_hosts": ["replica1"]})})
+    container = make_async_container(AppProvider(), FakeRedisProvider(), context={Config: config})
+    app = create_app()
+    setup_dishka(container, app)
+
+    disposed = []
+    async with app.router.lifespan_context(app):
+        session_maker = await container.get(async_sessionmaker[AsyncSession])
+        replica_router = await container.get(ReplicaRouter)
+        http_client = await container.get(AsyncHTTPClient)
+        engines = [session_maker.kw["bind"], *(replica.kw["bind"] for replica in replica_router.replicas)]
+        for engine in engines:
+            event.listen(engine.sync_engine, "engine_disposed", disposed.append)
+
+    assert sorted(map(id, disposed)) == sorted(id(engine.sync_engine) for engine in engines)
+    assert http_client.session.closed
@@ -0,0 +1,33 @@
+import json
+import logging
+
+from weather_tracker.config import LoggingConfig
+from weather_tracker.logger import setup_package_logger, stop_package_logger
+
+
+def test_queued_logger_flushes_at_stop(tmp_path):
+    stop_package_logger()
+    filename = tmp_path / "weather.log"
+    setup_package_logger(config=LoggingConfig(LOG_FILE=str(filename), LOG_JSON=True))
+    logger = logging.getLogger("weather_tracker.test")
+    for i in range(100):
+        logger.info("record %s", i)
+    stop_package_logger()
+
+    records = [json.loads(line) for line in filename.read_text().splitlines()]
+    assert [record["message"] for record in records] == [f"record {i}" for i in range(100)]
+    assert records[0]["logger"] == "weather_tracker.test"
+    assert records[0]["level"] == "INFO"
+
+
+def test_queued_logger_rotation(tmp_path):
+    stop_package_logger()
+    filename = tmp_path / "weather.log"
+    setup_package_logger(config=LoggingConfig(LOG_FILE=str(filename), LOG_MAX_BYTES=1024, LOG_BACKUP_COUNT=2))
+    logger = logging.getLogger("weather_tracker.test")
+    for i in range(200):
+        logger.info("record %s", i)
+    stop_package_logger()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["weather.log", "weather.log.1", "weather.log.2"]
+    assert "record 199" in filename.read_text()
@@ -0,0 +1,121 @@
+import asyncio
+from decimal import Decimal
+from typing import AsyncIterable
+from uuid import uuid4
+
+import pytest
+from dishka import Provider, Scope, make_async_container, provide
+from fakeredis.aioredis import FakeRedis
+from fastapi.testclient import TestClient
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from weather_tracker.app import create_app
+from weather_tracker.config import Config, WarmupConfig
+from weather_tracker.domain.entities import Location
+from weather_tracker.domain.value_objects import Coordinates
+from weather_tracker.infrastructure.httpl_client.interfaces import AsyncHTTPClient
+from weather_tracker.infrastructure.popularity import RedisLocationPopularity
+from weather_tracker.ioc import AppProvider
+from weather_tracker.warmup import Readiness, warm_up
+
+from .infrastructure.mocks import MockAsyncHTTPClient
+
+
+class RecordingHTTPClient(MockAsyncHTTPClient):
+    def __init__(self, timeout):
+        super().__init__(timeout=timeout)
+        self.warmed = []
+
+    async def warm_up(self, url: str, connections: int = 1) -> None:
+        self.warmed.append((url, connections))
+
+
+class WarmupProvider(Provider):
+    def __init__(self, redis_client: Redis, http_client: AsyncHTTPClient, db_url: str):
+        super().__init__()
+        self.redis_client = redis_client
+        self.http_client = http_client
+        self.db_url = db_url
+
+    @provide(scope=Scope.APP)
+    def get_redis(self) -> Redis:
+        return self.redis_client
+
+    @provide(scope=Scope.APP)
+    def get_http_client(self) -> AsyncHTTPClient:
+        return self.http_client
+
+    @provide(scope=Scope.APP)
+    async def get_session_maker(self) -> AsyncIterable[async_sessionmaker[AsyncSession]]:
+        engine = create_async_engine(url=self.db_url)
+        yield async_sessionmaker(engine)
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_warm_up(tmp_path):
+    redis_client = FakeRedis()
+    http_client = RecordingHTTPClient(timeout=1)
+    popular = [
+        Location(id=uuid4(), name=name, coordinates=Coordinates(latitude=Decimal(lat), longitude=Decimal(20)))
+        for name, lat in (("Moscow", 10), ("Kazan", 11))
+    ]
+    await RedisLocationPopularity(redis_client=redis_client).record(added=popular, removed=[])
+
+    config = Config.from_env("test.env")
+    config = config.model_copy(update={"warmup": WarmupConfig(WARMUP_HOT_WEATHER=5, WARMUP_UPSTREAM_CONNECTIONS=3)})
+    container = make_async_container(
+        AppProvider(),
+        WarmupProvider(redis_client, http_client, f"sqlite+aiosqlite:///{tmp_path / 'warmup.db'}"),
+        context={Config: config},
+    )
+    try:
+        await warm_up(container=container, config=config)
+    finally:
+        await container.close()
+
+    assert http_client.warmed == [(config.open_weather.weather_url, 3)]
+    assert len(await redis_client.keys("weather:*")) == 2
+
+
+@pytest.mark.asyncio
+async def test_readiness_waits_for_warm_up():
+    release = asyncio.Event()
+    readiness = Readiness(warm_up=release.wait, timeout=5)
+    readiness.start()
+    await asyncio.sleep(0)
+    assert not readiness.ready
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert readiness.ready
+
+    await readiness.stop()
+    assert not readiness.ready
+
+
+@pytest.mark.asyncio
+async def test_readiness_timeout():
+    readiness = Readiness(warm_up=asyncio.Event().wait, timeout=0.01)
+    readiness.start()
+    await asyncio.sleep(0.05)
+    assert readiness.ready
+    await readiness.stop()
+
+
+def test_ready_endpoint():
+    release = asyncio.Event()
+    app = create_app()
+    app.state.readiness = Readiness(warm_up=release.wait, timeout=5)
+    with TestClient(app) as client:
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json() == {"status": "warming_up"}
+
+        client.portal.call(release.set)
+        for _ in range(50):
+            response = client.get("/ready")
+            if response.status_code == 200:
+                break
+        assert response.json() == {"status": "ready"}
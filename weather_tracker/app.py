@@ -1,23 +1,107 @@
+import asyncio
+import functools
+from contextlib import asynccontextmanager
+
 from dishka import make_async_container
 from dishka.integrations.fastapi import setup_dishka
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
 
+from weather_tracker.application import use_cases
 from weather_tracker.config import Config
+from weather_tracker.infrastructure.database.core_gateways import PgCoreLocationGateway, PgCoreUserGateway
+from weather_tracker.infrastructure.database.gateways import PgOrmLocationGateway, PgOrmUserGateway
+from weather_tracker.infrastructure.external_api.caching_weather_client import CachingWeatherClient
+from weather_tracker.infrastructure.external_api.open_weather_client import OpenWeatherClient
+from weather_tracker.infrastructure.locations_cache import RedisUserLocationsCache
+from weather_tracker.infrastructure.metrics import (
+    EventLoopMonitor,
+    instrument_use_cases,
+    observe_request,
+    render_metrics,
+)
+from weather_tracker.infrastructure.popularity import RedisLocationPopularity
+from weather_tracker.infrastructure.session_gateway import RedisUserSessionGateway
+from weather_tracker.infrastructure.tracing import get_tracer, set_tracer, trace_classes, tracer_from_config
 from weather_tracker.ioc import AppProvider
 from weather_tracker.logger import setup_package_logger
 from weather_tracker.presentation.exception_handlers import register_exception_handlers
 from weather_tracker.presentation.handlers import router
 from weather_tracker.presentation.middlewares import register_middlewares
+from weather_tracker.warmup import Readiness, warm_up
 
 config = Config.from_env()
 
+USE_CASES = (
+    use_cases.RegisterUser,
+    use_cases.LoginUser,
+    use_cases.LogoutUser,
+    use_cases.SearchLocation,
+    use_cases.AddUserLocation,
+    use_cases.RemoveUserLocation,
+    use_cases.BatchUpdateUserLocations,
+    use_cases.GetUserLocations,
+    use_cases.GetPopularLocations,
+    use_cases.SubscribeWeatherUpdates,
+)
+TRACED_GATEWAYS = (
+    PgOrmUserGateway,
+    PgOrmLocationGateway,
+    PgCoreUserGateway,
+    PgCoreLocationGateway,
+    RedisUserSessionGateway,
+    RedisUserLocationsCache,
+    RedisLocationPopularity,
+    CachingWeatherClient,
+    OpenWeatherClient,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    loop_monitor = EventLoopMonitor()
+    loop_monitor.start()
+    app.state.readiness.start()
+    try:
+        yield
+    finally:
+        await app.state.readiness.stop()
+        container = getattr(app.state, "dishka_container", None)
+        if container is not None:
+            await container.close()
+        await loop_monitor.stop()
+        await asyncio.to_thread(get_tracer().flush)
+
+
+async def metrics_api() -> Response:
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
+
+
+async def ready_api(request: Request) -> JSONResponse:
+    if request.app.state.readiness.ready:
+        return JSONResponse({"status": "ready"})
+    return JSONResponse({"status": "warming_up"}, status_code=503)
+
 
 def create_app() -> FastAPI:
-    setup_package_logger()
-    app = FastAPI()
+    setup_package_logger(config=config.logging)
+    instrument_use_cases(*USE_CASES)
+    set_tracer(tracer_from_config(config.tracing))
+    trace_classes(*USE_CASES, *TRACED_GATEWAYS)
+    app = FastAPI(lifespan=lifespan)
     app.include_router(router)
+    app.add_api_route("/metrics", metrics_api, include_in_schema=False)
+    app.add_api_route("/ready", ready_api, include_in_schema=False)
+    app.state.readiness = Readiness()
     register_exception_handlers(app=app)
-    register_middlewares(app=app)
+    register_middlewares(
+        app=app,
+        observers=[observe_request],
+        compression=config.compression,
+        profiling=config.profiling,
+        tracing=config.tracing,
+    )
     return app
 
 
@@ -25,4 +109,7 @@ def create_production_app() -> FastAPI:
     app = create_app()
     container = make_async_container(AppProvider(), context={Config: config})
     setup_dishka(container=container, app=app)
+    app.state.readiness = Readiness(
+        warm_up=functools.partial(warm_up, container=container, config=config), timeout=config.warmup.timeout
+    )
     return app
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 from uuid import UUID
 
 from weather_tracker.domain.value_objects import Coordinates
@@ -54,6 +54,52 @@ class LocationAddInput:
     coordinates: Coordinates
 
 
+@dataclass
+class LocationsBatchInput:
+    add: list[LocationAddInput]
+    remove: list[LocationAddInput]
+
+
+@dataclass
+class LocationBatchResultDTO:
+    name: str
+    coordinates: Coordinates
+    action: str
+    status: str
+    message: Optional[str] = None
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "longitude": self.coordinates.longitude,
+            "latitude": self.coordinates.latitude,
+            "action": self.action,
+            "status": self.status,
+            "message": self.message,
+        }
+
+
+@dataclass
+class UserLocationDTO:
+    id: UUID
+    name: str
+    coordinates: Coordinates
+
+
+@dataclass
+class CachedUserLocationsDTO:
+    version: int
+    locations: Optional[list[UserLocationDTO]] = None
+
+
+@dataclass
+class LocationLimits:
+    max_per_user: Optional[int] = None
+    page_size: int = 10
+    max_page_size: int = 50
+    stream_concurrency: int = 5
+
+
 @dataclass
 class LocationWeatherDTO:
     name: str
@@ -64,6 +110,8 @@ class LocationWeatherDTO:
     temperature_feels: Optional[float | int] = None
     wind_speed: Optional[float | int] = None
     humidity: Optional[float | int] = None
+    observed_at: Optional[int] = None
+    expires_at: Optional[int] = None
 
     def to_dict(self):
         return {
@@ -77,3 +125,33 @@ class LocationWeatherDTO:
             "wind_speed": self.wind_speed,
             "humidity": self.humidity,
         }
+
+
+@dataclass
+class LocationWeatherPageDTO:
+    items: list[LocationWeatherDTO]
+    next_cursor: Optional[str] = None
+    version: Optional[int] = None
+
+
+@dataclass
+class LocationWeatherStreamDTO:
+    items: AsyncIterator[LocationWeatherDTO]
+    next_cursor: Optional[str] = None
+    version: Optional[int] = None
+
+
+@dataclass
+class PopularLocationDTO:
+    id: UUID
+    name: str
+    coordinates: Coordinates
+    subscribers: int
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "longitude": self.coordinates.longitude,
+            "latitude": self.coordinates.latitude,
+            "subscribers": self.subscribers,
+        }
@@ -41,3 +41,8 @@ class UserLocationError(ApplicationError):
 class LocationNotFoundError(ApplicationError):
     def __init__(self, **kwargs):
         super().__init__(message=f"Location with {kwargs} not found")
+
+
+class InvalidCursorError(ApplicationError):
+    def __init__(self, cursor: str):
+        super().__init__(message=f"Invalid cursor {cursor!r}")
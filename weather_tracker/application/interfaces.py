@@ -5,7 +5,14 @@ from uuid import UUID
 from weather_tracker.domain.entities import Location, User
 from weather_tracker.domain.value_objects import Coordinates
 
-from .dto import LocationDTO, LocationWeatherDTO, UserSessionDTO
+from .dto import (
+    CachedUserLocationsDTO,
+    LocationDTO,
+    LocationWeatherDTO,
+    PopularLocationDTO,
+    UserLocationDTO,
+    UserSessionDTO,
+)
 
 
 class UserGateway(ABC):
@@ -14,7 +21,7 @@ class UserGateway(ABC):
         pass
 
     @abstractmethod
-    async def find_by_id(self, user_id: UUID, load_locations: bool = False) -> Optional[User]:
+    async def find_by_id(self, user_id: UUID, load_locations: bool = False, for_update: bool = False) -> Optional[User]:
         pass
 
     @abstractmethod
@@ -27,10 +34,22 @@ class LocationGateway(ABC):
     async def save(self, location: Location) -> None:
         pass
 
+    @abstractmethod
+    async def upsert(self, location: Location) -> Location:
+        pass
+
+    @abstractmethod
+    async def upsert_many(self, new_locations: list[Location]) -> list[Location]:
+        pass
+
     @abstractmethod
     async def get_by_coords(self, coordinates: Coordinates) -> Optional[Location]:
         pass
 
+    @abstractmethod
+    async def find_by_user_id(self, user_id: UUID) -> list[UserLocationDTO]:
+        pass
+
 
 class UserSessionGateway(ABC):
     @abstractmethod
@@ -46,6 +65,30 @@ class UserSessionGateway(ABC):
         pass
 
 
+class UserLocationsCache(ABC):
+    @abstractmethod
+    async def get(self, user_id: UUID) -> CachedUserLocationsDTO:
+        pass
+
+    @abstractmethod
+    async def set(self, user_id: UUID, version: int, locations: list[UserLocationDTO]) -> None:
+        pass
+
+    @abstractmethod
+    async def invalidate(self, user_id: UUID) -> None:
+        pass
+
+
+class LocationPopularity(ABC):
+    @abstractmethod
+    async def record(self, added: list[Location], removed: list[Location]) -> None:
+        pass
+
+    @abstractmethod
+    async def top(self, limit: int) -> list[PopularLocationDTO]:
+        pass
+
+
 class Hasher(ABC):
     @abstractmethod
     def hash(self, text: str) -> str:
@@ -61,6 +104,10 @@ class DBSession(ABC):
     async def commit(self) -> None:
         pass
 
+    @abstractmethod
+    async def close(self) -> None:
+        pass
+
 
 class WeatherClient(ABC):
     @abstractmethod
@@ -68,5 +115,21 @@ class WeatherClient(ABC):
         pass
 
     @abstractmethod
-    async def get_weather_by_location(self, location: Location) -> LocationWeatherDTO:
+    async def get_weather_by_location(self, location: Location | UserLocationDTO) -> LocationWeatherDTO:
+        pass
+
+
+class WeatherSubscription(ABC):
+    @abstractmethod
+    async def next_updates(self) -> list[LocationWeatherDTO]:
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
+
+
+class WeatherUpdates(ABC):
+    @abstractmethod
+    async def subscribe(self, locations: list[UserLocationDTO]) -> WeatherSubscription:
         pass
@@ -1,4 +1,7 @@
+import asyncio
 import re
+from itertools import islice
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
 from weather_tracker.domain.entities import Location, User
@@ -6,14 +9,22 @@ from weather_tracker.domain.exceptions import DomainError
 
 from .dto import (
     LocationAddInput,
+    LocationBatchResultDTO,
     LocationDTO,
+    LocationLimits,
+    LocationsBatchInput,
     LocationWeatherDTO,
+    LocationWeatherPageDTO,
+    LocationWeatherStreamDTO,
     LoginUserInput,
+    PopularLocationDTO,
     RegisterUserInput,
     RegisterUserOutput,
+    UserLocationDTO,
     UserSessionDTO,
 )
 from .exceptions import (
+    InvalidCursorError,
     LocationNotFoundError,
     LoginRequirementError,
     PasswordRequirementError,
@@ -26,9 +37,13 @@ from .interfaces import (
     DBSession,
     Hasher,
     LocationGateway,
+    LocationPopularity,
     UserGateway,
+    UserLocationsCache,
     UserSessionGateway,
     WeatherClient,
+    WeatherSubscription,
+    WeatherUpdates,
 )
 
 
@@ -107,31 +122,38 @@ class AddUserLocation:
         user_gateway: UserGateway,
         user_session_gateway: UserSessionGateway,
         db_session: DBSession,
+        locations_cache: UserLocationsCache,
+        popularity: LocationPopularity,
+        limits: LocationLimits,
     ):
         self.location_gateway = location_gateway
         self.user_gateway = user_gateway
         self.user_session_gateway = user_session_gateway
         self.db_session = db_session
+        self.locations_cache = locations_cache
+        self.popularity = popularity
+        self.limits = limits
 
     async def execute(self, session_id: str, location_data: LocationAddInput) -> None:
         user_id = await self.user_session_gateway.get_user_id(session_id=UUID(session_id))
-        user = await self.user_gateway.find_by_id(user_id=user_id, load_locations=True)
+        user = await self.user_gateway.find_by_id(user_id=user_id, load_locations=True, for_update=True)
         if not user:
             raise UserNotFoundError(id=user_id)
 
-        location = await self.location_gateway.get_by_coords(coordinates=location_data.coordinates)
-
-        if location is None:
-            location = Location.create(name=location_data.name, coordinates=location_data.coordinates)
-            await self.location_gateway.save(location=location)
+        location = await self.location_gateway.upsert(
+            location=Location.create(name=location_data.name, coordinates=location_data.coordinates)
+        )
 
         try:
-            user.add_location(location=location)
+            user.add_location(location=location, max_locations=self.limits.max_per_user)
             await self.user_gateway.save(user=user)
             await self.db_session.commit()
         except DomainError as e:
             raise UserLocationError(message=e.message)
 
+        await self.locations_cache.invalidate(user_id=user.id)
+        await self.popularity.record(added=[location], removed=[])
+
 
 class RemoveUserLocation:
     def __init__(
@@ -140,15 +162,19 @@ class RemoveUserLocation:
         user_gateway: UserGateway,
         user_session_gateway: UserSessionGateway,
         db_session: DBSession,
+        locations_cache: UserLocationsCache,
+        popularity: LocationPopularity,
     ):
         self.location_gateway = location_gateway
         self.user_gateway = user_gateway
         self.user_session_gateway = user_session_gateway
         self.db_session = db_session
+        self.locations_cache = locations_cache
+        self.popularity = popularity
 
     async def execute(self, session_id: str, location_data: LocationAddInput) -> None:
         user_id = await self.user_session_gateway.get_user_id(session_id=UUID(session_id))
-        user = await self.user_gateway.find_by_id(user_id=user_id, load_locations=True)
+        user = await self.user_gateway.find_by_id(user_id=user_id, load_locations=True, for_update=True)
         if not user:
             raise UserNotFoundError(id=user_id)
 
@@ -163,29 +189,201 @@ class RemoveUserLocation:
         except DomainError as e:
             raise UserLocationError(message=e.message)
 
+        await self.locations_cache.invalidate(user_id=user.id)
+        await self.popularity.record(added=[], removed=[location])
 
-class GetUserLocations:
+
+class BatchUpdateUserLocations:
     def __init__(
         self,
         location_gateway: LocationGateway,
         user_gateway: UserGateway,
         user_session_gateway: UserSessionGateway,
-        weather_client: WeatherClient,
+        db_session: DBSession,
+        locations_cache: UserLocationsCache,
+        popularity: LocationPopularity,
+        limits: LocationLimits,
     ):
         self.location_gateway = location_gateway
         self.user_gateway = user_gateway
         self.user_session_gateway = user_session_gateway
-        self.weather_client = weather_client
+        self.db_session = db_session
+        self.locations_cache = locations_cache
+        self.popularity = popularity
+        self.limits = limits
 
-    async def execute(self, session_id: str) -> list[LocationWeatherDTO]:
+    async def execute(self, session_id: str, batch: LocationsBatchInput) -> list[LocationBatchResultDTO]:
         user_id = await self.user_session_gateway.get_user_id(session_id=UUID(session_id))
-        user = await self.user_gateway.find_by_id(user_id=user_id, load_locations=True)
+        user = await self.user_gateway.find_by_id(user_id=user_id, load_locations=True, for_update=True)
         if not user:
             raise UserNotFoundError(id=user_id)
 
+        results = []
+        user_locations = {loc.coordinates: loc for loc in user.locations}
+        for item in batch.remove:
+            location = user_locations.pop(item.coordinates, None)
+            if location is None:
+                results.append(
+                    LocationBatchResultDTO(
+                        name=item.name,
+                        coordinates=item.coordinates,
+                        action="remove",
+                        status="error",
+                        message="Location Not Found",
+                    )
+                )
+                continue
+            user.remove_location(location=location)
+            results.append(
+                LocationBatchResultDTO(name=item.name, coordinates=item.coordinates, action="remove", status="ok")
+            )
+
+        resolved = await self.location_gateway.upsert_many(
+            new_locations=[Location.create(name=item.name, coordinates=item.coordinates) for item in batch.add]
+        )
+        for item, location in zip(batch.add, resolved):
+            try:
+                user.add_location(location=location, max_locations=self.limits.max_per_user)
+            except DomainError as e:
+                results.append(
+                    LocationBatchResultDTO(
+                        name=item.name, coordinates=item.coordinates, action="add", status="error", message=e.message
+                    )
+                )
+                continue
+            results.append(
+                LocationBatchResultDTO(name=item.name, coordinates=item.coordinates, action="add", status="ok")
+            )
+
+        added, removed = user.added_locations, user.removed_locations
+        if not added and not removed:
+            return results
+        await self.user_gateway.save(user=user)
+        await self.db_session.commit()
+
+        await self.locations_cache.invalidate(user_id=user.id)
+        await self.popularity.record(added=added, removed=removed)
+        return results
+
+
+async def load_user_locations(
+    user_id: UUID, location_gateway: LocationGateway, locations_cache: UserLocationsCache
+) -> tuple[list[UserLocationDTO], int]:
+    cached = await locations_cache.get(user_id=user_id)
+    locations = cached.locations
+    if locations is None:
+        locations = await location_gateway.find_by_user_id(user_id=user_id)
+        await locations_cache.set(user_id=user_id, version=cached.version, locations=locations)
+    return locations, cached.version
+
+
+class GetUserLocations:
+    def __init__(
+        self,
+        location_gateway: LocationGateway,
+        user_session_gateway: UserSessionGateway,
+        weather_client: WeatherClient,
+        locations_cache: UserLocationsCache,
+        limits: LocationLimits,
+    ):
+        self.location_gateway = location_gateway
+        self.user_session_gateway = user_session_gateway
+        self.weather_client = weather_client
+        self.locations_cache = locations_cache
+        self.limits = limits
+
+    async def _select_page(
+        self, session_id: str, cursor: Optional[str], limit: Optional[int]
+    ) -> tuple[list[UserLocationDTO], Optional[str], int]:
+        user_id = await self.user_session_gateway.get_user_id(session_id=UUID(session_id))
+        locations, version = await load_user_locations(
+            user_id=user_id, location_gateway=self.location_gateway, locations_cache=self.locations_cache
+        )
+
+        locations = sorted(locations, key=lambda loc: loc.id)
+        if cursor is not None:
+            try:
+                after = UUID(cursor)
+            except ValueError:
+                raise InvalidCursorError(cursor=cursor)
+            locations = [loc for loc in locations if loc.id > after]
+
+        limit = min(limit or self.limits.page_size, self.limits.max_page_size)
+        page = locations[:limit]
+        return page, str(page[-1].id) if len(locations) > limit else None, version
+
+    async def execute(
+        self, session_id: str, cursor: Optional[str] = None, limit: Optional[int] = None
+    ) -> LocationWeatherPageDTO:
+        page, next_cursor, version = await self._select_page(session_id=session_id, cursor=cursor, limit=limit)
+
         output = []
-        for loc in user.locations:
+        for loc in page:
             weather = await self.weather_client.get_weather_by_location(location=loc)
             output.append(weather)
 
-        return output
+        return LocationWeatherPageDTO(items=output, next_cursor=next_cursor, version=version)
+
+    async def execute_stream(
+        self, session_id: str, cursor: Optional[str] = None, limit: Optional[int] = None
+    ) -> LocationWeatherStreamDTO:
+        page, next_cursor, version = await self._select_page(session_id=session_id, cursor=cursor, limit=limit)
+        return LocationWeatherStreamDTO(
+            items=self._weather_as_completed(page), next_cursor=next_cursor, version=version
+        )
+
+    async def _weather_as_completed(self, locations: list[UserLocationDTO]) -> AsyncIterator[LocationWeatherDTO]:
+        remaining = iter(locations)
+        pending = {
+            asyncio.ensure_future(self.weather_client.get_weather_by_location(location=loc))
+            for loc in islice(remaining, self.limits.stream_concurrency)
+        }
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for loc in islice(remaining, len(done)):
+                    pending.add(asyncio.ensure_future(self.weather_client.get_weather_by_location(location=loc)))
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+class GetPopularLocations:
+    def __init__(
+        self, popularity: LocationPopularity, user_session_gateway: UserSessionGateway, limits: LocationLimits
+    ):
+        self.popularity = popularity
+        self.user_session_gateway = user_session_gateway
+        self.limits = limits
+
+    async def execute(self, session_id: str, limit: Optional[int] = None) -> list[PopularLocationDTO]:
+        await self.user_session_gateway.get_user_id(session_id=UUID(session_id))
+        return await self.popularity.top(limit=min(limit or self.limits.page_size, self.limits.max_page_size))
+
+
+class SubscribeWeatherUpdates:
+    def __init__(
+        self,
+        location_gateway: LocationGateway,
+        user_session_gateway: UserSessionGateway,
+        db_session: DBSession,
+        locations_cache: UserLocationsCache,
+        weather_updates: WeatherUpdates,
+    ):
+        self.location_gateway = location_gateway
+        self.user_session_gateway = user_session_gateway
+        self.db_session = db_session
+        self.locations_cache = locations_cache
+        self.weather_updates = weather_updates
+
+    async def execute(self, session_id: str) -> WeatherSubscription:
+        user_id = await self.user_session_gateway.get_user_id(session_id=UUID(session_id))
+        try:
+            locations, _ = await load_user_locations(
+                user_id=user_id, location_gateway=self.location_gateway, locations_cache=self.locations_cache
+            )
+        finally:
+            await self.db_session.close()
+        return await self.weather_updates.subscribe(locations=locations)
@@ -0,0 +1,156 @@
+import argparse
+import asyncio
+import json
+import logging
+import re
+import time
+import typing
+
+from dishka import make_async_container
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from weather_tracker.application import use_cases
+from weather_tracker.config import Config
+from weather_tracker.infrastructure.database.maintenance import (
+    GcBatchStats,
+    LocationGarbageCollector,
+    location_subscriber_counts,
+)
+from weather_tracker.infrastructure.popularity import RedisLocationPopularity
+from weather_tracker.infrastructure.profiling import (
+    PROFILE_HEADER,
+    profile_name,
+    profiling_available,
+    sign_profile_token,
+    start_profiler,
+    write_profile,
+)
+from weather_tracker.ioc import AppProvider
+
+USE_CASES = {
+    re.sub(r"(?<!^)(?=[A-Z])", "-", name).lower(): cls
+    for name, cls in vars(use_cases).items()
+    if isinstance(cls, type) and cls.__module__ == use_cases.__name__ and hasattr(cls, "execute")
+}
+
+
+async def gc_locations(config: Config, batch_size: int, max_batches: int | None, pause: float) -> None:
+    container = make_async_container(AppProvider(), context={Config: config})
+    try:
+        session_maker = await container.get(async_sessionmaker[AsyncSession])
+        popularity = RedisLocationPopularity(redis_client=await container.get(Redis))
+        collector = LocationGarbageCollector(session_maker=session_maker, batch_size=batch_size, pause=pause)
+
+        async def on_batch(stats: GcBatchStats) -> None:
+            await popularity.forget(location_ids=stats.deleted_ids)
+            print(f"batch {stats.number}: reclaimed {stats.deleted} rows in {stats.elapsed:.3f}s")
+
+        batches = await collector.run(max_batches=max_batches, on_batch=on_batch)
+        total = sum(stats.deleted for stats in batches)
+        elapsed = sum(stats.elapsed for stats in batches)
+        print(f"total: reclaimed {total} rows in {len(batches)} batches, {elapsed:.3f}s")
+    finally:
+        await container.close()
+
+
+async def rebuild_popularity(config: Config) -> None:
+    container = make_async_container(AppProvider(), context={Config: config})
+    try:
+        session_maker = await container.get(async_sessionmaker[AsyncSession])
+        popularity = RedisLocationPopularity(redis_client=await container.get(Redis))
+        start = time.perf_counter()
+        locations = await location_subscriber_counts(session_maker=session_maker)
+        await popularity.rebuild(locations=locations)
+        subscribers = sum(loc.subscribers for loc in locations)
+        print(
+            f"rebuilt popularity for {len(locations)} locations, {subscribers} subscribers "
+            f"in {time.perf_counter() - start:.3f}s"
+        )
+    finally:
+        await container.close()
+
+
+def bind_arguments(method, arguments: dict) -> dict:
+    hints = typing.get_type_hints(method)
+    return {name: TypeAdapter(hints.get(name, typing.Any)).validate_python(value) for name, value in arguments.items()}
+
+
+async def profile_use_case(
+    config: Config, use_case: type, arguments: dict, repeat: int, interval: float, directory: str, output_format: str
+) -> None:
+    container = make_async_container(AppProvider(), context={Config: config})
+    try:
+        kwargs = bind_arguments(use_case.execute, arguments)
+        profiler = start_profiler(interval)
+        try:
+            for _ in range(repeat):
+                async with container() as request_container:
+                    instance = await request_container.get(use_case)
+                    await instance.execute(**kwargs)
+        finally:
+            profiler.stop()
+            path = write_profile(profiler, directory, profile_name(use_case.__name__), output_format)
+            print(profiler.output_text(color=False))
+            print(f"profile written to {path}")
+    finally:
+        await container.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="weather_tracker")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    gc_parser = subparsers.add_parser("gc-locations", help="delete locations no user tracks any more")
+    gc_parser.add_argument("--batch-size", type=int, default=500)
+    gc_parser.add_argument("--max-batches", type=int, default=None)
+    gc_parser.add_argument("--pause", type=float, default=0.1, help="seconds to sleep between batches")
+
+    subparsers.add_parser("rebuild-popularity", help="recount location popularity from user_locations")
+
+    profile_parser = subparsers.add_parser("profile", help="profile a single use case execute call")
+    profile_parser.add_argument("use_case", choices=sorted(USE_CASES))
+    profile_parser.add_argument("--args", type=json.loads, default={}, help="execute keyword arguments as JSON")
+    profile_parser.add_argument("--repeat", type=int, default=1)
+    profile_parser.add_argument("--interval", type=float, default=None, help="sampling interval in seconds")
+    profile_parser.add_argument("--output-dir", default=None)
+    profile_parser.add_argument("--format", choices=["speedscope", "html"], default=None)
+
+    token_parser = subparsers.add_parser("profile-token", help="sign an X-Profile header for one request path")
+    token_parser.add_argument("path")
+    token_parser.add_argument("--ttl", type=int, default=300, help="seconds the token stays valid")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(asctime)s - [%(name)s] - %(message)s")
+    config = Config.from_env()
+
+    if args.command == "gc-locations":
+        asyncio.run(
+            gc_locations(config=config, batch_size=args.batch_size, max_batches=args.max_batches, pause=args.pause)
+        )
+    elif args.command == "rebuild-popularity":
+        asyncio.run(rebuild_popularity(config=config))
+    elif args.command == "profile":
+        if not profiling_available():
+            parser.error("profiling requires pyinstrument to be installed")
+        asyncio.run(
+            profile_use_case(
+                config=config,
+                use_case=USE_CASES[args.use_case],
+                arguments=args.args,
+                repeat=args.repeat,
+                interval=args.interval or config.profiling.interval,
+                directory=args.output_dir or config.profiling.directory,
+                output_format=args.format or config.profiling.output_format,
+            )
+        )
+    elif args.command == "profile-token":
+        if not config.profiling.secret:
+            parser.error("PROFILING_SECRET is not set")
+        token = sign_profile_token(config.profiling.secret, args.path, int(time.time()) + args.ttl)
+        print(f"{PROFILE_HEADER}: {token}")
+
+
+if __name__ == "__main__":
+    main()
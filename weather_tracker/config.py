@@ -1,13 +1,15 @@
 from os import environ
+from typing import Literal, Optional
 
 from dotenv import load_dotenv
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class RedisConfig(BaseModel):
     host: str = Field(validation_alias="REDIS_HOST")
     port: int = Field(validation_alias="REDIS_PORT")
     session_lifetime: int = Field(validation_alias="REDIS_SESSION_LIFETIME_SEC")
+    locations_cache_lifetime: int = Field(default=3600, validation_alias="REDIS_LOCATIONS_CACHE_LIFETIME_SEC")
 
 
 class PostgresConfig(BaseModel):
@@ -16,26 +18,117 @@ class PostgresConfig(BaseModel):
     db: str = Field(validation_alias="POSTGRES_DB")
     host: str = Field(validation_alias="POSTGRES_HOST")
     port: str = Field(validation_alias="POSTGRES_PORT")
+    pool_size: int = Field(default=5, validation_alias="POSTGRES_POOL_SIZE")
+    max_overflow: int = Field(default=10, validation_alias="POSTGRES_MAX_OVERFLOW")
+    pool_timeout: float = Field(default=30.0, validation_alias="POSTGRES_POOL_TIMEOUT_SEC")
+    pool_recycle: int = Field(default=-1, validation_alias="POSTGRES_POOL_RECYCLE_SEC")
+    pool_pre_ping: bool = Field(default=False, validation_alias="POSTGRES_POOL_PRE_PING")
+    statement_cache_size: int = Field(default=100, validation_alias="POSTGRES_STATEMENT_CACHE_SIZE")
+    gateways: Literal["orm", "core"] = Field(default="orm", validation_alias="POSTGRES_GATEWAYS")
+    replica_hosts: list[str] = Field(default_factory=list, validation_alias="POSTGRES_REPLICA_HOSTS")
+    replica_sticky_sec: int = Field(default=5, validation_alias="POSTGRES_REPLICA_STICKY_SEC")
+
+    @field_validator("replica_hosts", mode="before")
+    @classmethod
+    def split_replica_hosts(cls, v):
+        if isinstance(v, str):
+            return [host.strip() for host in v.split(",") if host.strip()]
+        return v
 
     @property
     def pg_async_url(self):
         return f"postgresql+asyncpg://{self.user}:{self.password}@{self.host}:{self.port}/{self.db}"
 
+    @property
+    def pg_replica_async_urls(self):
+        urls = []
+        for replica in self.replica_hosts:
+            host, _, port = replica.partition(":")
+            urls.append(f"postgresql+asyncpg://{self.user}:{self.password}@{host}:{port or self.port}/{self.db}")
+        return urls
+
 
 class OpenWeatherConfig(BaseModel):
     api_key: str = Field(validation_alias="OPENWEATHER_API_KEY")
     search_url: str = Field(validation_alias="OPENWEATHER_SEARCH_URL")
     weather_url: str = Field(validation_alias="OPENWEATHER_WEATHER_URL")
+    weather_cache_ttl: int = Field(default=600, validation_alias="OPENWEATHER_WEATHER_CACHE_TTL_SEC")
+    search_max_age: int = Field(default=3600, validation_alias="OPENWEATHER_SEARCH_MAX_AGE_SEC")
+
+
+class LocationsConfig(BaseModel):
+    max_per_user: int = Field(default=50, validation_alias="LOCATIONS_MAX_PER_USER")
+    page_size: int = Field(default=10, validation_alias="LOCATIONS_PAGE_SIZE")
+    max_page_size: int = Field(default=50, validation_alias="LOCATIONS_MAX_PAGE_SIZE")
+    stream_concurrency: int = Field(default=5, validation_alias="LOCATIONS_STREAM_CONCURRENCY")
+
+
+class CompressionConfig(BaseModel):
+    minimum_size: int = Field(default=1024, validation_alias="COMPRESSION_MIN_SIZE")
+    gzip_level: int = Field(default=6, validation_alias="COMPRESSION_GZIP_LEVEL")
+    brotli_quality: int = Field(default=4, validation_alias="COMPRESSION_BROTLI_QUALITY")
+    cache_size: int = Field(default=1024, validation_alias="COMPRESSION_CACHE_SIZE")
+
+
+class LoggingConfig(BaseModel):
+    filename: str = Field(default="weather.log", validation_alias="LOG_FILE")
+    level: str = Field(default="INFO", validation_alias="LOG_LEVEL")
+    max_bytes: int = Field(default=5 * 1024 * 1024, validation_alias="LOG_MAX_BYTES")
+    rotate_when: Optional[str] = Field(default=None, validation_alias="LOG_ROTATE_WHEN")
+    backup_count: int = Field(default=5, validation_alias="LOG_BACKUP_COUNT")
+    json_format: bool = Field(default=False, validation_alias="LOG_JSON")
+
+
+class TracingConfig(BaseModel):
+    exporter: Literal["none", "file"] = Field(default="none", validation_alias="TRACING_EXPORTER")
+    sample_rate: float = Field(default=0.0, ge=0.0, le=1.0, validation_alias="TRACING_SAMPLE_RATE")
+    filename: str = Field(default="traces.jsonl", validation_alias="TRACING_FILE")
+    trust_parent: bool = Field(default=False, validation_alias="TRACING_TRUST_PARENT")
+
+
+class ProfilingConfig(BaseModel):
+    directory: str = Field(default="profiles", validation_alias="PROFILING_DIR")
+    sample_rate: float = Field(default=0.0, ge=0.0, le=1.0, validation_alias="PROFILING_SAMPLE_RATE")
+    secret: Optional[str] = Field(default=None, validation_alias="PROFILING_SECRET")
+    interval: float = Field(default=0.001, gt=0.0, validation_alias="PROFILING_INTERVAL_SEC")
+    output_format: Literal["speedscope", "html"] = Field(default="speedscope", validation_alias="PROFILING_FORMAT")
+    max_concurrent: int = Field(default=2, validation_alias="PROFILING_MAX_CONCURRENT")
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0.0 or bool(self.secret)
+
+
+class WarmupConfig(BaseModel):
+    db_connections: int = Field(default=2, ge=0, validation_alias="WARMUP_DB_CONNECTIONS")
+    redis_connections: int = Field(default=2, ge=0, validation_alias="WARMUP_REDIS_CONNECTIONS")
+    upstream_connections: int = Field(default=2, ge=0, validation_alias="WARMUP_UPSTREAM_CONNECTIONS")
+    hot_weather: int = Field(default=0, ge=0, validation_alias="WARMUP_HOT_WEATHER")
+    timeout: float = Field(default=30.0, gt=0.0, validation_alias="WARMUP_TIMEOUT_SEC")
 
 
 class Config(BaseModel):
     open_weather: OpenWeatherConfig
     postgres: PostgresConfig
     redis: RedisConfig
+    locations: LocationsConfig
+    logging: LoggingConfig
+    compression: CompressionConfig
+    tracing: TracingConfig
+    profiling: ProfilingConfig
+    warmup: WarmupConfig
 
     @classmethod
     def from_env(cls, env_path: str = ".env"):
         load_dotenv(env_path, override=True)
         return cls(
-            open_weather=OpenWeatherConfig(**environ), postgres=PostgresConfig(**environ), redis=RedisConfig(**environ)
+            open_weather=OpenWeatherConfig(**environ),
+            postgres=PostgresConfig(**environ),
+            redis=RedisConfig(**environ),
+            locations=LocationsConfig(**environ),
+            logging=LoggingConfig(**environ),
+            compression=CompressionConfig(**environ),
+            tracing=TracingConfig(**environ),
+            profiling=ProfilingConfig(**environ),
+            warmup=WarmupConfig(**environ),
         )
@@ -7,7 +7,7 @@ from .exceptions import DomainError
 from .value_objects import Coordinates
 
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     id: UUID
     name: str
@@ -22,33 +22,70 @@ class Location:
             return self.id == other.id
         return False
 
+    def __hash__(self):
+        return hash(self.id)
 
-@dataclass
+
+@dataclass(slots=True)
 class User:
     id: UUID
     login: str
     hashed_password: str
-    _locations: list[Location] = field(default_factory=list)
+    _locations: dict[UUID, Location] = field(default_factory=dict)
+    _added_locations: dict[UUID, Location] = field(default_factory=dict)
+    _removed_locations: dict[UUID, Location] = field(default_factory=dict)
+    _is_new: bool = True
+    _locations_view: Optional[tuple[Location, ...]] = None
 
     @classmethod
     def create(cls, login: str, hashed_password: str, id_: Optional[UUID] = None):
         return cls(id=uuid.uuid4() if not id_ else id_, login=login, hashed_password=hashed_password)
 
-    def add_location(self, location: Location):
-        if location in self._locations:
+    def add_location(self, location: Location, max_locations: Optional[int] = None):
+        if location.id in self._locations:
             raise DomainError("User already has this Location")
-        self._locations.append(location)
+        if max_locations is not None and len(self._locations) >= max_locations:
+            raise DomainError(f"User can't have more than {max_locations} Locations")
+        self._locations[location.id] = location
+        self._locations_view = None
+        if self._removed_locations.pop(location.id, None) is None:
+            self._added_locations[location.id] = location
 
     def remove_location(self, location: Location):
-        if location not in self._locations:
+        if location.id not in self._locations:
             raise DomainError("Location Not Found")
-        self._locations.remove(location)
+        del self._locations[location.id]
+        self._locations_view = None
+        if self._added_locations.pop(location.id, None) is None:
+            self._removed_locations[location.id] = location
+
+    def mark_saved(self):
+        self._added_locations.clear()
+        self._removed_locations.clear()
+        self._is_new = False
 
     @property
-    def locations(self):
-        return list(self._locations)
+    def locations(self) -> tuple[Location, ...]:
+        if self._locations_view is None:
+            self._locations_view = tuple(self._locations.values())
+        return self._locations_view
+
+    @property
+    def added_locations(self):
+        return list(self._added_locations.values())
+
+    @property
+    def removed_locations(self):
+        return list(self._removed_locations.values())
+
+    @property
+    def is_new(self):
+        return self._is_new
 
     def __eq__(self, other):
         if isinstance(other, User):
             return self.id == other.id
         return False
+
+    def __hash__(self):
+        return hash(self.id)
@@ -1,19 +1,55 @@
 from dataclasses import dataclass
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
 
+COORDINATES_SCALE = 7
+COORDINATES_FACTOR = 10**COORDINATES_SCALE
 
-@dataclass(frozen=True)
+
+def decimal_to_fixed(value: Decimal | int | float | str) -> int:
+    if isinstance(value, int):
+        return value * COORDINATES_FACTOR
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    scaled = value.scaleb(COORDINATES_SCALE)
+    fixed = int(scaled)
+    if fixed != scaled:
+        fixed = int(scaled.to_integral_value(rounding=ROUND_HALF_UP))
+    return fixed
+
+
+def fixed_to_decimal(value: int) -> Decimal:
+    return Decimal(value).scaleb(-COORDINATES_SCALE)
+
+
+@dataclass(frozen=True, slots=True, init=False)
 class Coordinates:
-    latitude: Decimal
-    longitude: Decimal
+    latitude_e7: int
+    longitude_e7: int
+
+    def __init__(self, latitude: Decimal | int | float | str, longitude: Decimal | int | float | str):
+        object.__setattr__(self, "latitude_e7", decimal_to_fixed(latitude))
+        object.__setattr__(self, "longitude_e7", decimal_to_fixed(longitude))
+
+    @classmethod
+    def from_fixed(cls, latitude_e7: int, longitude_e7: int) -> "Coordinates":
+        coordinates = object.__new__(cls)
+        object.__setattr__(coordinates, "latitude_e7", latitude_e7)
+        object.__setattr__(coordinates, "longitude_e7", longitude_e7)
+        return coordinates
+
+    @property
+    def latitude(self) -> Decimal:
+        return fixed_to_decimal(self.latitude_e7)
+
+    @property
+    def longitude(self) -> Decimal:
+        return fixed_to_decimal(self.longitude_e7)
 
-    def __eq__(self, other):
-        if isinstance(other, Coordinates):
-            return self.latitude == other.latitude and self.longitude == self.longitude
-        return False
+    def __repr__(self):
+        return f"Coordinates(latitude={self.latitude}, longitude={self.longitude})"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Weather:
     main_state: str
     temperature: int
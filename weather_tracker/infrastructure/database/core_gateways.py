@@ -0,0 +1,193 @@
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import Table, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from weather_tracker.application.dto import UserLocationDTO
+from weather_tracker.application.interfaces import LocationGateway, UserGateway
+from weather_tracker.domain.entities import Location, User
+from weather_tracker.domain.value_objects import Coordinates
+
+from .gateways import dialect_insert
+from .orm_models import LocationORM, UserLocationORM, UserORM
+from .replicas import ReplicaRouter
+
+users: Table = UserORM.__table__  # type: ignore[assignment]
+locations: Table = LocationORM.__table__  # type: ignore[assignment]
+user_locations: Table = UserLocationORM.__table__  # type: ignore[assignment]
+
+
+class PgCoreUserGateway(UserGateway):
+    def __init__(self, session: AsyncSession, replica_router: Optional[ReplicaRouter] = None):
+        self.session = session
+        self.replica_router = replica_router
+
+    async def _connection(self) -> AsyncConnection:
+        return await self.session.connection()
+
+    async def find_by_login(self, login: str) -> Optional[User]:
+        query = select(users.c.id, users.c.login, users.c.hashed_password).where(users.c.login == login)
+        row = (await (await self._connection()).execute(query)).first()
+        if row:
+            user = User.create(id_=row.id, login=row.login, hashed_password=row.hashed_password)
+            user.mark_saved()
+            return user
+        return None
+
+    async def find_by_id(self, user_id: UUID, load_locations: bool = False, for_update: bool = False) -> Optional[User]:
+        if not load_locations:
+            query = select(users.c.id, users.c.login, users.c.hashed_password).where(users.c.id == user_id)
+            if for_update:
+                query = query.with_for_update()
+            row = (await (await self._connection()).execute(query)).first()
+            if row:
+                user = User.create(id_=row.id, login=row.login, hashed_password=row.hashed_password)
+                user.mark_saved()
+                return user
+            return None
+
+        query = (
+            select(
+                users.c.id,
+                users.c.login,
+                users.c.hashed_password,
+                locations.c.id.label("location_id"),
+                locations.c.name,
+                locations.c.latitude,
+                locations.c.longitude,
+            )
+            .select_from(
+                users.outerjoin(user_locations, users.c.id == user_locations.c.user_id).outerjoin(
+                    locations, locations.c.id == user_locations.c.location_id
+                )
+            )
+            .where(users.c.id == user_id)
+        )
+        connection = await self._connection()
+        if for_update:
+            await connection.execute(select(users.c.id).where(users.c.id == user_id).with_for_update())
+        rows = (await connection.execute(query)).all()
+        if not rows:
+            return None
+
+        user = User.create(id_=rows[0].id, login=rows[0].login, hashed_password=rows[0].hashed_password)
+        for row in rows:
+            if row.location_id is not None:
+                user.add_location(
+                    Location(
+                        id=row.location_id,
+                        name=row.name,
+                        coordinates=Coordinates(latitude=row.latitude, longitude=row.longitude),
+                    )
+                )
+        user.mark_saved()
+        return user
+
+    async def save(self, user: User) -> None:
+        connection = await self._connection()
+        if user.is_new:
+            await connection.execute(
+                insert(users).values(id=user.id, login=user.login, hashed_password=user.hashed_password)
+            )
+
+        removed_ids = [loc.id for loc in user.removed_locations]
+        if removed_ids:
+            await connection.execute(
+                delete(user_locations).where(
+                    user_locations.c.user_id == user.id, user_locations.c.location_id.in_(removed_ids)
+                )
+            )
+
+        added = [{"user_id": user.id, "location_id": loc.id} for loc in user.added_locations]
+        if added:
+            await connection.execute(insert(user_locations), added)
+
+        user.mark_saved()
+        if self.replica_router is not None:
+            await self.replica_router.mark_written(user_id=user.id)
+
+
+class PgCoreLocationGateway(LocationGateway):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _connection(self) -> AsyncConnection:
+        return await self.session.connection()
+
+    async def save(self, location: Location) -> None:
+        await (await self._connection()).execute(
+            insert(locations).values(
+                id=location.id,
+                name=location.name,
+                latitude=location.coordinates.latitude,
+                longitude=location.coordinates.longitude,
+            )
+        )
+
+    async def upsert(self, location: Location) -> Location:
+        query = dialect_insert(self.session)(locations).values(
+            id=location.id,
+            name=location.name,
+            latitude=location.coordinates.latitude,
+            longitude=location.coordinates.longitude,
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[locations.c.latitude, locations.c.longitude], set_={"name": locations.c.name}
+        ).returning(locations.c.id, locations.c.name, locations.c.latitude, locations.c.longitude)
+        row = (await (await self._connection()).execute(query)).one()
+        return Location(
+            id=row.id, name=row.name, coordinates=Coordinates(latitude=row.latitude, longitude=row.longitude)
+        )
+
+    async def upsert_many(self, new_locations: list[Location]) -> list[Location]:
+        if not new_locations:
+            return []
+        values: dict[Coordinates, dict] = {}
+        for location in sorted(
+            new_locations, key=lambda loc: (loc.coordinates.latitude_e7, loc.coordinates.longitude_e7)
+        ):
+            values.setdefault(
+                location.coordinates,
+                {
+                    "id": location.id,
+                    "name": location.name,
+                    "latitude": location.coordinates.latitude,
+                    "longitude": location.coordinates.longitude,
+                },
+            )
+        query = dialect_insert(self.session)(locations).values(list(values.values()))
+        query = query.on_conflict_do_update(
+            index_elements=[locations.c.latitude, locations.c.longitude], set_={"name": locations.c.name}
+        ).returning(locations.c.id, locations.c.name, locations.c.latitude, locations.c.longitude)
+        rows = (await (await self._connection()).execute(query)).all()
+        resolved = {}
+        for row in rows:
+            coordinates = Coordinates(latitude=row.latitude, longitude=row.longitude)
+            resolved[coordinates] = Location(id=row.id, name=row.name, coordinates=coordinates)
+        return [resolved[location.coordinates] for location in new_locations]
+
+    async def get_by_coords(self, coordinates: Coordinates) -> Optional[Location]:
+        query = select(locations.c.id, locations.c.name, locations.c.latitude, locations.c.longitude).where(
+            locations.c.latitude == coordinates.latitude, locations.c.longitude == coordinates.longitude
+        )
+        row = (await (await self._connection()).execute(query)).first()
+        if row:
+            return Location(
+                id=row.id, name=row.name, coordinates=Coordinates(latitude=row.latitude, longitude=row.longitude)
+            )
+        return None
+
+    async def find_by_user_id(self, user_id: UUID) -> list[UserLocationDTO]:
+        query = (
+            select(locations.c.id, locations.c.name, locations.c.latitude, locations.c.longitude)
+            .join(user_locations, locations.c.id == user_locations.c.location_id)
+            .where(user_locations.c.user_id == user_id)
+        )
+        result = await (await self._connection()).execute(query)
+        return [
+            UserLocationDTO(
+                id=row.id, name=row.name, coordinates=Coordinates(latitude=row.latitude, longitude=row.longitude)
+            )
+            for row in result
+        ]
@@ -1,29 +1,42 @@
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from weather_tracker.application.dto import UserLocationDTO
 from weather_tracker.application.interfaces import LocationGateway, UserGateway
 from weather_tracker.domain.entities import Location, User
 from weather_tracker.domain.value_objects import Coordinates
 
 from .orm_models import LocationORM, UserLocationORM, UserORM
+from .replicas import ReplicaRouter
+
+
+def dialect_insert(session: AsyncSession):
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite_insert
+    return pg_insert
 
 
 class PgOrmUserGateway(UserGateway):
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, replica_router: Optional[ReplicaRouter] = None):
         self.session = session
+        self.replica_router = replica_router
 
     async def find_by_login(self, login: str) -> Optional[User]:
         query = select(UserORM).filter_by(login=login)
         result: UserORM | None = await self.session.scalar(query)
         if result:
-            return User.create(id_=result.id, login=result.login, hashed_password=result.hashed_password)
+            user = User.create(id_=result.id, login=result.login, hashed_password=result.hashed_password)
+            user.mark_saved()
+            return user
         return None
 
-    async def find_by_id(self, user_id: UUID, load_locations: bool = False) -> Optional[User]:
-        result = await self.session.get(UserORM, user_id)
+    async def find_by_id(self, user_id: UUID, load_locations: bool = False, for_update: bool = False) -> Optional[User]:
+        result = await self.session.get(UserORM, user_id, with_for_update=for_update, populate_existing=for_update)
         if result:
             user = User.create(id_=result.id, login=result.login, hashed_password=result.hashed_password)
             if load_locations:
@@ -41,28 +54,28 @@ class PgOrmUserGateway(UserGateway):
                             coordinates=Coordinates(longitude=raw_loc.longitude, latitude=raw_loc.latitude),
                         )
                     )
+            user.mark_saved()
             return user
         return None
 
     async def save(self, user: User) -> None:
-        exists_user = await self.session.get(UserORM, user.id)
-        if not exists_user:
+        if user.is_new:
             self.session.add(UserORM(id=user.id, login=user.login, hashed_password=user.hashed_password))
 
-        query = select(UserLocationORM.location_id).filter_by(user_id=user.id)
-        locations_db = set(await self.session.scalars(query))
-        current_locations = set([loc.id for loc in user.locations])
-
-        loc_to_remove = locations_db - current_locations
-        loc_to_add = current_locations - locations_db
-
-        if len(loc_to_remove) > 0:
-            delete_query = delete(UserLocationORM).where(UserLocationORM.location_id.in_(loc_to_remove))
+        removed_ids = [loc.id for loc in user.removed_locations]
+        if removed_ids:
+            delete_query = delete(UserLocationORM).where(
+                UserLocationORM.user_id == user.id, UserLocationORM.location_id.in_(removed_ids)
+            )
             await self.session.execute(delete_query)
 
-        if len(loc_to_add) > 0:
-            new_locations = [UserLocationORM(user_id=user.id, location_id=loc_id) for loc_id in loc_to_add]
-            self.session.add_all(new_locations)
+        added = [{"user_id": user.id, "location_id": loc.id} for loc in user.added_locations]
+        if added:
+            await self.session.execute(insert(UserLocationORM), added)
+
+        user.mark_saved()
+        if self.replica_router is not None:
+            await self.replica_router.mark_written(user_id=user.id)
 
 
 class PgOrmLocationGateway(LocationGateway):
@@ -79,6 +92,48 @@ class PgOrmLocationGateway(LocationGateway):
 
         self.session.add(new_location)
 
+    async def upsert(self, location: Location) -> Location:
+        query = dialect_insert(self.session)(LocationORM).values(
+            id=location.id,
+            name=location.name,
+            latitude=location.coordinates.latitude,
+            longitude=location.coordinates.longitude,
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[LocationORM.latitude, LocationORM.longitude], set_={"name": LocationORM.name}
+        ).returning(LocationORM.id, LocationORM.name, LocationORM.latitude, LocationORM.longitude)
+        row = (await self.session.execute(query)).one()
+        return Location(
+            id=row.id, name=row.name, coordinates=Coordinates(latitude=row.latitude, longitude=row.longitude)
+        )
+
+    async def upsert_many(self, new_locations: list[Location]) -> list[Location]:
+        if not new_locations:
+            return []
+        values: dict[Coordinates, dict] = {}
+        for location in sorted(
+            new_locations, key=lambda loc: (loc.coordinates.latitude_e7, loc.coordinates.longitude_e7)
+        ):
+            values.setdefault(
+                location.coordinates,
+                {
+                    "id": location.id,
+                    "name": location.name,
+                    "latitude": location.coordinates.latitude,
+                    "longitude": location.coordinates.longitude,
+                },
+            )
+        query = dialect_insert(self.session)(LocationORM).values(list(values.values()))
+        query = query.on_conflict_do_update(
+            index_elements=[LocationORM.latitude, LocationORM.longitude], set_={"name": LocationORM.name}
+        ).returning(LocationORM.id, LocationORM.name, LocationORM.latitude, LocationORM.longitude)
+        rows = (await self.session.execute(query)).all()
+        resolved = {}
+        for row in rows:
+            coordinates = Coordinates(latitude=row.latitude, longitude=row.longitude)
+            resolved[coordinates] = Location(id=row.id, name=row.name, coordinates=coordinates)
+        return [resolved[location.coordinates] for location in new_locations]
+
     async def get_by_coords(self, coordinates: Coordinates) -> Optional[Location]:
         query = select(LocationORM).filter_by(latitude=coordinates.latitude, longitude=coordinates.longitude)
         result = await self.session.scalar(query)
@@ -90,3 +145,17 @@ class PgOrmLocationGateway(LocationGateway):
             )
 
         return None
+
+    async def find_by_user_id(self, user_id: UUID) -> list[UserLocationDTO]:
+        query = (
+            select(LocationORM.id, LocationORM.name, LocationORM.latitude, LocationORM.longitude)
+            .join(UserLocationORM, LocationORM.id == UserLocationORM.location_id)
+            .where(UserLocationORM.user_id == user_id)
+        )
+        result = await self.session.execute(query)
+        return [
+            UserLocationDTO(
+                id=row.id, name=row.name, coordinates=Coordinates(latitude=row.latitude, longitude=row.longitude)
+            )
+            for row in result
+        ]
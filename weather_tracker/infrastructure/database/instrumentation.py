@@ -0,0 +1,139 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+
+@dataclass
+class PoolStats:
+    size: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    checkout_wait_total: float
+    checkout_wait_max: float
+    statement_cache_hits: int
+    statement_cache_misses: int
+
+    @property
+    def checkout_wait_avg(self) -> float:
+        return self.checkout_wait_total / self.checkouts if self.checkouts else 0.0
+
+    @property
+    def statement_cache_hit_rate(self) -> float:
+        lookups = self.statement_cache_hits + self.statement_cache_misses
+        return self.statement_cache_hits / lookups if lookups else 0.0
+
+
+class PoolInstrumentation:
+    def __init__(self):
+        self.pool: Optional[Pool] = None
+        self.checkouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.statement_cache_hits = 0
+        self.statement_cache_misses = 0
+        self.checkout_hooks: list[Callable[[float], None]] = []
+        self.statement_cache_hooks: list[Callable[[bool], None]] = []
+        self.query_hooks: list[Callable[[str, float], None]] = []
+
+    def attach(self, engine: AsyncEngine) -> None:
+        if isinstance(engine.pool, InstrumentedAsyncAdaptedQueuePool):
+            engine.pool.instrumentation = self
+        self.pool = engine.pool
+        event.listen(engine.sync_engine, "connect", self._on_connect)
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def record_checkout(self, wait: float) -> None:
+        self.checkouts += 1
+        self.checkout_wait_total += wait
+        if wait > self.checkout_wait_max:
+            self.checkout_wait_max = wait
+        for hook in self.checkout_hooks:
+            hook(wait)
+
+    def record_statement_cache_lookup(self, hit: bool) -> None:
+        if hit:
+            self.statement_cache_hits += 1
+        else:
+            self.statement_cache_misses += 1
+        for hook in self.statement_cache_hooks:
+            hook(hit)
+
+    def record_query(self, statement: str, duration: float) -> None:
+        for hook in self.query_hooks:
+            hook(statement, duration)
+
+    def snapshot(self) -> PoolStats:
+        size = checked_out = overflow = 0
+        if isinstance(self.pool, AsyncAdaptedQueuePool):
+            size = self.pool.size()
+            checked_out = self.pool.checkedout()
+            overflow = max(self.pool.overflow(), 0)
+        return PoolStats(
+            size=size,
+            checked_out=checked_out,
+            overflow=overflow,
+            checkouts=self.checkouts,
+            checkout_wait_total=self.checkout_wait_total,
+            checkout_wait_max=self.checkout_wait_max,
+            statement_cache_hits=self.statement_cache_hits,
+            statement_cache_misses=self.statement_cache_misses,
+        )
+
+    def _on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        cache = getattr(dbapi_connection, "_prepared_statement_cache", None)
+        if cache is not None and not isinstance(cache, CountingStatementCache):
+            dbapi_connection._prepared_statement_cache = CountingStatementCache(cache=cache, instrumentation=self)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if self.query_hooks:
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        starts = conn.info.get("query_start")
+        if starts:
+            self.record_query(statement.lstrip().split(None, 1)[0].upper(), time.perf_counter() - starts.pop())
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    instrumentation: Optional[PoolInstrumentation] = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            if self.instrumentation is not None:
+                self.instrumentation.record_checkout(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.instrumentation = self.instrumentation
+        if self.instrumentation is not None:
+            self.instrumentation.pool = pool
+        return pool
+
+
+class CountingStatementCache:
+    def __init__(self, cache: Any, instrumentation: PoolInstrumentation):
+        self.cache = cache
+        self.instrumentation = instrumentation
+
+    def __contains__(self, key: Any) -> bool:
+        found = key in self.cache
+        self.instrumentation.record_statement_cache_lookup(hit=found)
+        return found
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.cache[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.cache[key] = value
+
+    def __len__(self) -> int:
+        return len(self.cache)
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from weather_tracker.application.dto import PopularLocationDTO
+from weather_tracker.domain.value_objects import Coordinates
+
+from .orm_models import LocationORM, UserLocationORM
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GcBatchStats:
+    number: int
+    deleted_ids: list[UUID]
+    elapsed: float
+
+    @property
+    def deleted(self) -> int:
+        return len(self.deleted_ids)
+
+
+class LocationGarbageCollector:
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        batch_size: int = 500,
+        pause: float = 0,
+        retries: int = 3,
+    ):
+        self.session_maker = session_maker
+        self.batch_size = batch_size
+        self.pause = pause
+        self.retries = retries
+
+    def _delete_query(self):
+        unreferenced = ~exists().where(UserLocationORM.location_id == LocationORM.id)
+        candidates = (
+            select(LocationORM.id)
+            .where(unreferenced)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        return (
+            delete(LocationORM)
+            .where(LocationORM.id.in_(candidates), unreferenced)
+            .returning(LocationORM.id)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def run_batch(self, number: int = 1) -> GcBatchStats:
+        start = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            try:
+                async with self.session_maker() as session:
+                    deleted_ids = list(await session.scalars(self._delete_query()))
+                    await session.commit()
+                break
+            except IntegrityError as e:
+                if attempt == self.retries:
+                    raise
+                logger.warning(f"Locations GC batch {number} lost a race with a new reference, retrying: {e}")
+        stats = GcBatchStats(number=number, deleted_ids=deleted_ids, elapsed=time.perf_counter() - start)
+        logger.info(f"Locations GC batch {stats.number}: reclaimed {stats.deleted} rows in {stats.elapsed:.3f}s")
+        return stats
+
+    async def run(
+        self,
+        max_batches: Optional[int] = None,
+        on_batch: Optional[Callable[[GcBatchStats], Awaitable[None]]] = None,
+    ) -> list[GcBatchStats]:
+        batches = []
+        while max_batches is None or len(batches) < max_batches:
+            stats = await self.run_batch(number=len(batches) + 1)
+            batches.append(stats)
+            if on_batch is not None:
+                await on_batch(stats)
+            if stats.deleted < self.batch_size:
+                break
+            if self.pause:
+                await asyncio.sleep(self.pause)
+        return batches
+
+
+async def location_subscriber_counts(session_maker: async_sessionmaker[AsyncSession]) -> list[PopularLocationDTO]:
+    counts = (
+        select(UserLocationORM.location_id, func.count().label("subscribers"))
+        .group_by(UserLocationORM.location_id)
+        .subquery()
+    )
+    query = select(
+        LocationORM.id, LocationORM.name, LocationORM.latitude, LocationORM.longitude, counts.c.subscribers
+    ).join(counts, counts.c.location_id == LocationORM.id)
+    async with session_maker() as session:
+        rows = (await session.execute(query)).all()
+    return [
+        PopularLocationDTO(
+            id=row.id,
+            name=row.name,
+            coordinates=Coordinates(latitude=row.latitude, longitude=row.longitude),
+            subscribers=row.subscribers,
+        )
+        for row in rows
+    ]
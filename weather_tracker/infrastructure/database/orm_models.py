@@ -1,7 +1,7 @@
 from decimal import Decimal
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import ForeignKey, Numeric, UniqueConstraint
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -23,8 +23,8 @@ class LocationORM(Base):
 
     id: Mapped[UUID] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(nullable=False)
-    latitude: Mapped[Decimal] = mapped_column(nullable=False)
-    longitude: Mapped[Decimal] = mapped_column(nullable=False)
+    latitude: Mapped[Decimal] = mapped_column(Numeric(precision=10, scale=7), nullable=False)
+    longitude: Mapped[Decimal] = mapped_column(Numeric(precision=10, scale=7), nullable=False)
 
     __table_args__ = (UniqueConstraint("latitude", "longitude", name="unique_lat_long"),)
 
@@ -32,4 +32,4 @@ class LocationORM(Base):
 class UserLocationORM(Base):
     __tablename__ = "user_locations"
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
-    location_id: Mapped[UUID] = mapped_column(ForeignKey("locations.id"), primary_key=True)
+    location_id: Mapped[UUID] = mapped_column(ForeignKey("locations.id"), primary_key=True, index=True)
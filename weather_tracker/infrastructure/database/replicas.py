@@ -0,0 +1,112 @@
+import itertools
+import logging
+from typing import Callable, Optional
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from weather_tracker.application.dto import UserLocationDTO
+from weather_tracker.application.interfaces import LocationGateway, UserGateway
+from weather_tracker.domain.entities import Location, User
+from weather_tracker.domain.value_objects import Coordinates
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRouter:
+    def __init__(self, replicas: list[async_sessionmaker[AsyncSession]], redis_client: Redis, sticky_sec: int):
+        self.replicas = replicas
+        self.redis_client = redis_client
+        self.sticky_sec = sticky_sec
+        self._cycle = itertools.cycle(replicas)
+
+    @property
+    def enabled(self) -> bool:
+        return len(self.replicas) > 0
+
+    def next_replica(self) -> Optional[async_sessionmaker[AsyncSession]]:
+        if not self.enabled:
+            return None
+        return next(self._cycle)
+
+    async def mark_written(self, user_id: UUID) -> None:
+        if not self.enabled:
+            return
+        try:
+            await self.redis_client.setex(name=self._key(user_id), time=self.sticky_sec, value=1)
+        except Exception as e:
+            logger.error(e)
+
+    async def replica_for(self, user_id: UUID) -> Optional[async_sessionmaker[AsyncSession]]:
+        if not self.enabled:
+            return None
+        try:
+            if await self.redis_client.exists(self._key(user_id)):
+                return None
+        except Exception as e:
+            logger.error(e)
+            return None
+        return self.next_replica()
+
+    @staticmethod
+    def _key(user_id: UUID) -> str:
+        return f"primary-reads:{user_id}"
+
+
+class ReplicaUserGateway(UserGateway):
+    def __init__(
+        self,
+        primary: UserGateway,
+        replica_gateway: Callable[[AsyncSession], UserGateway],
+        replica_router: ReplicaRouter,
+    ):
+        self.primary = primary
+        self.replica_gateway = replica_gateway
+        self.replica_router = replica_router
+
+    async def find_by_login(self, login: str) -> Optional[User]:
+        replica = self.replica_router.next_replica()
+        if replica is not None:
+            async with replica() as session:
+                user = await self.replica_gateway(session).find_by_login(login=login)
+            if user is not None:
+                return user
+        return await self.primary.find_by_login(login=login)
+
+    async def find_by_id(self, user_id: UUID, load_locations: bool = False, for_update: bool = False) -> Optional[User]:
+        return await self.primary.find_by_id(user_id=user_id, load_locations=load_locations, for_update=for_update)
+
+    async def save(self, user: User) -> None:
+        await self.primary.save(user=user)
+
+
+class ReplicaLocationGateway(LocationGateway):
+    def __init__(
+        self,
+        primary: LocationGateway,
+        replica_gateway: Callable[[AsyncSession], LocationGateway],
+        replica_router: ReplicaRouter,
+    ):
+        self.primary = primary
+        self.replica_gateway = replica_gateway
+        self.replica_router = replica_router
+
+    async def save(self, location: Location) -> None:
+        await self.primary.save(location=location)
+
+    async def upsert(self, location: Location) -> Location:
+        return await self.primary.upsert(location=location)
+
+    async def upsert_many(self, new_locations: list[Location]) -> list[Location]:
+        return await self.primary.upsert_many(new_locations=new_locations)
+
+    async def get_by_coords(self, coordinates: Coordinates) -> Optional[Location]:
+        return await self.primary.get_by_coords(coordinates=coordinates)
+
+    async def find_by_user_id(self, user_id: UUID) -> list[UserLocationDTO]:
+        replica = await self.replica_router.replica_for(user_id=user_id)
+        if replica is None:
+            return await self.primary.find_by_user_id(user_id=user_id)
+        async with replica() as session:
+            return await self.replica_gateway(session).find_by_user_id(user_id=user_id)
@@ -1,8 +1,41 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from weather_tracker.config import PostgresConfig
 
+from .instrumentation import InstrumentedAsyncAdaptedQueuePool, PoolInstrumentation
+
+
+def pg_engine(url: str, pg_config: PostgresConfig) -> AsyncEngine:
+    return create_async_engine(
+        url=url,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=pg_config.pool_size,
+        max_overflow=pg_config.max_overflow,
+        pool_timeout=pg_config.pool_timeout,
+        pool_recycle=pg_config.pool_recycle,
+        pool_pre_ping=pg_config.pool_pre_ping,
+        connect_args={"prepared_statement_cache_size": pg_config.statement_cache_size},
+    )
 
-def pg_session_maker(pg_config: PostgresConfig) -> async_sessionmaker[AsyncSession]:
-    engine = create_async_engine(url=pg_config.pg_async_url)
+
+def pg_session_maker(
+    pg_config: PostgresConfig, instrumentation: Optional[PoolInstrumentation] = None
+) -> async_sessionmaker[AsyncSession]:
+    engine = pg_engine(url=pg_config.pg_async_url, pg_config=pg_config)
+    if instrumentation is not None:
+        instrumentation.attach(engine=engine)
     return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def pg_replica_session_makers(
+    pg_config: PostgresConfig, instrumentation_factory: Optional[Callable[[], PoolInstrumentation]] = None
+) -> list[async_sessionmaker[AsyncSession]]:
+    session_makers = []
+    for url in pg_config.pg_replica_async_urls:
+        engine = pg_engine(url=url, pg_config=pg_config)
+        if instrumentation_factory is not None:
+            instrumentation_factory().attach(engine=engine)
+        session_makers.append(async_sessionmaker(engine, expire_on_commit=False))
+    return session_makers
@@ -0,0 +1,89 @@
+import json
+import logging
+import time
+
+from redis.asyncio import Redis
+
+from weather_tracker.application.dto import LocationDTO, UserLocationDTO
+from weather_tracker.application.interfaces import LocationWeatherDTO, WeatherClient
+from weather_tracker.config import OpenWeatherConfig
+from weather_tracker.domain.entities import Location
+from weather_tracker.domain.value_objects import Coordinates
+
+from ..metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+
+def weather_key(coordinates: Coordinates) -> str:
+    return f"weather:{coordinates.latitude_e7}:{coordinates.longitude_e7}"
+
+
+def weather_channel(coordinates: Coordinates) -> str:
+    return f"weather-updates:{coordinates.latitude_e7}:{coordinates.longitude_e7}"
+
+
+def dump_weather(weather: LocationWeatherDTO) -> str:
+    return json.dumps(
+        [
+            weather.country,
+            weather.main_state,
+            weather.temperature,
+            weather.temperature_feels,
+            weather.wind_speed,
+            weather.humidity,
+            weather.observed_at,
+            weather.expires_at,
+        ]
+    )
+
+
+def load_weather(payload: bytes, location: Location | UserLocationDTO) -> LocationWeatherDTO:
+    country, main_state, temperature, temperature_feels, wind_speed, humidity, observed_at, expires_at = json.loads(
+        payload
+    )
+    return LocationWeatherDTO(
+        name=location.name,
+        coordinates=location.coordinates,
+        country=country,
+        main_state=main_state,
+        temperature=temperature,
+        temperature_feels=temperature_feels,
+        wind_speed=wind_speed,
+        humidity=humidity,
+        observed_at=observed_at,
+        expires_at=expires_at,
+    )
+
+
+class CachingWeatherClient(WeatherClient):
+    def __init__(self, weather_client: WeatherClient, redis_client: Redis, config: OpenWeatherConfig):
+        self.weather_client = weather_client
+        self.redis_client = redis_client
+        self.ttl = config.weather_cache_ttl
+
+    async def search_location(self, name: str) -> list[LocationDTO]:
+        return await self.weather_client.search_location(name=name)
+
+    async def get_weather_by_location(self, location: Location | UserLocationDTO) -> LocationWeatherDTO:
+        key = weather_key(location.coordinates)
+        try:
+            payload = await self.redis_client.get(key)
+        except Exception as e:
+            logger.error(e)
+            payload = None
+        record_cache_lookup("weather", hit=payload is not None)
+        if payload is not None:
+            return load_weather(payload, location)
+
+        weather = await self.weather_client.get_weather_by_location(location=location)
+        weather.expires_at = int(time.time()) + self.ttl
+        payload = dump_weather(weather)
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(key, payload, ex=self.ttl)
+                pipe.publish(weather_channel(location.coordinates), payload)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(e)
+        return weather
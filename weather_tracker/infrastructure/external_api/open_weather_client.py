@@ -1,6 +1,6 @@
 import logging
 
-from weather_tracker.application.dto import LocationDTO
+from weather_tracker.application.dto import LocationDTO, UserLocationDTO
 from weather_tracker.application.interfaces import LocationWeatherDTO, WeatherClient
 from weather_tracker.config import OpenWeatherConfig
 from weather_tracker.domain.entities import Location
@@ -41,7 +41,7 @@ class OpenWeatherClient(WeatherClient):
             logger.error(e)
             raise OpenWeatherClientError
 
-    async def get_weather_by_location(self, location: Location) -> LocationWeatherDTO:
+    async def get_weather_by_location(self, location: Location | UserLocationDTO) -> LocationWeatherDTO:
         params = OpenWeatherLocationWeatherRequest(
             lat=location.coordinates.latitude, lon=location.coordinates.longitude, appid=self.config.api_key
         )
@@ -64,6 +64,7 @@ class OpenWeatherClient(WeatherClient):
                 temperature_feels=main_info.get("feels_like"),
                 wind_speed=wind_info.get("speed"),
                 humidity=main_info.get("humidity"),
+                observed_at=response_json.get("dt"),
             )
 
             return weather
@@ -1,15 +1,21 @@
-from typing import Optional
+import asyncio
+import time
+from typing import Callable, Optional, Sequence
 
 import aiohttp
 
+from ..tracing import TRACEPARENT, get_tracer
 from .exceptions import AsyncClientInternalError
 from .interfaces import AsyncHTTPClient
 
+ResponseObserver = Callable[[str, Optional[int], float], None]
+
 
 class AiohttpClient(AsyncHTTPClient):
-    def __init__(self, timeout: float = 60.0):
+    def __init__(self, timeout: float = 60.0, observers: Sequence[ResponseObserver] = ()):
         super().__init__(timeout=timeout)
         self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout))
+        self.observers = tuple(observers)
 
     @staticmethod
     def exception_handler(method):
@@ -21,11 +27,33 @@ class AiohttpClient(AsyncHTTPClient):
 
         return wrapper
 
+    def _observe(self, url: str, status: Optional[int], duration: float) -> None:
+        for observer in self.observers:
+            observer(url, status, duration)
+
     @exception_handler
     async def get(self, url: str, params: Optional[dict]) -> dict | list[dict]:
-        async with self.session.get(url=url, params=params) as resp:
-            resp.raise_for_status()
-            return await resp.json()
+        start = time.perf_counter()
+        status = None
+        with get_tracer().span("HTTP GET", **{"http.method": "GET", "http.url": url}) as span:
+            try:
+                async with self.session.get(url=url, params=params, headers={TRACEPARENT: span.traceparent}) as resp:
+                    status = resp.status
+                    span.set_attribute("http.status_code", status)
+                    resp.raise_for_status()
+                    return await resp.json()
+            finally:
+                self._observe(url, status, time.perf_counter() - start)
+
+    async def warm_up(self, url: str, connections: int = 1) -> None:
+        async def open_connection():
+            async with self.session.head(url) as resp:
+                await resp.read()
+
+        results = await asyncio.gather(*(open_connection() for _ in range(connections)), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                raise AsyncClientInternalError from result
 
     async def close(self):
         await self.session.close()
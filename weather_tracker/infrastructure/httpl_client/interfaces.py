@@ -13,3 +13,6 @@ class AsyncHTTPClient(ABC):
     @abstractmethod
     async def close(self):
         pass
+
+    async def warm_up(self, url: str, connections: int = 1) -> None:
+        pass
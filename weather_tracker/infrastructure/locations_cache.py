@@ -0,0 +1,87 @@
+import json
+import logging
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from weather_tracker.application.dto import CachedUserLocationsDTO, UserLocationDTO
+from weather_tracker.application.interfaces import UserLocationsCache
+from weather_tracker.config import RedisConfig
+from weather_tracker.domain.value_objects import Coordinates
+
+from .metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+
+class RedisUserLocationsCache(UserLocationsCache):
+    def __init__(self, redis_client: Redis, config: RedisConfig):
+        self.redis_client = redis_client
+        self.lifetime = config.locations_cache_lifetime
+        self.version_lifetime = 2 * config.locations_cache_lifetime
+
+    @staticmethod
+    def _payload_key(user_id: UUID) -> str:
+        return f"user-locations:{user_id}"
+
+    @staticmethod
+    def _version_key(user_id: UUID) -> str:
+        return f"user-locations-version:{user_id}"
+
+    @staticmethod
+    def _dump(version: int, locations: list[UserLocationDTO]) -> str:
+        return json.dumps(
+            {
+                "version": version,
+                "locations": [
+                    [str(loc.id), loc.name, loc.coordinates.latitude_e7, loc.coordinates.longitude_e7]
+                    for loc in locations
+                ],
+            }
+        )
+
+    @staticmethod
+    def _load(payload: bytes) -> tuple[int, list[UserLocationDTO]]:
+        data = json.loads(payload)
+        return data["version"], [
+            UserLocationDTO(id=UUID(id_), name=name, coordinates=Coordinates.from_fixed(lat, lon))
+            for id_, name, lat, lon in data["locations"]
+        ]
+
+    async def get(self, user_id: UUID) -> CachedUserLocationsDTO:
+        try:
+            version, payload = await self.redis_client.mget(self._version_key(user_id), self._payload_key(user_id))
+        except Exception as e:
+            logger.error(e)
+            return CachedUserLocationsDTO(version=-1)
+
+        current_version = int(version) if version is not None else 0
+        if payload is not None:
+            payload_version, locations = self._load(payload)
+            if payload_version == current_version:
+                record_cache_lookup("user_locations", hit=True)
+                return CachedUserLocationsDTO(version=current_version, locations=locations)
+        record_cache_lookup("user_locations", hit=False)
+        return CachedUserLocationsDTO(version=current_version)
+
+    async def set(self, user_id: UUID, version: int, locations: list[UserLocationDTO]) -> None:
+        if version < 0:
+            return
+        try:
+            await self.redis_client.set(self._payload_key(user_id), self._dump(version, locations), ex=self.lifetime)
+        except Exception as e:
+            logger.error(e)
+
+    async def invalidate(self, user_id: UUID) -> None:
+        try:
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.incr(self._version_key(user_id))
+                pipe.expire(self._version_key(user_id), self.version_lifetime)
+                pipe.delete(self._payload_key(user_id))
+                await pipe.execute()
+        except Exception as e:
+            logger.error(e)
+            try:
+                await self.redis_client.delete(self._payload_key(user_id))
+            except Exception as e:
+                logger.error(e)
@@ -0,0 +1,189 @@
+import asyncio
+import functools
+import os
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from .database.instrumentation import PoolInstrumentation
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+USE_CASE_DURATION = Histogram(
+    "use_case_duration_seconds",
+    "Use case execution latency.",
+    ["use_case", "method", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "upstream_request_duration_seconds",
+    "Upstream HTTP call latency by endpoint and status class.",
+    ["host", "path", "status_class"],
+    buckets=LATENCY_BUCKETS,
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency.",
+    ["command"],
+    buckets=FAST_BUCKETS,
+)
+POSTGRES_QUERY_DURATION = Histogram(
+    "postgres_query_duration_seconds",
+    "Postgres statement latency by statement type.",
+    ["statement"],
+    buckets=FAST_BUCKETS,
+)
+POSTGRES_POOL_CHECKOUT_WAIT = Histogram(
+    "postgres_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled Postgres connection.",
+    buckets=FAST_BUCKETS,
+)
+CACHE_LOOKUPS = Counter("cache_lookups_total", "Cache lookups by cache and result.", ["cache", "result"])
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between the scheduled and actual wake-up of the event loop probe.",
+    buckets=FAST_BUCKETS,
+)
+EVENT_LOOP_BUSY = Counter("event_loop_busy_seconds_total", "Event loop time spent past the probe's schedule.")
+
+_children: dict[tuple, object] = {}
+
+
+def _child(metric, *labels):
+    key = (metric, labels)
+    child = _children.get(key)
+    if child is None:
+        child = _children[key] = metric.labels(*labels)
+    return child
+
+
+def status_class(status: Optional[int]) -> str:
+    return f"{status // 100}xx" if status else "error"
+
+
+def observe_request(method: str, route: str, status: int, duration: float) -> None:
+    _child(HTTP_REQUEST_DURATION, method, route, str(status)).observe(duration)
+
+
+def observe_upstream(url: str, status: Optional[int], duration: float) -> None:
+    parts = urlsplit(url)
+    _child(UPSTREAM_REQUEST_DURATION, parts.netloc, parts.path, status_class(status)).observe(duration)
+
+
+def observe_redis(command: str, duration: float) -> None:
+    _child(REDIS_COMMAND_DURATION, command).observe(duration)
+
+
+def observe_postgres(statement: str, duration: float) -> None:
+    _child(POSTGRES_QUERY_DURATION, statement).observe(duration)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    _child(CACHE_LOOKUPS, cache, "hit" if hit else "miss").inc()
+
+
+def instrument_pool(instrumentation: PoolInstrumentation) -> None:
+    instrumentation.checkout_hooks.append(POSTGRES_POOL_CHECKOUT_WAIT.observe)
+    instrumentation.query_hooks.append(observe_postgres)
+
+
+def instrument_use_cases(*use_cases: type, methods: tuple[str, ...] = ("execute",)) -> None:
+    for use_case in use_cases:
+        for name in methods:
+            method = use_case.__dict__.get(name)
+            if method is None or getattr(method, "__instrumented__", False):
+                continue
+            setattr(use_case, name, _timed(method, use_case.__name__))
+
+
+def _timed(method, use_case: str):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await method(*args, **kwargs)
+            outcome = "ok"
+            return result
+        finally:
+            _child(USE_CASE_DURATION, use_case, method.__name__, outcome).observe(time.perf_counter() - start)
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error=raise_on_error)
+        finally:
+            observe_redis("PIPELINE", time.perf_counter() - start)
+
+
+class InstrumentedRedis(Redis):
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            observe_redis(str(args[0]).upper(), time.perf_counter() - start)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class EventLoopMonitor:
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._probe())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _probe(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - scheduled, 0.0)
+            EVENT_LOOP_LAG.observe(lag)
+            EVENT_LOOP_BUSY.inc(lag)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,105 @@
+import json
+import logging
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from weather_tracker.application.dto import PopularLocationDTO
+from weather_tracker.application.interfaces import LocationPopularity
+from weather_tracker.domain.entities import Location
+from weather_tracker.domain.value_objects import Coordinates
+
+from .session_gateway import RedisInternalError
+
+logger = logging.getLogger(__name__)
+
+
+class RedisLocationPopularity(LocationPopularity):
+    scores_key = "location-popularity"
+    info_key = "location-popularity-info"
+
+    def __init__(self, redis_client: Redis):
+        self.redis_client = redis_client
+
+    @staticmethod
+    def _info(location: Location | PopularLocationDTO) -> str:
+        return json.dumps([location.name, location.coordinates.latitude_e7, location.coordinates.longitude_e7])
+
+    async def record(self, added: list[Location], removed: list[Location]) -> None:
+        if not added and not removed:
+            return
+        try:
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                for location in added:
+                    pipe.zincrby(self.scores_key, 1, str(location.id))
+                    pipe.hset(self.info_key, str(location.id), self._info(location))
+                for location in removed:
+                    pipe.zincrby(self.scores_key, -1, str(location.id))
+                pipe.zremrangebyscore(self.scores_key, "-inf", 0)
+                results = await pipe.execute()
+            scores = results[2 * len(added) : 2 * len(added) + len(removed)]
+            dropped = [str(location.id) for location, score in zip(removed, scores) if score <= 0]
+            if dropped:
+                await self._drop_info(dropped)
+        except Exception as e:
+            logger.error(e)
+
+    async def _drop_info(self, ids: list[str]) -> None:
+        async def drop(pipe) -> None:
+            scores = await pipe.zmscore(self.scores_key, ids)
+            stale = [id_ for id_, score in zip(ids, scores) if score is None or score <= 0]
+            pipe.multi()
+            if stale:
+                pipe.hdel(self.info_key, *stale)
+
+        await self.redis_client.transaction(drop, self.scores_key)
+
+    async def rebuild(self, locations: list[PopularLocationDTO]) -> None:
+        scores_key, info_key = f"{self.scores_key}:rebuild", f"{self.info_key}:rebuild"
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.delete(scores_key, info_key)
+            if locations:
+                pipe.zadd(scores_key, {str(loc.id): loc.subscribers for loc in locations})
+                pipe.hset(info_key, mapping={str(loc.id): self._info(loc) for loc in locations})
+                pipe.rename(scores_key, self.scores_key)
+                pipe.rename(info_key, self.info_key)
+            else:
+                pipe.delete(self.scores_key, self.info_key)
+            await pipe.execute()
+
+    async def forget(self, location_ids: list[UUID]) -> None:
+        if not location_ids:
+            return
+        ids = [str(id_) for id_ in location_ids]
+        try:
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.zrem(self.scores_key, *ids)
+                pipe.hdel(self.info_key, *ids)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(e)
+
+    async def top(self, limit: int) -> list[PopularLocationDTO]:
+        try:
+            scores = await self.redis_client.zrevrange(self.scores_key, 0, limit - 1, withscores=True)
+            if not scores:
+                return []
+            info = await self.redis_client.hmget(self.info_key, [id_ for id_, _ in scores])
+        except Exception as e:
+            logger.error(e)
+            raise RedisInternalError
+
+        output = []
+        for (id_, score), payload in zip(scores, info):
+            if payload is None:
+                continue
+            name, latitude, longitude = json.loads(payload)
+            output.append(
+                PopularLocationDTO(
+                    id=UUID(id_.decode()),
+                    name=name,
+                    coordinates=Coordinates.from_fixed(latitude, longitude),
+                    subscribers=int(score),
+                )
+            )
+        return output
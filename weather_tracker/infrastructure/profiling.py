@@ -0,0 +1,67 @@
+import hashlib
+import hmac
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+except ImportError:
+    Profiler = None
+
+PROFILE_HEADER = "x-profile"
+PROFILE_FILE_HEADER = "x-profile-file"
+
+_SUFFIXES = {"speedscope": ".speedscope.json", "html": ".html"}
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def profiling_available() -> bool:
+    return Profiler is not None
+
+
+def _signature(secret: str, path: str, expires: int) -> str:
+    return hmac.new(secret.encode(), f"{path}:{expires}".encode(), hashlib.sha256).hexdigest()
+
+
+def sign_profile_token(secret: str, path: str, expires: int) -> str:
+    return f"{expires}.{_signature(secret, path, expires)}"
+
+
+def verify_profile_token(secret: str, path: str, token: str, now: Optional[float] = None) -> bool:
+    expires, _, signature = token.partition(".")
+    try:
+        expires_at = int(expires)
+    except ValueError:
+        return False
+    if expires_at < (time.time() if now is None else now):
+        return False
+    return hmac.compare_digest(signature, _signature(secret, path, expires_at))
+
+
+def profile_name(*parts: str) -> str:
+    label = "-".join(_UNSAFE_CHARS.sub("_", part).strip("_") for part in parts if part)
+    return f"{time.strftime('%Y%m%dT%H%M%S')}-{label}-{uuid.uuid4().hex[:8]}"
+
+
+def profile_filename(name: str, output_format: str = "speedscope") -> str:
+    return f"{name}{_SUFFIXES[output_format]}"
+
+
+def start_profiler(interval: float = 0.001):
+    if Profiler is None:
+        raise RuntimeError("pyinstrument is not installed")
+    profiler = Profiler(interval=interval, async_mode="enabled")
+    profiler.start()
+    return profiler
+
+
+def write_profile(profiler, directory: str, name: str, output_format: str = "speedscope") -> Path:
+    renderer = SpeedscopeRenderer() if output_format == "speedscope" else HTMLRenderer()
+    path = Path(directory) / profile_filename(name, output_format)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(profiler.output(renderer), encoding="utf-8")
+    return path
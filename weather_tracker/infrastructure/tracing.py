@@ -0,0 +1,266 @@
+import functools
+import inspect
+import json
+import logging
+import queue
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import NamedTuple, Optional
+
+from weather_tracker.config import TracingConfig
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT = "traceparent"
+TRACERESPONSE = "traceresponse"
+
+_TRACEPARENT_RE = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class SpanContext(NamedTuple):
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    sampled: bool
+    start: float = field(default_factory=time.time)
+    duration: Optional[float] = None
+    status: str = "ok"
+    attributes: dict = field(default_factory=dict)
+
+    @property
+    def context(self) -> SpanContext:
+        return SpanContext(self.trace_id, self.span_id, self.sampled)
+
+    @property
+    def traceparent(self) -> str:
+        return format_traceparent(self.context)
+
+    def set_attribute(self, key: str, value) -> None:
+        if self.sampled:
+            self.attributes[key] = value
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+def format_traceparent(context: SpanContext) -> str:
+    return f"00-{context.trace_id}-{context.span_id}-{'01' if context.sampled else '00'}"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[SpanContext]:
+    if not value:
+        return None
+    match = _TRACEPARENT_RE.match(value.strip().lower())
+    if match is None:
+        return None
+    version, trace_id, span_id, flags = match.groups()
+    if version == "ff" or trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return SpanContext(trace_id, span_id, bool(int(flags, 16) & 1))
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits) or 1:0{bits // 4}x}"
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    def __init__(self, filename: str, batch_size: int = 64):
+        self.filename = filename
+        self.batch_size = batch_size
+        self._buffer: list[str] = []
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+
+    def export(self, span: Span) -> None:
+        self._buffer.append(json.dumps(span.to_dict(), default=str))
+        if len(self._buffer) >= self.batch_size:
+            self._submit()
+
+    def _submit(self) -> None:
+        if not self._buffer:
+            return
+        lines, self._buffer = self._buffer, []
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+            self._writer.start()
+        self._queue.put(lines)
+
+    def _run(self) -> None:
+        while (lines := self._queue.get()) is not None:
+            self._write(lines)
+
+    def _write(self, lines: list[str]) -> None:
+        try:
+            with open(self.filename, "a", encoding="utf-8") as file:
+                file.write("\n".join(lines) + "\n")
+        except OSError as e:
+            logger.error(e)
+
+    def flush(self) -> None:
+        self._submit()
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+class _SpanScope:
+    __slots__ = ("tracer", "span", "token", "start")
+
+    def __init__(self, tracer: "Tracer", span: Span):
+        self.tracer = tracer
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        self.start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        span = self.span
+        span.duration = time.perf_counter() - self.start
+        _current_span.reset(self.token)
+        if exc_type is not None:
+            span.status = "error"
+            span.set_attribute("error.type", exc_type.__name__)
+        if span.sampled:
+            self.tracer.export(span)
+
+
+class _UnsampledScope:
+    __slots__ = ("span",)
+
+    def __init__(self, span: Span):
+        self.span = span
+
+    def __enter__(self) -> Span:
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+class Tracer:
+    def __init__(self, exporter: Optional[SpanExporter] = None, sample_rate: float = 0.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate if exporter is not None else 0.0
+
+    def _should_sample(self) -> bool:
+        return self.sample_rate >= 1.0 or (self.sample_rate > 0.0 and random.random() < self.sample_rate)
+
+    def resample(self, parent: SpanContext) -> SpanContext:
+        return parent._replace(sampled=self._should_sample())
+
+    def span(self, name: str, parent: Optional[SpanContext] = None, **attributes) -> _SpanScope | _UnsampledScope:
+        if parent is None:
+            current = _current_span.get()
+            if current is not None and not current.sampled:
+                return _UnsampledScope(current)
+            parent = current.context if current is not None else None
+        if parent is None:
+            span = Span(name, _new_id(128), _new_id(64), None, self._should_sample())
+        else:
+            span = Span(name, parent.trace_id, _new_id(64), parent.span_id, parent.sampled)
+        if span.sampled:
+            span.attributes.update(attributes)
+        return _SpanScope(self, span)
+
+    def export(self, span: Span) -> None:
+        if self.exporter is None:
+            return
+        try:
+            self.exporter.export(span)
+        except Exception as e:
+            logger.error(e)
+
+    def flush(self) -> None:
+        if self.exporter is not None:
+            self.exporter.flush()
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+
+def tracer_from_config(config: TracingConfig) -> Tracer:
+    if config.exporter == "file":
+        return Tracer(exporter=JsonLinesSpanExporter(config.filename), sample_rate=config.sample_rate)
+    return Tracer()
+
+
+def trace_classes(*classes: type) -> None:
+    for cls in classes:
+        for name, method in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.iscoroutinefunction(method):
+                continue
+            if getattr(method, "__traced__", False):
+                continue
+            setattr(cls, name, _traced(method, f"{cls.__name__}.{name}"))
+
+
+def _traced(method, span_name: str):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        with _tracer.span(span_name):
+            return await method(*args, **kwargs)
+
+    wrapper.__traced__ = True
+    return wrapper
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from typing import Optional
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+
+from weather_tracker.application.dto import LocationWeatherDTO, UserLocationDTO
+from weather_tracker.application.interfaces import WeatherSubscription, WeatherUpdates
+
+from .external_api.caching_weather_client import load_weather, weather_channel
+
+logger = logging.getLogger(__name__)
+
+
+class RedisWeatherSubscription(WeatherSubscription):
+    def __init__(self, hub: "RedisWeatherUpdatesHub", locations: list[UserLocationDTO]):
+        self.hub = hub
+        self.locations = {weather_channel(loc.coordinates): loc for loc in locations}
+        self._latest: dict[str, bytes] = {}
+        self._ready = asyncio.Event()
+
+    def offer(self, channel: str, payload: bytes) -> None:
+        self._latest[channel] = payload
+        self._ready.set()
+
+    async def next_updates(self) -> list[LocationWeatherDTO]:
+        await self._ready.wait()
+        self._ready.clear()
+        latest, self._latest = self._latest, {}
+        return [load_weather(payload, self.locations[channel]) for channel, payload in latest.items()]
+
+    async def close(self) -> None:
+        await self.hub.unsubscribe(self)
+
+
+class RedisWeatherUpdatesHub(WeatherUpdates):
+    def __init__(self, redis_client: Redis, poll_timeout: float = 1.0):
+        self.redis_client = redis_client
+        self.poll_timeout = poll_timeout
+        self._pubsub: Optional[PubSub] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._subscribers: dict[str, set[RedisWeatherSubscription]] = {}
+        self._lock = asyncio.Lock()
+
+    async def subscribe(self, locations: list[UserLocationDTO]) -> RedisWeatherSubscription:
+        subscription = RedisWeatherSubscription(hub=self, locations=locations)
+        async with self._lock:
+            new_channels = [channel for channel in subscription.locations if channel not in self._subscribers]
+            for channel in subscription.locations:
+                self._subscribers.setdefault(channel, set()).add(subscription)
+            if new_channels:
+                if self._pubsub is None:
+                    self._pubsub = self.redis_client.pubsub()
+                await self._pubsub.subscribe(*new_channels)
+            if self._reader is None and self._pubsub is not None:
+                self._reader = asyncio.create_task(self._read())
+        return subscription
+
+    async def unsubscribe(self, subscription: RedisWeatherSubscription) -> None:
+        async with self._lock:
+            idle_channels = []
+            for channel in subscription.locations:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[channel]
+                    idle_channels.append(channel)
+            if idle_channels and self._pubsub is not None:
+                try:
+                    await self._pubsub.unsubscribe(*idle_channels)
+                except Exception as e:
+                    logger.error(e)
+
+    @property
+    def channels(self) -> int:
+        return len(self._subscribers)
+
+    async def _read(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=self.poll_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(e)
+                await asyncio.sleep(self.poll_timeout)
+                continue
+            if message is None or message["type"] != "message":
+                continue
+            channel = message["channel"].decode()
+            for subscription in tuple(self._subscribers.get(channel, ())):
+                subscription.offer(channel, message["data"])
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        self._subscribers.clear()
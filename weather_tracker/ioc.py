@@ -5,33 +5,67 @@ from dishka import AnyOf, Provider, Scope, from_context, provide
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from weather_tracker.application.dto import LocationLimits
 from weather_tracker.application.interfaces import (
     DBSession,
     Hasher,
     LocationGateway,
+    LocationPopularity,
     UserGateway,
+    UserLocationsCache,
     UserSessionGateway,
     WeatherClient,
+    WeatherUpdates,
 )
 from weather_tracker.application.use_cases import (
     AddUserLocation,
+    BatchUpdateUserLocations,
+    GetPopularLocations,
     GetUserLocations,
     LoginUser,
     LogoutUser,
     RegisterUser,
     RemoveUserLocation,
     SearchLocation,
+    SubscribeWeatherUpdates,
 )
 from weather_tracker.config import Config
+from weather_tracker.infrastructure.database.core_gateways import PgCoreLocationGateway, PgCoreUserGateway
 from weather_tracker.infrastructure.database.gateways import PgOrmLocationGateway, PgOrmUserGateway
-from weather_tracker.infrastructure.database.session import pg_session_maker
+from weather_tracker.infrastructure.database.instrumentation import PoolInstrumentation
+from weather_tracker.infrastructure.database.replicas import (
+    ReplicaLocationGateway,
+    ReplicaRouter,
+    ReplicaUserGateway,
+)
+from weather_tracker.infrastructure.database.session import pg_replica_session_makers, pg_session_maker
+from weather_tracker.infrastructure.external_api.caching_weather_client import CachingWeatherClient
 from weather_tracker.infrastructure.external_api.open_weather_client import OpenWeatherClient
 from weather_tracker.infrastructure.hash_service import BcryptHasher
 from weather_tracker.infrastructure.httpl_client.aiohttp_client import (
     AiohttpClient,
     AsyncHTTPClient,
 )
+from weather_tracker.infrastructure.locations_cache import RedisUserLocationsCache
+from weather_tracker.infrastructure.metrics import InstrumentedRedis, instrument_pool, observe_upstream
+from weather_tracker.infrastructure.popularity import RedisLocationPopularity
 from weather_tracker.infrastructure.session_gateway import RedisUserSessionGateway
+from weather_tracker.infrastructure.weather_updates import RedisWeatherUpdatesHub
+
+USER_GATEWAYS: dict[str, type[PgOrmUserGateway] | type[PgCoreUserGateway]] = {
+    "orm": PgOrmUserGateway,
+    "core": PgCoreUserGateway,
+}
+LOCATION_GATEWAYS: dict[str, type[PgOrmLocationGateway] | type[PgCoreLocationGateway]] = {
+    "orm": PgOrmLocationGateway,
+    "core": PgCoreLocationGateway,
+}
+
+
+def instrumented_pool() -> PoolInstrumentation:
+    instrumentation = PoolInstrumentation()
+    instrument_pool(instrumentation)
+    return instrumentation
 
 
 class AppProvider(Provider):
@@ -39,7 +73,7 @@ class AppProvider(Provider):
 
     @provide(scope=Scope.APP)
     async def get_redis(self, config: Config) -> AsyncIterable[Redis]:
-        redis = Redis(host=config.redis.host, port=config.redis.port)
+        redis = InstrumentedRedis(host=config.redis.host, port=config.redis.port)
         try:
             yield redis
         finally:
@@ -47,19 +81,44 @@ class AppProvider(Provider):
 
     @provide(scope=Scope.APP)
     async def get_async_http_client(self) -> AsyncIterable[AsyncHTTPClient]:
-        client = AiohttpClient(timeout=60)
+        client = AiohttpClient(timeout=60, observers=[observe_upstream])
         try:
             yield client
         finally:
             await client.close()
 
     @provide(scope=Scope.APP)
-    def get_weather_client(self, http_client: AsyncHTTPClient, config: Config) -> WeatherClient:
-        return OpenWeatherClient(async_http_client=http_client, config=config.open_weather)
+    def get_weather_client(self, http_client: AsyncHTTPClient, redis_client: Redis, config: Config) -> WeatherClient:
+        return CachingWeatherClient(
+            weather_client=OpenWeatherClient(async_http_client=http_client, config=config.open_weather),
+            redis_client=redis_client,
+            config=config.open_weather,
+        )
 
     @provide(scope=Scope.APP)
-    def get_session_maker(self, config: Config) -> async_sessionmaker[AsyncSession]:
-        return pg_session_maker(pg_config=config.postgres)
+    def get_pool_instrumentation(self) -> PoolInstrumentation:
+        return instrumented_pool()
+
+    @provide(scope=Scope.APP)
+    async def get_session_maker(
+        self, config: Config, instrumentation: PoolInstrumentation
+    ) -> AsyncIterable[async_sessionmaker[AsyncSession]]:
+        session_maker = pg_session_maker(pg_config=config.postgres, instrumentation=instrumentation)
+        try:
+            yield session_maker
+        finally:
+            await session_maker.kw["bind"].dispose()
+
+    @provide(scope=Scope.APP)
+    async def get_replica_router(self, config: Config, redis_client: Redis) -> AsyncIterable[ReplicaRouter]:
+        replicas = pg_replica_session_makers(pg_config=config.postgres, instrumentation_factory=instrumented_pool)
+        try:
+            yield ReplicaRouter(
+                replicas=replicas, redis_client=redis_client, sticky_sec=config.postgres.replica_sticky_sec
+            )
+        finally:
+            for replica in replicas:
+                await replica.kw["bind"].dispose()
 
     @provide(scope=Scope.REQUEST)
     async def get_session(
@@ -69,12 +128,12 @@ class AppProvider(Provider):
             yield session
 
     @provide(scope=Scope.REQUEST)
-    def get_user_gateway(self, session: AsyncSession) -> UserGateway:
-        return PgOrmUserGateway(session=session)
+    def get_user_gateway(self, session: AsyncSession, replica_router: ReplicaRouter, config: Config) -> UserGateway:
+        return USER_GATEWAYS[config.postgres.gateways](session=session, replica_router=replica_router)
 
     @provide(scope=Scope.REQUEST)
-    def get_location_gateway(self, session: AsyncSession) -> LocationGateway:
-        return PgOrmLocationGateway(session=session)
+    def get_location_gateway(self, session: AsyncSession, config: Config) -> LocationGateway:
+        return LOCATION_GATEWAYS[config.postgres.gateways](session=session)
 
     @provide(scope=Scope.APP)
     def get_hasher(self) -> Hasher:
@@ -84,10 +143,80 @@ class AppProvider(Provider):
     def get_user_session_gateway(self, redis_client: Redis, config: Config) -> UserSessionGateway:
         return RedisUserSessionGateway(redis_client=redis_client, config=config.redis)
 
+    @provide(scope=Scope.APP)
+    def get_locations_cache(self, redis_client: Redis, config: Config) -> UserLocationsCache:
+        return RedisUserLocationsCache(redis_client=redis_client, config=config.redis)
+
+    @provide(scope=Scope.APP)
+    def get_location_popularity(self, redis_client: Redis) -> LocationPopularity:
+        return RedisLocationPopularity(redis_client=redis_client)
+
+    @provide(scope=Scope.APP)
+    async def get_weather_updates(self, redis_client: Redis) -> AsyncIterable[WeatherUpdates]:
+        hub = RedisWeatherUpdatesHub(redis_client=redis_client)
+        try:
+            yield hub
+        finally:
+            await hub.close()
+
+    @provide(scope=Scope.APP)
+    def get_location_limits(self, config: Config) -> LocationLimits:
+        return LocationLimits(
+            max_per_user=config.locations.max_per_user,
+            page_size=config.locations.page_size,
+            max_page_size=config.locations.max_page_size,
+            stream_concurrency=config.locations.stream_concurrency,
+        )
+
+    @provide(scope=Scope.REQUEST)
+    def get_login_user(
+        self,
+        user_gateway: UserGateway,
+        replica_router: ReplicaRouter,
+        config: Config,
+        hasher: Hasher,
+        user_session_gateway: UserSessionGateway,
+    ) -> LoginUser:
+        gateway_class = USER_GATEWAYS[config.postgres.gateways]
+        return LoginUser(
+            user_gateway=ReplicaUserGateway(
+                primary=user_gateway,
+                replica_gateway=lambda session: gateway_class(session=session),
+                replica_router=replica_router,
+            ),
+            hasher=hasher,
+            user_session_gateway=user_session_gateway,
+        )
+
+    @provide(scope=Scope.REQUEST)
+    def get_user_locations(
+        self,
+        location_gateway: LocationGateway,
+        replica_router: ReplicaRouter,
+        config: Config,
+        user_session_gateway: UserSessionGateway,
+        weather_client: WeatherClient,
+        locations_cache: UserLocationsCache,
+        limits: LocationLimits,
+    ) -> GetUserLocations:
+        gateway_class = LOCATION_GATEWAYS[config.postgres.gateways]
+        return GetUserLocations(
+            location_gateway=ReplicaLocationGateway(
+                primary=location_gateway,
+                replica_gateway=lambda session: gateway_class(session=session),
+                replica_router=replica_router,
+            ),
+            user_session_gateway=user_session_gateway,
+            weather_client=weather_client,
+            locations_cache=locations_cache,
+            limits=limits,
+        )
+
     register_user = provide(RegisterUser, scope=Scope.REQUEST)
-    login_user = provide(LoginUser, scope=Scope.REQUEST)
     logout_user = provide(LogoutUser, scope=Scope.REQUEST)
     search_location = provide(SearchLocation, scope=Scope.REQUEST)
     add_location = provide(AddUserLocation, scope=Scope.REQUEST)
     remove_location = provide(RemoveUserLocation, scope=Scope.REQUEST)
-    get_locations = provide(GetUserLocations, scope=Scope.REQUEST)
+    batch_update_locations = provide(BatchUpdateUserLocations, scope=Scope.REQUEST)
+    get_popular_locations = provide(GetPopularLocations, scope=Scope.REQUEST)
+    subscribe_weather_updates = provide(SubscribeWeatherUpdates, scope=Scope.REQUEST)
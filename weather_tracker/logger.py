@@ -1,28 +1,76 @@
+import atexit
+import json
 import logging
-from logging import FileHandler
-
-
-class OverWritingFileHandler(FileHandler):
-    def __init__(self, filename, max_bytes):
-        super().__init__(filename=filename, mode="w")
-        self.max_bytes = max_bytes
-
-    def emit(self, record):
-        if self.stream.tell() >= self.max_bytes:
-            self.stream.seek(0)
-            self.stream.truncate()
-        super().emit(record=record)
-
-
-def setup_package_logger():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(levelname)s - %(asctime)s - [%(name)s] - %(message)s",
-        datefmt="%Y-%m-%d %H:%M",
-        handlers=[
-            OverWritingFileHandler(
-                filename="weather.log",
-                max_bytes=5 * 1024 * 1024,
-            )
-        ],
-    )
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from typing import Optional
+
+from weather_tracker.config import LoggingConfig
+
+LOG_FORMAT = "%(levelname)s - %(asctime)s - [%(name)s] - %(message)s"
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def build_file_handler(config: LoggingConfig) -> logging.Handler:
+    handler: logging.Handler
+    if config.rotate_when:
+        handler = TimedRotatingFileHandler(
+            filename=config.filename, when=config.rotate_when, backupCount=config.backup_count, encoding="utf-8"
+        )
+    else:
+        handler = RotatingFileHandler(
+            filename=config.filename, maxBytes=config.max_bytes, backupCount=config.backup_count, encoding="utf-8"
+        )
+    if config.json_format:
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(fmt=LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+    return handler
+
+
+def stop_package_logger():
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def setup_package_logger(config: Optional[LoggingConfig] = None):
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+    config = config or LoggingConfig()
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, build_file_handler(config=config), respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_package_logger)
+
+    _queue_handler = QueueHandler(log_queue)
+    root = logging.getLogger()
+    root.setLevel(config.level)
+    root.addHandler(_queue_handler)
@@ -2,6 +2,7 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
 from weather_tracker.application.exceptions import (
+    InvalidCursorError,
     LoginRequirementError,
     PasswordRequirementError,
     UserAlreadyExistsError,
@@ -36,3 +37,4 @@ def register_exception_handlers(app: FastAPI):
     app.add_exception_handler(UserLocationError, ExceptionResponseFactory(400))
     app.add_exception_handler(RedisInternalError, ExceptionResponseFactory(500))
     app.add_exception_handler(SessionNotFoundError, ExceptionResponseFactory(401))
+    app.add_exception_handler(InvalidCursorError, ExceptionResponseFactory(400))
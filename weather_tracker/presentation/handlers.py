@@ -1,33 +1,62 @@
+import asyncio
 import logging
-from typing import Annotated
+from typing import Annotated, Optional
 
 from dishka.integrations.fastapi import FromDishka, inject
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.types import Receive, Scope, Send
 
-from weather_tracker.application.dto import LocationAddInput, LoginUserInput, RegisterUserInput
+from weather_tracker.application.dto import LocationAddInput, LocationsBatchInput, LoginUserInput, RegisterUserInput
+from weather_tracker.application.interfaces import WeatherSubscription
 from weather_tracker.application.use_cases import (
     AddUserLocation,
+    BatchUpdateUserLocations,
+    GetPopularLocations,
     GetUserLocations,
     LoginUser,
     LogoutUser,
     RegisterUser,
     RemoveUserLocation,
     SearchLocation,
+    SubscribeWeatherUpdates,
 )
+from weather_tracker.config import Config
 from weather_tracker.domain.value_objects import Coordinates
 
+from .http_cache import etag_matches, make_etag, preferred_media_type
 from .schemas import (
+    LocationBatchResultResponse,
     LocationRequest,
     LocationResponse,
+    LocationsBatchRequest,
+    PopularLocationResponse,
     UserLoginRequest,
     UserRegisterRequest,
     WeatherResponse,
+    dump_weather,
+    dump_weather_list,
 )
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_KEEPALIVE_SEC = 15
+
+
+class SubscriptionStreamingResponse(StreamingResponse):
+    def __init__(self, content, subscription: WeatherSubscription, **kwargs):
+        super().__init__(content, **kwargs)
+        self.subscription = subscription
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.subscription.close()
+
 
 def get_session_id(request: Request) -> str:
     if not request.cookies.get("session_id", False):
@@ -63,19 +92,110 @@ async def logout_user_api(user_case: FromDishka[LogoutUser], session_id: str = D
 @router.get("/locations")
 @inject
 async def locations_api(
-    use_case: FromDishka[GetUserLocations], session_id: str = Depends(get_session_id)
+    use_case: FromDishka[GetUserLocations],
+    session_id: str = Depends(get_session_id),
+    cursor: Optional[str] = None,
+    limit: Annotated[Optional[int], Query(ge=1)] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+    accept: Annotated[Optional[str], Header()] = None,
+    stream: bool = False,
 ) -> list[WeatherResponse]:
-    locations = await use_case.execute(session_id=session_id)
-    weather = [WeatherResponse(**loc.to_dict()) for loc in locations]
-    return weather
+    if stream or preferred_media_type(accept, (JSON_MEDIA_TYPE, NDJSON_MEDIA_TYPE)) == NDJSON_MEDIA_TYPE:
+        return await stream_locations(use_case=use_case, session_id=session_id, cursor=cursor, limit=limit)
+
+    page = await use_case.execute(session_id=session_id, cursor=cursor, limit=limit)
+    headers = {"Cache-Control": "private, no-cache", "Vary": "Accept"}
+    if page.next_cursor is not None:
+        headers["X-Next-Cursor"] = page.next_cursor
+    if page.version is not None and page.version >= 0:
+        headers["ETag"] = make_etag(
+            page.version,
+            cursor,
+            limit,
+            [
+                (loc.name, loc.coordinates.latitude_e7, loc.coordinates.longitude_e7, loc.observed_at)
+                for loc in page.items
+            ],
+        )
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+    return Response(content=dump_weather_list(page.items), media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+async def stream_locations(
+    use_case: GetUserLocations, session_id: str, cursor: Optional[str], limit: Optional[int]
+) -> StreamingResponse:
+    page = await use_case.execute_stream(session_id=session_id, cursor=cursor, limit=limit)
+
+    async def lines():
+        async for loc in page.items:
+            yield dump_weather(loc) + b"\n"
+
+    headers = {"Cache-Control": "no-store", "Vary": "Accept", "X-Accel-Buffering": "no"}
+    if page.next_cursor is not None:
+        headers["X-Next-Cursor"] = page.next_cursor
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+
+@router.get("/locations/events")
+@inject
+async def locations_events_api(
+    use_case: FromDishka[SubscribeWeatherUpdates], session_id: str = Depends(get_session_id)
+) -> StreamingResponse:
+    subscription = await use_case.execute(session_id=session_id)
+
+    async def events():
+        yield b": subscribed\n\n"
+        while True:
+            try:
+                updates = await asyncio.wait_for(subscription.next_updates(), timeout=SSE_KEEPALIVE_SEC)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            for loc in updates:
+                yield b"event: weather\ndata: " + dump_weather(loc) + b"\n\n"
+
+    headers = {"Cache-Control": "no-store", "X-Accel-Buffering": "no"}
+    return SubscriptionStreamingResponse(
+        events(), subscription=subscription, media_type="text/event-stream", headers=headers
+    )
+
+
+@router.get("/locations/popular")
+@inject
+async def popular_locations_api(
+    use_case: FromDishka[GetPopularLocations],
+    session_id: str = Depends(get_session_id),
+    limit: Annotated[Optional[int], Query(ge=1)] = None,
+) -> list[PopularLocationResponse]:
+    locations = await use_case.execute(session_id=session_id, limit=limit)
+    return [PopularLocationResponse(**loc.to_dict()) for loc in locations]
 
 
 @router.get("/search")
 @inject
-async def location_search_api(location_name: str, use_case: FromDishka[SearchLocation]) -> list[LocationResponse]:
+async def location_search_api(
+    location_name: str,
+    response: Response,
+    use_case: FromDishka[SearchLocation],
+    config: FromDishka[Config],
+    if_none_match: Annotated[Optional[str], Header()] = None,
+) -> list[LocationResponse]:
     locations = await use_case.execute(location_name=location_name)
-    response = [LocationResponse(**loc.to_dict()) for loc in locations]
-    return response
+    headers = {
+        "Cache-Control": f"public, max-age={config.open_weather.search_max_age}",
+        "ETag": make_etag(
+            location_name,
+            [
+                (loc.name, loc.coordinates.latitude_e7, loc.coordinates.longitude_e7, loc.country, loc.state)
+                for loc in locations
+            ],
+        ),
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return [LocationResponse(**loc.to_dict()) for loc in locations]
 
 
 @router.post("/search")
@@ -92,6 +212,29 @@ async def location_add_api(
     return Response(status_code=200)
 
 
+@router.post("/locations/batch")
+@inject
+async def locations_batch_api(
+    data: LocationsBatchRequest,
+    use_case: FromDishka[BatchUpdateUserLocations],
+    session_id: str = Depends(get_session_id),
+) -> list[LocationBatchResultResponse]:
+    results = await use_case.execute(
+        session_id=session_id,
+        batch=LocationsBatchInput(
+            add=[
+                LocationAddInput(name=loc.name, coordinates=Coordinates(latitude=loc.latitude, longitude=loc.longitude))
+                for loc in data.add
+            ],
+            remove=[
+                LocationAddInput(name=loc.name, coordinates=Coordinates(latitude=loc.latitude, longitude=loc.longitude))
+                for loc in data.remove
+            ],
+        ),
+    )
+    return [LocationBatchResultResponse(**result.to_dict()) for result in results]
+
+
 @router.delete("/")
 @inject
 async def location_delete_api(
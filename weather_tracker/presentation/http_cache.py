@@ -0,0 +1,62 @@
+import hashlib
+from typing import Optional, Sequence
+
+
+def make_etag(*parts) -> str:
+    return f'"{hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def _media_ranges(accept: str) -> list[tuple[str, str, float]]:
+    ranges = []
+    for item in accept.split(","):
+        media_range, *params = (part.strip() for part in item.split(";"))
+        main_type, _, subtype = media_range.lower().partition("/")
+        if not main_type or not subtype:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = -1.0
+        if 0.0 <= quality <= 1.0:
+            ranges.append((main_type, subtype, quality))
+    return ranges
+
+
+def _quality(ranges: list[tuple[str, str, float]], media_type: str) -> float:
+    main_type, _, subtype = media_type.partition("/")
+    best_specificity, quality = -1, 0.0
+    for range_type, range_subtype, range_quality in ranges:
+        if range_type == main_type and range_subtype == subtype:
+            specificity = 2
+        elif range_type == main_type and range_subtype == "*":
+            specificity = 1
+        elif range_type == "*" and range_subtype == "*":
+            specificity = 0
+        else:
+            continue
+        if specificity > best_specificity:
+            best_specificity, quality = specificity, range_quality
+    return quality
+
+
+def preferred_media_type(accept: Optional[str], offered: Sequence[str]) -> Optional[str]:
+    if not accept:
+        return offered[0] if offered else None
+    ranges = _media_ranges(accept)
+    best, best_quality = None, 0.0
+    for media_type in offered:
+        quality = _quality(ranges, media_type)
+        if quality > best_quality:
+            best, best_quality = media_type, quality
+    return best
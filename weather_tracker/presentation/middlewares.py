@@ -1,21 +1,122 @@
 import logging
+import time
+from typing import Callable, Optional, Sequence
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from weather_tracker.config import CompressionConfig, ProfilingConfig, TracingConfig
+from weather_tracker.infrastructure.profiling import profiling_available
+from weather_tracker.infrastructure.tracing import TRACEPARENT, TRACERESPONSE, get_tracer, parse_traceparent
+
+from .compression import CompressionMiddleware
+from .profiling import ProfilingMiddleware
 
 logger = logging.getLogger(__name__)
 
+UNMATCHED_ROUTE = "<unmatched>"
+
+RequestObserver = Callable[[str, str, int, float], None]
+
+
+class RequestLoggerMiddleware:
+    def __init__(self, app: ASGIApp, observers: Sequence[RequestObserver] = ()):
+        self.app = app
+        self.observers = tuple(observers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            route = scope.get("route")
+            route_path = route.path if route is not None else UNMATCHED_ROUTE
+            logger.info(
+                "%s %s %s %d %.1fms",
+                scope["method"],
+                route_path,
+                scope["path"],
+                status_code,
+                duration * 1000,
+            )
+            for observer in self.observers:
+                try:
+                    observer(scope["method"], route_path, status_code, duration)
+                except Exception as e:
+                    logger.error(e)
 
-class RequestLoggerMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        logger.info(request.url)
-        return await call_next(request)
 
+class TracingMiddleware:
+    def __init__(self, app: ASGIApp, trust_parent: bool = False):
+        self.app = app
+        self.trust_parent = trust_parent
 
-def register_middlewares(app: FastAPI):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        parent = None
+        for name, value in scope["headers"]:
+            if name == TRACEPARENT.encode():
+                parent = parse_traceparent(value.decode("latin-1"))
+                break
+
+        tracer = get_tracer()
+        if parent is not None and not self.trust_parent:
+            parent = tracer.resample(parent)
+        method = scope["method"]
+        with tracer.span(f"{method} {UNMATCHED_ROUTE}", parent=parent, **{"http.method": method}) as span:
+
+            async def send_with_trace(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.status = "error"
+                    if span.sampled:
+                        MutableHeaders(scope=message).append(TRACERESPONSE, span.traceparent)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_trace)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.name = f"{method} {route.path}"
+                    span.set_attribute("http.route", route.path)
+
+
+def register_middlewares(
+    app: FastAPI,
+    observers: Sequence[RequestObserver] = (),
+    compression: Optional[CompressionConfig] = None,
+    profiling: Optional[ProfilingConfig] = None,
+    tracing: Optional[TracingConfig] = None,
+):
+    compression = compression or CompressionConfig()
+    tracing = tracing or TracingConfig()
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=compression.minimum_size,
+        gzip_level=compression.gzip_level,
+        brotli_quality=compression.brotli_quality,
+        cache_size=compression.cache_size,
+    )
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -23,4 +124,18 @@ def register_middlewares(app: FastAPI):
         allow_methods=["*"],
         allow_headers=["*"],
     )
-    app.add_middleware(RequestLoggerMiddleware)
+    if profiling is not None and profiling.enabled:
+        if profiling_available():
+            app.add_middleware(
+                ProfilingMiddleware,
+                directory=profiling.directory,
+                sample_rate=profiling.sample_rate,
+                secret=profiling.secret,
+                interval=profiling.interval,
+                output_format=profiling.output_format,
+                max_concurrent=profiling.max_concurrent,
+            )
+        else:
+            logger.warning("Request profiling is configured but pyinstrument is not installed")
+    app.add_middleware(RequestLoggerMiddleware, observers=observers)
+    app.add_middleware(TracingMiddleware, trust_parent=tracing.trust_parent)
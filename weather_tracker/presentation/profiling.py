@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import random
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from weather_tracker.infrastructure.profiling import (
+    PROFILE_FILE_HEADER,
+    PROFILE_HEADER,
+    profile_filename,
+    profile_name,
+    start_profiler,
+    verify_profile_token,
+    write_profile,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        directory: str = "profiles",
+        sample_rate: float = 0.0,
+        secret: Optional[str] = None,
+        interval: float = 0.001,
+        output_format: str = "speedscope",
+        max_concurrent: int = 2,
+    ):
+        self.app = app
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.secret = secret
+        self.interval = interval
+        self.output_format = output_format
+        self.max_concurrent = max_concurrent
+        self._active = 0
+
+    def should_profile(self, scope: Scope) -> bool:
+        token = accept = None
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER.encode():
+                token = value.decode("latin-1")
+            elif name == b"accept":
+                accept = value.decode("latin-1")
+        if token is not None and self.secret:
+            return verify_profile_token(self.secret, scope["path"], token)
+        if accept is not None and "text/event-stream" in accept:
+            return False
+        return self.sample_rate > 0.0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active >= self.max_concurrent or not self.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        name = profile_name(scope["method"], scope["path"])
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(PROFILE_FILE_HEADER, profile_filename(name, self.output_format))
+            await send(message)
+
+        self._active += 1
+        try:
+            profiler = start_profiler(self.interval)
+            try:
+                await self.app(scope, receive, send_with_profile)
+            finally:
+                profiler.stop()
+        finally:
+            self._active -= 1
+
+        try:
+            path = await asyncio.to_thread(write_profile, profiler, self.directory, name, self.output_format)
+            logger.info("Profile for %s %s written to %s", scope["method"], scope["path"], path)
+        except Exception as e:
+            logger.error(e)
@@ -1,7 +1,8 @@
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Iterable, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from typing_extensions import TypedDict
 
 
 class UserRegisterRequest(BaseModel):
@@ -33,13 +34,77 @@ class WeatherResponse(LocationResponse):
 
     @field_validator("temperature", "wind_speed", "temperature_feels", "humidity", mode="before")
     def validate_temp(cls, v):
-        try:
-            return int(float(v)) if v is not None else None
-        except (ValueError, TypeError):
-            return None
+        return to_int_measurement(v)
+
+
+def to_int_measurement(v: Any) -> Optional[int]:
+    if v is None or type(v) is int:
+        return v
+    try:
+        return int(float(v))
+    except (ValueError, TypeError):
+        return None
+
+
+WeatherPayload = TypedDict(
+    "WeatherPayload",
+    {
+        "name": str,
+        "latitude": Decimal,
+        "longitude": Decimal,
+        "country": Optional[str],
+        "state": Optional[str],
+        "temperature": Optional[int],
+        "mainState": Optional[str],
+        "windSpeed": Optional[int],
+        "temperatureFeels": Optional[int],
+        "humidity": Optional[int],
+    },
+)
+
+weather_payload_adapter = TypeAdapter(WeatherPayload)
+weather_payload_list_adapter = TypeAdapter(list[WeatherPayload])
+
+
+def weather_payload(loc) -> WeatherPayload:
+    return {
+        "name": loc.name,
+        "latitude": loc.coordinates.latitude,
+        "longitude": loc.coordinates.longitude,
+        "country": loc.country,
+        "state": None,
+        "temperature": to_int_measurement(loc.temperature),
+        "mainState": loc.main_state,
+        "windSpeed": to_int_measurement(loc.wind_speed),
+        "temperatureFeels": to_int_measurement(loc.temperature_feels),
+        "humidity": to_int_measurement(loc.humidity),
+    }
+
+
+def dump_weather_list(items: Iterable) -> bytes:
+    return weather_payload_list_adapter.dump_json([weather_payload(loc) for loc in items])
+
+
+def dump_weather(item) -> bytes:
+    return weather_payload_adapter.dump_json(weather_payload(item))
 
 
 class LocationRequest(BaseModel):
     name: str
-    latitude: Decimal
-    longitude: Decimal
+    latitude: Decimal = Field(ge=-90, le=90)
+    longitude: Decimal = Field(ge=-180, le=180)
+
+
+class LocationsBatchRequest(BaseModel):
+    add: list[LocationRequest] = Field(default_factory=list, max_length=100)
+    remove: list[LocationRequest] = Field(default_factory=list, max_length=100)
+
+
+class LocationBatchResultResponse(LocationResponse):
+    action: str
+    status: str
+    message: Optional[str] = None
+
+
+class PopularLocationResponse(LocationResponse):
+    subscribers: int
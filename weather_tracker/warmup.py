@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from typing import Awaitable, Callable, Optional
+
+from dishka import AsyncContainer
+from redis.asyncio import Redis
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from weather_tracker.application.dto import UserLocationDTO
+from weather_tracker.application.interfaces import LocationPopularity, WeatherClient
+from weather_tracker.config import Config
+from weather_tracker.infrastructure.httpl_client.interfaces import AsyncHTTPClient
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_database(session_maker: async_sessionmaker[AsyncSession], connections: int) -> None:
+    engine = session_maker.kw["bind"]
+    async with AsyncExitStack() as stack:
+        opened = await asyncio.gather(*(stack.enter_async_context(engine.connect()) for _ in range(connections)))
+        await asyncio.gather(*(connection.execute(text("SELECT 1")) for connection in opened))
+
+
+async def warm_redis(redis_client: Redis, connections: int) -> None:
+    pool = redis_client.connection_pool
+    opened = await asyncio.gather(*(pool.get_connection("PING") for _ in range(connections)), return_exceptions=True)
+    for connection in opened:
+        if not isinstance(connection, BaseException):
+            await pool.release(connection)
+    for connection in opened:
+        if isinstance(connection, BaseException):
+            raise connection
+
+
+async def preload_hot_weather(
+    location_popularity: LocationPopularity, weather_client: WeatherClient, limit: int, concurrency: int
+) -> int:
+    locations = await location_popularity.top(limit=limit)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def load(location) -> bool:
+        async with semaphore:
+            try:
+                await weather_client.get_weather_by_location(
+                    location=UserLocationDTO(id=location.id, name=location.name, coordinates=location.coordinates)
+                )
+                return True
+            except Exception as e:
+                logger.warning(f"Warm-up could not preload weather for {location.name}: {e}")
+                return False
+
+    return sum(await asyncio.gather(*(load(location) for location in locations)))
+
+
+async def _timed_step(name: str, step: Awaitable) -> None:
+    start = time.perf_counter()
+    try:
+        await step
+        logger.info(f"Warm-up step {name} finished in {time.perf_counter() - start:.3f}s")
+    except Exception as e:
+        logger.error(f"Warm-up step {name} failed: {e!r}")
+
+
+async def warm_up(container: AsyncContainer, config: Config) -> None:
+    warmup = config.warmup
+    steps = []
+    if warmup.db_connections:
+        session_maker = await container.get(async_sessionmaker[AsyncSession])
+        connections = min(warmup.db_connections, config.postgres.pool_size)
+        steps.append(_timed_step("postgres", warm_database(session_maker, connections)))
+    if warmup.redis_connections:
+        redis_client = await container.get(Redis)
+        steps.append(_timed_step("redis", warm_redis(redis_client, warmup.redis_connections)))
+    if warmup.upstream_connections:
+        http_client = await container.get(AsyncHTTPClient)
+        steps.append(
+            _timed_step("upstream", http_client.warm_up(config.open_weather.weather_url, warmup.upstream_connections))
+        )
+    await asyncio.gather(*steps)
+
+    if warmup.hot_weather:
+        await _timed_step(
+            "hot_weather",
+            preload_hot_weather(
+                location_popularity=await container.get(LocationPopularity),
+                weather_client=await container.get(WeatherClient),
+                limit=warmup.hot_weather,
+                concurrency=max(warmup.upstream_connections, 1),
+            ),
+        )
+
+
+class Readiness:
+    def __init__(self, warm_up: Optional[Callable[[], Awaitable[None]]] = None, timeout: float = 30.0):
+        self.ready = False
+        self.warm_up = warm_up
+        self.timeout = timeout
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.warm_up is None:
+            self.ready = True
+        elif self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.warm_up(), timeout=self.timeout)
+            logger.info(f"Warm-up finished in {time.perf_counter() - start:.3f}s")
+        except asyncio.TimeoutError:
+            logger.warning(f"Warm-up did not finish in {self.timeout}s, accepting traffic anyway")
+        except Exception as e:
+            logger.error(f"Warm-up failed: {e!r}")
+        self.ready = True
+
+    async def stop(self) -> None:
+        self.ready = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None